@@ -0,0 +1,97 @@
+"""
+Maintenance commands
+
+Usage:
+    python -m app.cli migrate
+    python -m app.cli rebuild-counters
+    python -m app.cli rebuild-player-best
+    python -m app.cli compact-rollups
+    python -m app.cli rebuild-sketches
+"""
+
+import argparse
+
+import app.models  # noqa: F401  (register tables)
+from app.database import SessionLocal, engine
+from app.migrations import SCHEMA_VERSION, check_schema_version, migrate
+from app.models.score import utc_now_naive
+from app.services.counters import rebuild_counters
+from app.services.distribution import rebuild_sketches
+from app.services.player_best import rebuild_player_best
+from app.services.rollups import compact_rollups
+
+
+def cmd_migrate(args: argparse.Namespace) -> None:
+    """Apply pending schema migrations"""
+    applied = migrate(engine)
+    for migration in applied:
+        print(f"applied {migration.version:04d}: {migration.description}")
+    print(f"schema version: {SCHEMA_VERSION}")
+
+
+def cmd_rebuild_counters(args: argparse.Namespace) -> None:
+    """Recompute maintained counters from the score and player tables"""
+    check_schema_version(engine)
+    with SessionLocal() as db:
+        values = rebuild_counters(db)
+    for name, value in sorted(values.items()):
+        print(f"{name}: {value}")
+
+
+def cmd_rebuild_player_best(args: argparse.Namespace) -> None:
+    """Recompute the per-player best score projection from score history"""
+    check_schema_version(engine)
+    with SessionLocal() as db:
+        rows = rebuild_player_best(db)
+    print(f"player_best: {rows} rows")
+
+
+def cmd_compact_rollups(args: argparse.Namespace) -> None:
+    """Drop day / week leaderboard periods that have ended"""
+    check_schema_version(engine)
+    with SessionLocal() as db:
+        rows = compact_rollups(db, utc_now_naive())
+    print(f"score_rollup: {rows} expired rows removed")
+
+
+def cmd_rebuild_sketches(args: argparse.Namespace) -> None:
+    """Recompute the score distribution sketches from score history"""
+    check_schema_version(engine)
+    with SessionLocal() as db:
+        rows = rebuild_sketches(db)
+    print(f"score_sketch_bucket: {rows} rows")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    migrate_cmd = commands.add_parser("migrate", help="Apply pending schema migrations")
+    migrate_cmd.set_defaults(func=cmd_migrate)
+
+    rebuild = commands.add_parser(
+        "rebuild-counters", help="Recompute score and player counters"
+    )
+    rebuild.set_defaults(func=cmd_rebuild_counters)
+
+    rebuild_best = commands.add_parser(
+        "rebuild-player-best", help="Recompute per-player best scores and totals"
+    )
+    rebuild_best.set_defaults(func=cmd_rebuild_player_best)
+
+    compact = commands.add_parser(
+        "compact-rollups", help="Drop expired daily / weekly leaderboard periods"
+    )
+    compact.set_defaults(func=cmd_compact_rollups)
+
+    sketches = commands.add_parser(
+        "rebuild-sketches", help="Recompute score distribution sketches"
+    )
+    sketches.set_defaults(func=cmd_rebuild_sketches)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
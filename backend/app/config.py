@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -11,6 +13,80 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str = "sqlite:///./tetris.db"
+    # Connection pool (server databases such as PostgreSQL)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_pre_ping: bool = True
+    db_pool_recycle_seconds: int = 1800
+    # SQLite connection pragmas (WAL, synchronous=NORMAL, ...)
+    sqlite_tuning: bool = True
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_mmap_size: int = 268435456  # 256 MiB
+    sqlite_cache_size: int = -65536  # negative = KiB, i.e. 64 MiB
+
+    # Leaderboard
+    leaderboard_index_depth: int = 1000
+    max_page_size: int = 100
+    # Cache-Control max-age for ranking/history reads (ETag revalidation after)
+    ranking_cache_max_age: int = 5
+    # Server-side cache of serialized ranking/history responses (0 disables)
+    response_cache_max_entries: int = 1024
+    response_cache_ttl_seconds: float = 30.0
+
+    # Live leaderboard (GET /api/v1/scores/stream): subscribers get the top
+    # N, then diffs; one that falls `live_client_buffer` events behind is
+    # disconnected
+    live_top_n: int = 10
+    live_max_subscribers: int = 5000
+    live_client_buffer: int = 16
+    live_heartbeat_seconds: float = 15.0
+
+    # Score distribution sketches: seconds between checkpoints to the
+    # database (scores since the last one are lost if the process dies)
+    distribution_checkpoint_seconds: float = 10.0
+
+    # Score writes
+    # "sync": commit each score before responding (durable)
+    # "write_behind": queue scores and group-commit them in the background;
+    # queued scores are lost if the process dies before the next flush, or
+    # if a flush still fails after score_flush_max_retries retries
+    score_write_mode: Literal["sync", "write_behind"] = "sync"
+    score_flush_interval_ms: int = 50
+    score_flush_max_rows: int = 500
+    score_queue_max_size: int = 10000
+    score_flush_max_retries: int = 3
+    score_flush_retry_delay_ms: int = 100
+
+    # Multi-worker deployments (gunicorn.conf.py turns this on): reads check
+    # the shared data version and drop in-process indexes and caches when
+    # another worker wrote. The interval bounds how often (0 = every read).
+    worker_coherence: bool = False
+    worker_coherence_interval_ms: int = 0
+
+    # Rate limiting (one limiter shared by every route)
+    # "bucket+memory://" keeps token buckets in this process; with several
+    # workers point every one at the same file, e.g.
+    # "bucket+sqlite:///./ratelimit.db". Any limits storage URI works with
+    # the "fixed-window" / "moving-window" strategies.
+    rate_limit_enabled: bool = True
+    rate_limit_storage_uri: str = "bucket+memory://"
+    rate_limit_strategy: str = "token-bucket"
+    rate_limit_max_keys: int = 100000
+
+    # Admin API (GET /api/v1/scores/export): "Authorization: Bearer <token>";
+    # admin routes answer 403 while this is empty
+    admin_token: str = ""
+
+    # Signs ranking page cursors. Left empty, each process uses a random key
+    # and cursors only work on the worker that issued them (gunicorn.conf.py
+    # shares one key between its workers)
+    cursor_secret: str = ""
+
+    # Request instrumentation: every response carries a Server-Timing header
+    # with its statement count and database time; requests above either
+    # threshold are logged with their SQL fingerprints
+    query_budget_max_statements: int = 20
+    slow_request_ms: int = 500
 
     # CORS
     cors_origins: str = "http://localhost:5173,http://127.0.0.1:5173"
@@ -1,22 +1,122 @@
-from sqlalchemy import create_engine
+from sqlalchemy import Engine, create_engine, event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./tetris.db"
+from app.config import Settings, settings
+
+# Async drivers used when DATABASE_URL names only the database
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
+
+def sync_database_url(url: str) -> str:
+    """Normalize DATABASE_URL for the sync engine
+
+    Hosting platforms hand out `postgres://` URLs, which SQLAlchemy rejects.
+    """
+    if url.startswith("postgres://"):
+        url = "postgresql://" + url.removeprefix("postgres://")
+    return url
+
+
+def async_database_url(url: str) -> str:
+    """DATABASE_URL with the dialect's async driver (explicit drivers kept)"""
+    parsed = make_url(sync_database_url(url))
+    driver = ASYNC_DRIVERS.get(parsed.drivername)
+    if driver is not None:
+        parsed = parsed.set(drivername=f"{parsed.drivername}+{driver}")
+    return parsed.render_as_string(hide_password=False)
+
+
+def engine_options(url: str, config: Settings) -> dict:
+    """create_engine keyword arguments for a database URL"""
+    if make_url(url).get_backend_name() == "sqlite":
+        # Sessions cross threads (TestClient, threadpool); pooling is the
+        # dialect default: a queue for files, a single connection for :memory:
+        return {"connect_args": {"check_same_thread": False}}
+    return {
+        "pool_size": config.db_pool_size,
+        "max_overflow": config.db_max_overflow,
+        "pool_pre_ping": config.db_pool_pre_ping,
+        "pool_recycle": config.db_pool_recycle_seconds,
+    }
+
+
+def apply_sqlite_pragmas(engine: Engine, config: Settings) -> None:
+    """Tune every new SQLite connection of an engine
+
+    WAL lets readers run alongside the single writer, synchronous=NORMAL
+    only fsyncs at checkpoints (durable against process crashes, not power
+    loss), busy_timeout waits for the write lock instead of failing, and
+    mmap / cache_size keep hot pages in memory.
+    """
+    pragmas = [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA busy_timeout={config.sqlite_busy_timeout_ms}",
+        f"PRAGMA mmap_size={config.sqlite_mmap_size}",
+        f"PRAGMA cache_size={config.sqlite_cache_size}",
+    ]
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False},  # SQLite specific
-)
+
+def create_sync_engine(config: Settings = settings, **overrides) -> Engine:
+    """Sync engine for DATABASE_URL (scripts and maintenance commands)"""
+    url = sync_database_url(config.database_url)
+    engine = create_engine(url, **(engine_options(url, config) | overrides))
+    if engine.dialect.name == "sqlite" and config.sqlite_tuning:
+        apply_sqlite_pragmas(engine, config)
+    return engine
+
+
+def create_async_db_engine(config: Settings = settings, **overrides) -> AsyncEngine:
+    """Async engine for DATABASE_URL (request handlers)"""
+    url = async_database_url(config.database_url)
+    engine = create_async_engine(url, **(engine_options(url, config) | overrides))
+    if engine.dialect.name == "sqlite" and config.sqlite_tuning:
+        apply_sqlite_pragmas(engine.sync_engine, config)
+    return engine
+
+
+# Sync engine for scripts and maintenance commands
+engine = create_sync_engine()
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine for request handlers
+async_engine = create_async_db_engine()
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
 Base = declarative_base()
 
 
+def dialect_insert(dialect_name: str):
+    """Return the dialect's INSERT construct (supports ON CONFLICT upserts)"""
+    if dialect_name == "postgresql":
+        return postgresql.insert
+    return sqlite.insert
+
+
 def get_db():
-    """Dependency to get database session"""
+    """Get a sync database session (scripts and maintenance)"""
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """Dependency to get an async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,26 +1,65 @@
+from contextlib import asynccontextmanager
+from dataclasses import asdict
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from slowapi import Limiter, _rate_limit_exceeded_handler
+from fastapi.responses import PlainTextResponse
+from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
-from slowapi.util import get_remote_address
 
 from app.config import settings
-from app.database import Base, engine
-from app.routes import score
+from app.database import AsyncSessionLocal, engine
+from app.migrations import check_schema_version
+from app.routes import admin, live, score, stats
+from app.services.coherence import shared_version
+from app.services.distribution import score_distribution
+from app.services.leaderboard import leaderboard
+from app.services.live import live_leaderboard
+from app.services.metrics import MetricsMiddleware, render_metrics
+from app.services.query_budget import QueryBudgetMiddleware
+from app.services.rank_index import rank_index
+from app.services.rate_limit import limiter
+from app.services.response_cache import response_cache
+from app.services.single_flight import read_flights
+from app.services.write_buffer import score_buffer
+
 
-# Rate limiter
-limiter = Limiter(key_func=get_remote_address)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup and shutdown"""
+    # Migrations run separately (python -m app.cli migrate); only verify here
+    check_schema_version(engine)
+    # Ranking indexes are rebuilt from the database on the first ranking read
+    leaderboard.reset()
+    rank_index.reset()
+    response_cache.clear()
+    read_flights.reset()
+    shared_version.reset()
+    # Creates a shared rate limit store off the event loop
+    await limiter.open()
+    if settings.score_write_mode == "write_behind":
+        score_buffer.start(AsyncSessionLocal)
+    live_leaderboard.start(AsyncSessionLocal)
+    score_distribution.start(AsyncSessionLocal)
+    yield
+    await live_leaderboard.stop()
+    # Drain queued scores before the process exits
+    await score_buffer.stop()
+    # ...and checkpoint the sketches they were added to
+    await score_distribution.stop()
+    leaderboard.reset()
+    rank_index.reset()
+    response_cache.clear()
 
-# Create tables
-Base.metadata.create_all(bind=engine)
 
 app = FastAPI(
     title="Classic Tetris API",
     description="Score API for Classic Tetris game",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
-# Add rate limiting state and handler
+# Rate limiting: the routes' decorators and this state share one limiter
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
@@ -32,15 +71,48 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(QueryBudgetMiddleware)
+# Outermost, so the timings include every other middleware
+app.add_middleware(MetricsMiddleware)
 
-# Include routers
+# Include routers (admin and live first: /scores/export and /scores/stream
+# must win over /scores/{player_id})
+app.include_router(admin.router, prefix="/api/v1")
+app.include_router(live.router, prefix="/api/v1")
 app.include_router(score.router, prefix="/api/v1")
+app.include_router(stats.router, prefix="/api/v1")
 
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy", "service": "classic-tetris-api"}
+    health = {"status": "healthy", "service": "classic-tetris-api"}
+    if score_buffer.running:
+        health["score_buffer"] = asdict(score_buffer.metrics)
+    if response_cache.enabled:
+        health["response_cache"] = asdict(response_cache.metrics)
+    health["read_coalescing"] = asdict(read_flights.metrics)
+    if shared_version.enabled:
+        health["worker_coherence"] = asdict(shared_version.metrics)
+    health["live_leaderboard"] = asdict(live_leaderboard.metrics)
+    return health
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics of this process"""
+    extra = {
+        "response_cache": asdict(response_cache.metrics),
+        "read_coalescing": asdict(read_flights.metrics),
+        "live_leaderboard": asdict(live_leaderboard.metrics),
+    }
+    if score_buffer.running:
+        extra["score_buffer"] = asdict(score_buffer.metrics)
+    if shared_version.enabled:
+        extra["worker_coherence"] = asdict(shared_version.metrics)
+    return PlainTextResponse(
+        render_metrics(extra), media_type="text/plain; version=0.0.4"
+    )
 
 
 @app.get("/")
@@ -0,0 +1,110 @@
+"""
+Versioned schema migrations
+
+Each migration module defines one `Migration`; the applied versions are
+recorded in the `schema_version` table. `python -m app.cli migrate` applies
+pending migrations, and application startup only checks the recorded
+version (see `check_schema_version`).
+"""
+
+from sqlalchemy import (
+    Column,
+    Connection,
+    DateTime,
+    Engine,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    func,
+    inspect,
+    select,
+)
+
+from app.migrations import (
+    v0001_initial_schema,
+    v0002_score_indexes,
+    v0003_score_created_index,
+    v0004_score_sketches,
+    v0005_player_totals,
+)
+from app.migrations.base import Migration
+from app.models.score import utc_now_naive
+
+# Kept out of Base.metadata so create_all / drop_all never touch it
+schema_metadata = MetaData()
+
+schema_version = Table(
+    "schema_version",
+    schema_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String, nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+class SchemaVersionError(RuntimeError):
+    """The database schema is older than the code expects"""
+
+
+MIGRATIONS: list[Migration] = [
+    v0001_initial_schema.migration,
+    v0002_score_indexes.migration,
+    v0003_score_created_index.migration,
+    v0004_score_sketches.migration,
+    v0005_player_totals.migration,
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1].version
+
+
+def current_version(conn: Connection) -> int:
+    """Highest applied migration (0 for an unversioned database)"""
+    if not inspect(conn).has_table(schema_version.name):
+        return 0
+    return conn.scalar(select(func.max(schema_version.c.version))) or 0
+
+
+def _record(conn: Connection, migration: Migration) -> None:
+    conn.execute(
+        schema_version.insert().values(
+            version=migration.version,
+            description=migration.description,
+            applied_at=utc_now_naive(),
+        )
+    )
+
+
+def migrate(engine: Engine) -> list[Migration]:
+    """Apply pending migrations in order; returns the ones applied"""
+    with engine.begin() as conn:
+        schema_metadata.create_all(conn)
+        current = current_version(conn)
+
+    applied = []
+    for migration in MIGRATIONS:
+        if migration.version <= current:
+            continue
+        if migration.transactional:
+            with engine.begin() as conn:
+                migration.upgrade(conn)
+                _record(conn, migration)
+        else:
+            with engine.connect() as conn:
+                migration.upgrade(conn.execution_options(isolation_level="AUTOCOMMIT"))
+            with engine.begin() as conn:
+                _record(conn, migration)
+        applied.append(migration)
+    return applied
+
+
+def check_schema_version(engine: Engine) -> int:
+    """Fail fast when the database has not been migrated to SCHEMA_VERSION"""
+    with engine.connect() as conn:
+        version = current_version(conn)
+    if version < SCHEMA_VERSION:
+        raise SchemaVersionError(
+            f"Database schema is at version {version}, this build needs "
+            f"{SCHEMA_VERSION}: run `python -m app.cli migrate`"
+        )
+    return version
@@ -0,0 +1,18 @@
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from sqlalchemy import Connection
+
+
+@dataclass(frozen=True)
+class Migration:
+    """One schema change
+
+    Non-transactional migrations run on an autocommit connection, which
+    PostgreSQL needs for CREATE INDEX CONCURRENTLY.
+    """
+
+    version: int
+    description: str
+    upgrade: Callable[[Connection], None]
+    transactional: bool = True
@@ -0,0 +1,207 @@
+from collections import Counter as Tally
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import (
+    CheckConstraint,
+    Column,
+    Connection,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    func,
+    insert,
+    select,
+)
+
+from app.migrations.base import Migration
+
+# The schema as of this migration, frozen here so later model changes never
+# alter what it creates. Databases built by the old create_all-at-import
+# already have some of these tables; checkfirst adopts them.
+metadata = MetaData()
+
+player = Table(
+    "player",
+    metadata,
+    Column("id", String, primary_key=True),
+    Column("nickname", String(10), nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("last_played_at", DateTime, nullable=False),
+)
+
+score = Table(
+    "score",
+    metadata,
+    Column("id", String, primary_key=True),
+    Column("player_id", String, ForeignKey("player.id", ondelete="CASCADE"), nullable=False),
+    Column("score", Integer, nullable=False),
+    Column("level", Integer, nullable=False),
+    Column("lines", Integer, nullable=False),
+    Column("play_time_seconds", Integer, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    CheckConstraint("score >= 0", name="check_score_positive"),
+    CheckConstraint("level >= 1 AND level <= 10", name="check_level_range"),
+    CheckConstraint("lines >= 0", name="check_lines_positive"),
+    CheckConstraint("play_time_seconds >= 0", name="check_time_positive"),
+)
+
+counter = Table(
+    "counter",
+    metadata,
+    Column("name", String, primary_key=True),
+    Column("value", Integer, nullable=False),
+)
+
+player_best = Table(
+    "player_best",
+    metadata,
+    Column("player_id", String, ForeignKey("player.id", ondelete="CASCADE"), primary_key=True),
+    Column("nickname", String(10), nullable=False),
+    Column("score_id", String, nullable=False),
+    Column("best_score", Integer, nullable=False),
+    Column("level", Integer, nullable=False),
+    Column("lines", Integer, nullable=False),
+    Column("achieved_at", DateTime, nullable=False),
+    Column("games_played", Integer, nullable=False),
+)
+Index(
+    "idx_player_best_score",
+    player_best.c.best_score.desc(),
+    player_best.c.achieved_at,
+    player_best.c.score_id,
+)
+
+score_rollup = Table(
+    "score_rollup",
+    metadata,
+    Column("period_kind", String(4), primary_key=True),
+    Column("period_start", Date, primary_key=True),
+    Column("score_id", String, primary_key=True),
+    Column("score", Integer, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("nickname", String(10), nullable=False),
+    Column("level", Integer, nullable=False),
+    Column("lines", Integer, nullable=False),
+)
+Index(
+    "idx_score_rollup_ranking",
+    score_rollup.c.period_kind,
+    score_rollup.c.period_start,
+    score_rollup.c.score.desc(),
+    score_rollup.c.created_at,
+    score_rollup.c.score_id,
+)
+
+
+def _is_empty(conn: Connection, table: Table) -> bool:
+    return conn.execute(select(1).select_from(table).limit(1)).first() is None
+
+
+def _backfill_player_best(conn: Connection) -> None:
+    ranked = (
+        select(
+            score.c.player_id,
+            player.c.nickname,
+            score.c.id.label("score_id"),
+            score.c.score.label("best_score"),
+            score.c.level,
+            score.c.lines,
+            score.c.created_at.label("achieved_at"),
+            func.count().over(partition_by=score.c.player_id).label("games_played"),
+            func.row_number()
+            .over(
+                partition_by=score.c.player_id,
+                order_by=(score.c.score.desc(), score.c.created_at, score.c.id),
+            )
+            .label("position"),
+        )
+        .join(player, score.c.player_id == player.c.id)
+        .subquery()
+    )
+    columns = [column.name for column in player_best.c]
+    conn.execute(
+        player_best.insert().from_select(
+            columns,
+            select(*(ranked.c[name] for name in columns)).where(ranked.c.position == 1),
+        )
+    )
+
+
+def _backfill_rollups(conn: Connection, now: datetime) -> dict[str, int]:
+    """Day / week rows for the live periods; returns their counter values"""
+    today = now.date()
+    starts = {"day": today, "week": today - timedelta(days=today.weekday())}
+    recent = conn.execute(
+        select(
+            score.c.id,
+            score.c.score,
+            score.c.created_at,
+            player.c.nickname,
+            score.c.level,
+            score.c.lines,
+        )
+        .join(player, score.c.player_id == player.c.id)
+        .where(score.c.created_at >= datetime.combine(starts["week"], datetime.min.time()))
+    )
+    rows = [
+        {
+            "period_kind": kind,
+            "period_start": start,
+            "score_id": row.id,
+            "score": row.score,
+            "created_at": row.created_at,
+            "nickname": row.nickname,
+            "level": row.level,
+            "lines": row.lines,
+        }
+        for row in recent
+        for kind, start in starts.items()
+        if row.created_at.date() >= start
+    ]
+    if rows:
+        conn.execute(insert(score_rollup), rows)
+    return dict(
+        Tally(f"rollup:{row['period_kind']}:{row['period_start'].isoformat()}" for row in rows)
+    )
+
+
+def _counter_values(conn: Connection) -> dict[str, int]:
+    values = {
+        "scores": conn.scalar(select(func.count()).select_from(score)),
+        "players": conn.scalar(select(func.count()).select_from(player)),
+        "ranked_players": conn.scalar(select(func.count(func.distinct(score.c.player_id)))),
+    }
+    for level, count in conn.execute(
+        select(score.c.level, func.count()).group_by(score.c.level)
+    ):
+        values[f"scores:level:{level}"] = count
+    return values
+
+
+def upgrade(conn: Connection) -> None:
+    metadata.create_all(conn, checkfirst=True)
+    if _is_empty(conn, player):
+        return
+    # Tables created just now next to an existing history start out empty:
+    # fill them the way the score writes would have
+    values = {}
+    if _is_empty(conn, counter):
+        values = _counter_values(conn)
+    if _is_empty(conn, player_best):
+        _backfill_player_best(conn)
+    if _is_empty(conn, score_rollup):
+        rollup_values = _backfill_rollups(conn, datetime.now(UTC).replace(tzinfo=None))
+        if values:
+            values |= rollup_values
+    if values:
+        conn.execute(
+            insert(counter), [{"name": name, "value": value} for name, value in values.items()]
+        )
+
+
+migration = Migration(1, "initial schema", upgrade)
@@ -0,0 +1,22 @@
+from sqlalchemy import Connection, text
+
+from app.migrations.base import Migration
+
+# Ranking order (score DESC, created_at, id) and per-player history
+# (player_id, created_at DESC) from 04-database-design.md
+INDEXES = {
+    "idx_score_score_desc": "score (score DESC, created_at, id)",
+    "idx_score_player_created": "score (player_id, created_at DESC)",
+}
+
+
+def upgrade(conn: Connection) -> None:
+    # Building the index back-fills it from the existing rows. PostgreSQL
+    # builds it without blocking writes; SQLite holds the write lock for the
+    # build, while WAL readers keep going.
+    concurrently = " CONCURRENTLY" if conn.dialect.name == "postgresql" else ""
+    for name, target in INDEXES.items():
+        conn.execute(text(f"CREATE INDEX{concurrently} IF NOT EXISTS {name} ON {target}"))
+
+
+migration = Migration(2, "score ranking and history indexes", upgrade, transactional=False)
@@ -0,0 +1,15 @@
+from sqlalchemy import Connection, text
+
+from app.migrations.base import Migration
+
+# Export order (created_at, id): `since` watermarks become a range scan and
+# streaming the table needs no sort
+INDEX = "CREATE INDEX{concurrently} IF NOT EXISTS idx_score_created ON score (created_at, id)"
+
+
+def upgrade(conn: Connection) -> None:
+    concurrently = " CONCURRENTLY" if conn.dialect.name == "postgresql" else ""
+    conn.execute(text(INDEX.format(concurrently=concurrently)))
+
+
+migration = Migration(3, "score export index", upgrade, transactional=False)
@@ -0,0 +1,70 @@
+import math
+from collections import Counter as Tally
+
+from sqlalchemy import (
+    Column,
+    Connection,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    column,
+    delete,
+    func,
+    insert,
+    select,
+    table,
+)
+
+from app.migrations.base import Migration
+
+# Frozen copies of what the back-fill needs, so later changes to the models
+# or to app.services.distribution never alter this migration
+metadata = MetaData()
+
+score_sketch_bucket = Table(
+    "score_sketch_bucket",
+    metadata,
+    Column("sketch", String, primary_key=True),
+    Column("bucket", Integer, primary_key=True),
+    Column("count", Integer, nullable=False),
+)
+
+score = table("score", column("level"), column("score"))
+
+# DDSketch buckets at 1% relative accuracy (app.services.sketch)
+RELATIVE_ACCURACY = 0.01
+LOG_GAMMA = math.log((1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY))
+
+
+def bucket(value: int) -> int:
+    if value < 1:
+        return 0
+    return 1 + math.ceil(math.log(value) / LOG_GAMMA - 1e-12)
+
+
+def upgrade(conn: Connection) -> None:
+    metadata.create_all(conn, checkfirst=True)
+    # Back-fill from the existing history (one grouped scan of score)
+    counts: Tally = Tally()
+    for level, value, count in conn.execute(
+        select(score.c.level, score.c.score, func.count()).group_by(
+            score.c.level, score.c.score
+        )
+    ):
+        counts["all", bucket(value)] += count
+        counts[f"level:{level}", bucket(value)] += count
+    # Databases adopted from a create_all with the current models may already
+    # hold checkpointed buckets: history is the complete count, so replace them
+    conn.execute(delete(score_sketch_bucket))
+    if counts:
+        conn.execute(
+            insert(score_sketch_bucket),
+            [
+                {"sketch": sketch, "bucket": index, "count": count}
+                for (sketch, index), count in counts.items()
+            ],
+        )
+
+
+migration = Migration(4, "score distribution sketches", upgrade)
@@ -0,0 +1,36 @@
+from sqlalchemy import Connection, column, func, inspect, select, table, text, update
+
+from app.migrations.base import Migration
+
+TOTALS = {
+    "total_score": "score",
+    "total_lines": "lines",
+    "total_play_time_seconds": "play_time_seconds",
+}
+
+player_best = table("player_best", column("player_id"), *(column(name) for name in TOTALS))
+score = table("score", column("player_id"), *(column(name) for name in TOTALS.values()))
+
+
+def upgrade(conn: Connection) -> None:
+    # Databases adopted from a create_all with the current models have them
+    existing = {column["name"] for column in inspect(conn).get_columns("player_best")}
+    for name in TOTALS:
+        if name not in existing:
+            conn.execute(
+                text(f"ALTER TABLE player_best ADD COLUMN {name} BIGINT NOT NULL DEFAULT 0")
+            )
+    # Back-fill from the existing history
+    conn.execute(
+        update(player_best).values(
+            {
+                name: select(func.coalesce(func.sum(score.c[source]), 0))
+                .where(score.c.player_id == player_best.c.player_id)
+                .scalar_subquery()
+                for name, source in TOTALS.items()
+            }
+        )
+    )
+
+
+migration = Migration(5, "player score totals", upgrade)
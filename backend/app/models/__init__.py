@@ -1,3 +1,7 @@
+from app.models.counter import Counter
+from app.models.player_best import PlayerBest
+from app.models.rollup import ScoreRollup
 from app.models.score import Player, Score
+from app.models.sketch import ScoreSketchBucket
 
-__all__ = ["Score", "Player"]
+__all__ = ["Score", "Player", "Counter", "PlayerBest", "ScoreRollup", "ScoreSketchBucket"]
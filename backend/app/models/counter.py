@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, String
+
+from app.database import Base
+
+
+class Counter(Base):
+    """Maintained aggregate counter (e.g. total scores, scores per level)"""
+
+    __tablename__ = "counter"
+
+    name = Column(String, primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,32 @@
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Index, Integer, String
+
+from app.database import Base
+
+
+class PlayerBest(Base):
+    """Per-player best score and totals (one row per player with scores)"""
+
+    __tablename__ = "player_best"
+
+    player_id = Column(String, ForeignKey("player.id", ondelete="CASCADE"), primary_key=True)
+    nickname = Column(String(10), nullable=False)
+    score_id = Column(String, nullable=False)
+    best_score = Column(Integer, nullable=False)
+    level = Column(Integer, nullable=False)
+    lines = Column(Integer, nullable=False)
+    achieved_at = Column(DateTime, nullable=False)
+    games_played = Column(Integer, nullable=False, default=0)
+    # Totals outgrow 32-bit integers on PostgreSQL after a few hundred games;
+    # added by migration 0005 on existing databases
+    total_score = Column(BigInteger, nullable=False, default=0)
+    total_lines = Column(BigInteger, nullable=False, default=0)
+    total_play_time_seconds = Column(BigInteger, nullable=False, default=0)
+
+    __table_args__ = (
+        Index(
+            "idx_player_best_score",
+            best_score.desc(),
+            achieved_at,
+            score_id,
+        ),
+    )
@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Date, DateTime, Index, Integer, String
+
+from app.database import Base
+
+
+class ScoreRollup(Base):
+    """Scores grouped by leaderboard period (day / ISO week)
+
+    Rows are written alongside each score and dropped by compaction once
+    their period has ended, so the table only holds the live windows.
+    """
+
+    __tablename__ = "score_rollup"
+
+    period_kind = Column(String(4), primary_key=True)  # "day" or "week"
+    period_start = Column(Date, primary_key=True)
+    score_id = Column(String, primary_key=True)
+    score = Column(Integer, nullable=False)
+    created_at = Column(DateTime, nullable=False)
+    nickname = Column(String(10), nullable=False)
+    level = Column(Integer, nullable=False)
+    lines = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        Index(
+            "idx_score_rollup_ranking",
+            period_kind,
+            period_start,
+            score.desc(),
+            created_at,
+            score_id,
+        ),
+    )
@@ -1,6 +1,14 @@
 from datetime import UTC, datetime
 
-from sqlalchemy import CheckConstraint, Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import (
+    CheckConstraint,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+)
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -11,6 +19,11 @@ def utc_now():
     return datetime.now(UTC)
 
 
+def utc_now_naive():
+    """Return current UTC time as the naive DateTime columns read it back"""
+    return datetime.now(UTC).replace(tzinfo=None)
+
+
 class Player(Base):
     """Anonymous player model"""
 
@@ -23,6 +36,7 @@ class Player(Base):
 
     # Relationship
     scores = relationship("Score", back_populates="player", cascade="all, delete-orphan")
+    best = relationship("PlayerBest", uselist=False, cascade="all, delete-orphan")
 
 
 class Score(Base):
@@ -44,6 +58,10 @@ class Score(Base):
         CheckConstraint("level >= 1 AND level <= 10", name="check_level_range"),
         CheckConstraint("lines >= 0", name="check_lines_positive"),
         CheckConstraint("play_time_seconds >= 0", name="check_time_positive"),
+        # Created by migrations 0002 / 0003 on existing databases
+        Index("idx_score_score_desc", score.desc(), created_at, id),
+        Index("idx_score_player_created", player_id, created_at.desc()),
+        Index("idx_score_created", created_at, id),
     )
 
     # Relationship
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String
+
+from app.database import Base
+
+
+class ScoreSketchBucket(Base):
+    """One bucket count of a checkpointed score distribution sketch
+
+    Rows only ever have counts added (or removed with deleted scores), so
+    workers checkpoint concurrently without reading each other's state.
+    """
+
+    __tablename__ = "score_sketch_bucket"
+
+    sketch = Column(String, primary_key=True)  # "all" or "level:<n>"
+    bucket = Column(Integer, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
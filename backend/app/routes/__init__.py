@@ -1,3 +1,3 @@
-from app.routes import score
+from app.routes import admin, live, score, stats
 
-__all__ = ["score"]
+__all__ = ["admin", "live", "score", "stats"]
@@ -0,0 +1,132 @@
+import csv
+import io
+import secrets
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from pydantic_core import to_json
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import get_async_db
+from app.models.score import Score
+
+router = APIRouter(tags=["admin"])
+
+bearer = HTTPBearer(auto_error=False)
+
+EXPORT_COLUMNS = (
+    Score.id,
+    Score.player_id,
+    Score.score,
+    Score.level,
+    Score.lines,
+    Score.play_time_seconds,
+    Score.created_at,
+)
+EXPORT_FIELDS = [column.key for column in EXPORT_COLUMNS]
+EXPORT_CHUNK_ROWS = 1000  # rows fetched and encoded per partition
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def require_admin(
+    credentials: HTTPAuthorizationCredentials | None = Depends(bearer),
+) -> None:
+    """Allow only requests bearing ADMIN_TOKEN (admin routes are off without one)"""
+    if not settings.admin_token:
+        raise HTTPException(status_code=403, detail="Admin API is disabled")
+    if credentials is None or not secrets.compare_digest(
+        credentials.credentials.encode(), settings.admin_token.encode()
+    ):
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid admin token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+def encode_ndjson(rows) -> bytes:
+    """One JSON object per line, encoded like the API's ScoreResponse"""
+    return b"".join(
+        to_json(dict(zip(EXPORT_FIELDS, row, strict=True))) + b"\n" for row in rows
+    )
+
+
+def encode_csv(rows) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerows(
+        (*row[:-1], row[-1].isoformat()) for row in rows
+    )
+    return buffer.getvalue().encode()
+
+
+async def stream_scores(
+    db: AsyncSession,
+    format: str,
+    since: datetime | None,
+    until: datetime | None,
+) -> AsyncIterator[bytes]:
+    """Yield the export body one encoded partition at a time
+
+    The rows come through a server-side cursor (yield_per), so memory use
+    depends on EXPORT_CHUNK_ROWS, not on the size of the table.
+    """
+    if format == "csv":
+        yield (",".join(EXPORT_FIELDS) + "\n").encode()
+    if until is None:
+        return
+    encode = encode_csv if format == "csv" else encode_ndjson
+
+    stmt = (
+        select(*EXPORT_COLUMNS)
+        .where(Score.created_at <= until)
+        .order_by(Score.created_at, Score.id)
+        .execution_options(yield_per=EXPORT_CHUNK_ROWS)
+    )
+    if since is not None:
+        stmt = stmt.where(Score.created_at > since)
+    result = await db.stream(stmt)
+    async for rows in result.partitions():
+        yield encode(rows)
+
+
+@router.get("/scores/export", dependencies=[Depends(require_admin)])
+async def export_scores(
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="Output format"),
+    since: datetime | None = Query(
+        None, description="Only scores created after this watermark (exclusive)"
+    ),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Stream every score (or those after `since`) in created_at order
+
+    The export stops at the newest created_at present when the request
+    started and returns it as `X-Export-Watermark`; pass it back as `since`
+    for the next incremental pull. A score commits a little after its
+    created_at (up to a flush interval in write_behind mode), so pull with
+    that much overlap and deduplicate by id.
+    """
+    if since is not None and since.tzinfo is not None:
+        # created_at is stored as naive UTC
+        since = since.astimezone(UTC).replace(tzinfo=None)
+    until = await db.scalar(select(func.max(Score.created_at)))
+    if since is not None and until is not None and until <= since:
+        until = None
+
+    watermark = until or since
+    headers = {
+        "Content-Disposition": f'attachment; filename="scores.{format}"',
+    }
+    if watermark is not None:
+        headers["X-Export-Watermark"] = watermark.isoformat()
+    return StreamingResponse(
+        stream_scores(db, format, since, until),
+        media_type=MEDIA_TYPES[format],
+        headers=headers,
+    )
@@ -0,0 +1,31 @@
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+from app.services.live import live_leaderboard
+from app.services.rate_limit import limiter
+
+router = APIRouter(tags=["scores"])
+
+
+@router.get("/scores/stream")
+@limiter.limit("10/minute")
+async def stream_rankings(request: Request):
+    """Live top-N ranking as Server-Sent Events
+
+    The stream opens with a `snapshot` event holding the current top N,
+    followed by a `diff` event (`entered` / `moved` / `dropped`) whenever a
+    new score changes it. Event ids increase by one per diff; on a gap, or
+    when the server closes the stream, reconnect for a fresh snapshot.
+    """
+    subscriber = await live_leaderboard.subscribe()
+    if subscriber is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Live leaderboard is at capacity",
+            headers={"Retry-After": "30"},
+        )
+    return StreamingResponse(
+        live_leaderboard.events(subscriber),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,119 +1,421 @@
-from datetime import UTC, datetime
-from uuid import uuid4
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Request
-from slowapi import Limiter
-from slowapi.util import get_remote_address
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
-from app.models.score import Player, Score
+from app.config import settings
+from app.database import get_async_db
+from app.models.score import Score, utc_now_naive
 from app.schemas.score import (
     PlayerCreate,
+    PlayerRankResponse,
     PlayerResponse,
+    PlayerStatsResponse,
     RankingEntry,
     RankingResponse,
+    ScoreBatchCreate,
+    ScoreBatchItemResult,
+    ScoreBatchResponse,
     ScoreCreate,
     ScoreResponse,
 )
+from app.services.coherence import shared_version
+from app.services.counters import (
+    DATA_VERSION,
+    PLAYERS,
+    RANKED_PLAYERS,
+    increment_counters,
+    read_counter,
+)
+from app.services.etag import etag_matches, leaderboard_version
+from app.services.leaderboard import (
+    LeaderboardEntry,
+    RankingCursor,
+    count_ties_ahead,
+    leaderboard,
+    query_player_best,
+    query_rankings,
+    query_rankings_before,
+)
+from app.services.player_best import query_player_stats, query_unique_rankings
+from app.services.rank_index import rank_index
+from app.services.rate_limit import limiter
+from app.services.response_cache import (
+    RANKINGS,
+    cache_key,
+    player_tag,
+    response_cache,
+)
+from app.services.rollups import period_start, query_window_rankings
+from app.services.score import (
+    build_score_rows,
+    find_player_nicknames,
+    insert_scores,
+    publish_scores,
+    touch_players,
+    upsert_player,
+)
+from app.services.single_flight import read_flights
+from app.services.write_buffer import score_buffer
 
 router = APIRouter(tags=["scores"])
-limiter = Limiter(key_func=get_remote_address)
+
+# Same serializer FastAPI applies through response_model
+ScoreHistoryAdapter = TypeAdapter(list[ScoreResponse])
+
+PageLimit = Query(10, ge=1, le=settings.max_page_size, description="Page size")
+
+
+def to_ranking_entries(
+    entries: list[LeaderboardEntry], first_rank: int
+) -> list[RankingEntry]:
+    """Number consecutive leaderboard entries starting at first_rank"""
+    return [
+        RankingEntry(
+            rank=first_rank + idx,
+            player_nickname=entry.nickname,
+            score=entry.score,
+            level=entry.level,
+            lines=entry.lines,
+            created_at=entry.created_at,
+        )
+        for idx, entry in enumerate(entries)
+    ]
+
+
+def render_ranking_page(
+    entries: list[LeaderboardEntry],
+    first_rank: int,
+    total: int,
+    next_cursor: str | None,
+) -> bytes:
+    """Encode a ranking page straight to RankingResponse JSON bytes
+
+    Skips building and re-validating one RankingEntry per row: the columns
+    are already typed, so plain dicts go to pydantic-core's encoder, which
+    produces the same bytes as serializing the response model.
+    """
+    return to_json(
+        {
+            "data": [
+                {
+                    "rank": rank,
+                    "player_nickname": entry.nickname,
+                    "score": entry.score,
+                    "level": entry.level,
+                    "lines": entry.lines,
+                    "created_at": entry.created_at,
+                }
+                for rank, entry in enumerate(entries, first_rank)
+            ],
+            "total": total,
+            "next_cursor": next_cursor,
+        }
+    )
+
+
+def cache_headers(*parts: str) -> dict[str, str]:
+    """ETag and Cache-Control headers for a ranking or history read"""
+    return {
+        "ETag": leaderboard_version.etag(*parts),
+        "Cache-Control": f"max-age={settings.ranking_cache_max_age}",
+    }
+
+
+def not_modified(request: Request, headers: dict[str, str]) -> bool:
+    """Whether the client's cached copy is current (checked before any query)"""
+    return etag_matches(request.headers.get("if-none-match"), headers["ETag"])
+
+
+async def cached_read(
+    key: str, tags: tuple[str, ...], build: Callable[[], Awaitable[bytes]]
+) -> bytes:
+    """Serve a read from the response cache; concurrent misses share one build
+
+    The flight key carries the data version, so requests arriving after a
+    score write never join a query that started before it.
+    """
+    flight_key = f"{key}@{leaderboard_version.value}"
+    return await response_cache.get_or_build(
+        key, tags, lambda: read_flights.do(flight_key, build)
+    )
+
+
+def json_response(body: bytes, headers: dict[str, str]) -> Response:
+    """Response for an already-serialized JSON body"""
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @router.post("/players", response_model=PlayerResponse)
 @limiter.limit("10/minute")
-async def create_player(request: Request, player_data: PlayerCreate, db: Session = Depends(get_db)):
+async def create_player(
+    request: Request, player_data: PlayerCreate, db: AsyncSession = Depends(get_async_db)
+):
     """Create or update a player"""
-    # Check if player exists
-    existing_player = db.query(Player).filter(Player.id == player_data.id).first()
-
-    if existing_player:
-        # Update last played time
-        existing_player.last_played_at = datetime.now(UTC)
-        db.commit()
-        db.refresh(existing_player)
-        return existing_player
-
-    # Create new player
-    player = Player(
-        id=player_data.id,
-        nickname=player_data.nickname,
-    )
-    db.add(player)
-    db.commit()
-    db.refresh(player)
-    return player
+    # One upsert creates the player or bumps last_played_at, returning the row
+    player, created = await upsert_player(db, player_data.id, player_data.nickname)
+    if created:
+        counters = await increment_counters(db, {PLAYERS: 1, DATA_VERSION: 1})
+    await db.commit()
+    if created:
+        # A cached history lookup for this id predates the player
+        response_cache.invalidate(player_tag(player.id))
+        shared_version.observe_local(counters[DATA_VERSION])
+    return PlayerResponse(**player._mapping)
 
 
 @router.post("/scores", response_model=ScoreResponse)
 @limiter.limit("20/minute")
-async def create_score(request: Request, score_data: ScoreCreate, db: Session = Depends(get_db)):
+async def create_score(
+    request: Request, score_data: ScoreCreate, db: AsyncSession = Depends(get_async_db)
+):
     """Save a game score"""
-    # Verify player exists
-    player = db.query(Player).filter(Player.id == score_data.player_id).first()
-    if not player:
-        raise HTTPException(status_code=404, detail="Player not found")
+    player_id = score_data.player_id
+    row = build_score_rows([score_data])[0]
+
+    if score_buffer.running:
+        # Write-behind mode: read-only existence check, then queue the score
+        # for the next group commit (which also touches the player)
+        nicknames = await find_player_nicknames(db, {player_id})
+        if player_id not in nicknames:
+            raise HTTPException(status_code=404, detail="Player not found")
+        if score_buffer.submit(row, nicknames[player_id]):
+            return ScoreResponse(**row)
+        # Queue full: write through
+        data_version = await insert_scores(db, [row], nicknames)
+    else:
+        # Verify the player exists, read its nickname and bump last_played_at
+        # in one statement, then save the score and projections with it
+        nicknames = await touch_players(db, {player_id})
+        if player_id not in nicknames:
+            raise HTTPException(status_code=404, detail="Player not found")
+        data_version = await insert_scores(db, [row], nicknames, touch=False)
+    await db.commit()
+
+    publish_scores([row], nicknames, data_version)
+    return ScoreResponse(**row)
 
-    # Create score record
-    score = Score(
-        id=str(uuid4()),
-        player_id=score_data.player_id,
-        score=score_data.score,
-        level=score_data.level,
-        lines=score_data.lines,
-        play_time_seconds=score_data.play_time_seconds,
-    )
-    db.add(score)
 
-    # Update player's last played time
-    player.last_played_at = datetime.now(UTC)
+@router.post("/scores/batch", response_model=ScoreBatchResponse)
+@limiter.limit("10/minute")
+async def create_scores_batch(
+    request: Request, batch: ScoreBatchCreate, db: AsyncSession = Depends(get_async_db)
+):
+    """Save several game scores in one transaction (offline queue replay)"""
+    nicknames = await touch_players(db, {item.player_id for item in batch.scores})
+
+    accepted = [item for item in batch.scores if item.player_id in nicknames]
+    rows = build_score_rows(accepted)
+    data_version = await insert_scores(db, rows, nicknames, touch=False)
+    await db.commit()
+    publish_scores(rows, nicknames, data_version)
+
+    # Per-item results in request order
+    saved = iter(rows)
+    results = []
+    for idx, item in enumerate(batch.scores):
+        if item.player_id in nicknames:
+            score = ScoreResponse(**next(saved))
+            results.append(ScoreBatchItemResult(index=idx, status="created", score=score))
+        else:
+            results.append(ScoreBatchItemResult(index=idx, status="player_not_found"))
 
-    db.commit()
-    db.refresh(score)
-    return score
+    return ScoreBatchResponse(results=results, created=len(rows))
 
 
 @router.get("/scores", response_model=RankingResponse)
 @limiter.limit("30/minute")
-async def get_rankings(request: Request, limit: int = 10, db: Session = Depends(get_db)):
+async def get_rankings(
+    request: Request,
+    limit: int = PageLimit,
+    cursor: str | None = None,
+    unique_players: bool = Query(False, description="Best score per player only"),
+    window: Literal["day", "week", "all"] = Query(
+        "all", description="Current UTC day, current ISO week or all time"
+    ),
+    db: AsyncSession = Depends(get_async_db),
+):
     """Get top scores ranking"""
-    scores = (
-        db.query(Score, Player)
-        .join(Player, Score.player_id == Player.id)
-        .order_by(Score.score.desc())
-        .limit(limit)
-        .all()
-    )
+    await shared_version.sync(db)
+    now = utc_now_naive()
+    parts = []
+    if window != "all":
+        # Day / week windows also change when a new period starts
+        parts.append(period_start(window, now).isoformat())
+    headers = cache_headers(*parts)
+    if not_modified(request, headers):
+        return Response(status_code=304, headers=headers)
 
-    ranking_entries = [
-        RankingEntry(
-            rank=idx + 1,
-            player_nickname=player.nickname,
-            score=score.score,
-            level=score.level,
-            lines=score.lines,
-            created_at=score.created_at,
+    if window != "all" and unique_players:
+        raise HTTPException(
+            status_code=400,
+            detail="unique_players is only available for the all-time window",
         )
-        for idx, (score, player) in enumerate(scores)
-    ]
+    # The ranking a cursor continues: positions and ranks differ between them
+    if window != "all":
+        mode = f"{window}:{parts[0]}"
+    else:
+        mode = "unique" if unique_players else "all"
+    after = None
+    if cursor is not None:
+        try:
+            after = RankingCursor.decode(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor") from None
+        if after.mode != mode:
+            raise HTTPException(
+                status_code=400, detail="Cursor belongs to a different ranking"
+            )
 
-    total = db.query(Score).count()
+    async def build() -> bytes:
+        return await ranking_page(db, limit, after, unique_players, window, now, mode)
 
-    return RankingResponse(data=ranking_entries, total=total)
+    key = cache_key(
+        "rankings",
+        limit=limit,
+        cursor=cursor,
+        unique_players=unique_players,
+        window=window,
+        period=parts[0] if parts else None,
+    )
+    body = await cached_read(key, (RANKINGS,), build)
+    return json_response(body, headers)
+
+
+async def ranking_page(
+    db: AsyncSession,
+    limit: int,
+    after: RankingCursor | None,
+    unique_players: bool,
+    window: str,
+    now: datetime,
+    mode: str,
+) -> bytes:
+    """Query one ranking page from the index or table serving its mode"""
+    if window != "all":
+        # Served from the period's rollup rows through their ranking index
+        entries, total = await query_window_rankings(db, window, now, limit, after)
+    elif unique_players:
+        # Served from the player_best projection through its score index
+        entries = await query_unique_rankings(db, limit, after)
+        total = await read_counter(db, RANKED_PLAYERS)
+    else:
+        if not leaderboard.loaded:
+            await leaderboard.load(db)
+        entries = leaderboard.page(limit, after)
+        if entries is None:
+            # Deeper than the in-memory index: fall back to the database
+            entries = await query_rankings(db, limit, after)
+        total = leaderboard.total
+
+    first_rank = after.rank + 1 if after else 1
+    next_cursor = None
+    last_rank = first_rank + len(entries) - 1
+    if len(entries) == limit and last_rank < total:
+        next_cursor = RankingCursor.after(last_rank, entries[-1], mode).encode()
+
+    return render_ranking_page(entries, first_rank, total, next_cursor)
 
 
 @router.get("/scores/{player_id}", response_model=list[ScoreResponse])
 @limiter.limit("30/minute")
 async def get_player_scores(
-    request: Request, player_id: str, limit: int = 10, db: Session = Depends(get_db)
+    request: Request,
+    player_id: str,
+    limit: int = PageLimit,
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get a player's score history"""
-    scores = (
-        db.query(Score)
-        .filter(Score.player_id == player_id)
-        .order_by(Score.created_at.desc())
-        .limit(limit)
-        .all()
+    await shared_version.sync(db)
+    headers = cache_headers()
+    if not_modified(request, headers):
+        return Response(status_code=304, headers=headers)
+
+    async def build() -> bytes:
+        result = await db.scalars(
+            select(Score)
+            .where(Score.player_id == player_id)
+            .order_by(Score.created_at.desc())
+            .limit(limit)
+        )
+        return ScoreHistoryAdapter.dump_json(
+            ScoreHistoryAdapter.validate_python(result.all(), from_attributes=True)
+        )
+
+    key = cache_key("player_scores", player_id=player_id, limit=limit)
+    body = await cached_read(key, (player_tag(player_id),), build)
+    return json_response(body, headers)
+
+
+@router.get("/players/{player_id}/rank", response_model=PlayerRankResponse)
+@limiter.limit("30/minute")
+async def get_player_rank(
+    request: Request,
+    player_id: str,
+    neighbors: int = Query(5, ge=0, le=25, description="Entries above and below"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Get a player's best score, its global rank and the entries around it"""
+    await shared_version.sync(db)
+    best = await query_player_best(db, player_id)
+    if best is None:
+        raise HTTPException(status_code=404, detail="No scores found for player")
+
+    if not rank_index.loaded:
+        await rank_index.load(db)
+    if not leaderboard.loaded:
+        await leaderboard.load(db)
+
+    # Higher scores come from the order-statistic index; only equal scores
+    # need the tie-break on (created_at, id)
+    rank = rank_index.count_above(best.score) + await count_ties_ahead(db, best) + 1
+    cursor = RankingCursor.after(rank, best)
+
+    above = leaderboard.before(neighbors, cursor)
+    if above is None:
+        above = await query_rankings_before(db, neighbors, cursor)
+    below = leaderboard.page(neighbors, cursor)
+    if below is None:
+        below = await query_rankings(db, neighbors, cursor)
+
+    return PlayerRankResponse(
+        player_id=player_id,
+        rank=rank,
+        total=rank_index.total,
+        best=to_ranking_entries([best], rank)[0],
+        above=to_ranking_entries(above, rank - len(above)),
+        below=to_ranking_entries(below, rank + 1),
+    )
+
+
+@router.get("/players/{player_id}/stats", response_model=PlayerStatsResponse)
+@limiter.limit("30/minute")
+async def get_player_stats(
+    request: Request,
+    player_id: str,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Get a player's games played, best and average score and lifetime totals
+
+    Read from the player's player_best row, which score writes keep up to
+    date, so the cost does not grow with the player's history.
+    """
+    stats = await query_player_stats(db, player_id)
+    if stats is None:
+        raise HTTPException(status_code=404, detail="Player not found")
+    games = stats.games_played or 0
+    return PlayerStatsResponse(
+        player_id=player_id,
+        nickname=stats.nickname,
+        games_played=games,
+        best_score=stats.best_score,
+        average_score=round(stats.total_score / games, 1) if games else 0.0,
+        total_score=stats.total_score or 0,
+        total_lines=stats.total_lines or 0,
+        total_play_time_seconds=stats.total_play_time_seconds or 0,
     )
-    return scores
@@ -0,0 +1,41 @@
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_async_db
+from app.schemas.score import ScoreDistributionResponse, ScorePercentiles
+from app.services.distribution import score_distribution
+from app.services.rate_limit import limiter
+
+router = APIRouter(tags=["stats"])
+
+PERCENTILES = {"p25": 0.25, "p50": 0.5, "p75": 0.75, "p90": 0.9, "p99": 0.99}
+
+
+@router.get("/stats/distribution", response_model=ScoreDistributionResponse)
+@limiter.limit("30/minute")
+async def get_score_distribution(
+    request: Request,
+    level: int | None = Query(None, ge=1, le=10, description="Only games at this level"),
+    score: int | None = Query(
+        None, ge=0, le=9999999, description="Score to place in the distribution"
+    ),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Score percentiles, and the share of games a score beats
+
+    Answered from quantile sketches (no table scan): values are within 1%
+    of exact, and games from other workers appear after their next
+    checkpoint.
+    """
+    if not score_distribution.loaded:
+        await score_distribution.load(db)
+    sketch = score_distribution.sketch(level)
+
+    response = ScoreDistributionResponse(level=level, games=sketch.count, score=score)
+    if sketch.count:
+        response.percentiles = ScorePercentiles(
+            **{name: round(sketch.quantile(q)) for name, q in PERCENTILES.items()}
+        )
+        if score is not None:
+            response.beats_percent = round(100 * sketch.rank(score) / sketch.count, 1)
+    return response
@@ -1,17 +1,31 @@
 from app.schemas.score import (
     PlayerCreate,
+    PlayerRankResponse,
     PlayerResponse,
+    PlayerStatsResponse,
     RankingEntry,
     RankingResponse,
+    ScoreBatchCreate,
+    ScoreBatchItemResult,
+    ScoreBatchResponse,
     ScoreCreate,
+    ScoreDistributionResponse,
+    ScorePercentiles,
     ScoreResponse,
 )
 
 __all__ = [
     "PlayerCreate",
     "PlayerResponse",
+    "PlayerRankResponse",
+    "PlayerStatsResponse",
     "ScoreCreate",
     "ScoreResponse",
+    "ScoreBatchCreate",
+    "ScoreBatchItemResult",
+    "ScoreBatchResponse",
     "RankingEntry",
     "RankingResponse",
+    "ScoreDistributionResponse",
+    "ScorePercentiles",
 ]
@@ -1,5 +1,6 @@
 import re
 from datetime import datetime
+from typing import Literal
 
 from pydantic import BaseModel, Field, field_validator
 
@@ -74,6 +75,29 @@ class ScoreResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class ScoreBatchCreate(BaseModel):
+    """Batch score creation request (offline pending-score replay)"""
+
+    scores: list[ScoreCreate] = Field(
+        ..., min_length=1, max_length=100, description="Scores to save"
+    )
+
+
+class ScoreBatchItemResult(BaseModel):
+    """Result for a single item of a batch score request"""
+
+    index: int
+    status: Literal["created", "player_not_found"]
+    score: ScoreResponse | None = None
+
+
+class ScoreBatchResponse(BaseModel):
+    """Batch score creation response"""
+
+    results: list[ScoreBatchItemResult]
+    created: int
+
+
 class RankingEntry(BaseModel):
     """Single ranking entry"""
 
@@ -90,3 +114,54 @@ class RankingResponse(BaseModel):
 
     data: list[RankingEntry]
     total: int
+    next_cursor: str | None = Field(
+        default=None, description="Cursor for the next page, null on the last page"
+    )
+
+
+class PlayerRankResponse(BaseModel):
+    """A player's best score, its global rank and its neighbours"""
+
+    player_id: str
+    rank: int
+    total: int
+    best: RankingEntry
+    above: list[RankingEntry]
+    below: list[RankingEntry]
+
+
+class PlayerStatsResponse(BaseModel):
+    """A player's lifetime totals"""
+
+    player_id: str
+    nickname: str
+    games_played: int
+    best_score: int | None = Field(default=None, description="Null until a game is recorded")
+    average_score: float = Field(description="Mean score, rounded to one decimal")
+    total_score: int
+    total_lines: int
+    total_play_time_seconds: int
+
+
+class ScorePercentiles(BaseModel):
+    """Score at selected percentiles (within 1% of the exact value)"""
+
+    p25: int
+    p50: int
+    p75: int
+    p90: int
+    p99: int
+
+
+class ScoreDistributionResponse(BaseModel):
+    """Score distribution of all games or one level"""
+
+    level: int | None
+    games: int
+    percentiles: ScorePercentiles | None = Field(
+        default=None, description="Null until a game is recorded"
+    )
+    score: int | None = None
+    beats_percent: float | None = Field(
+        default=None, description="Share of games scoring below `score`, in percent"
+    )
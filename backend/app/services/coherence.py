@@ -0,0 +1,147 @@
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+
+from app.config import settings
+from app.database import dialect_insert
+from app.models.counter import Counter
+from app.models.score import Player, Score
+from app.services.counters import DATA_VERSION, read_counter
+from app.services.distribution import score_distribution
+from app.services.etag import leaderboard_version
+from app.services.leaderboard import leaderboard
+from app.services.rank_index import rank_index
+from app.services.response_cache import response_cache
+
+
+@dataclass
+class CoherenceMetrics:
+    """Counters describing cross-worker version checks"""
+
+    checks: int = 0
+    refreshes: int = 0
+
+
+class SharedDataVersion:
+    """Notice writes committed by other worker processes
+
+    Every score or player write increments the `data_version` counter in
+    its own transaction, and the writing worker reports the new value after
+    committing. A version this worker neither produced nor has seen means
+    another worker wrote: the in-process ranking indexes, response cache
+    and ETag version are dropped, and the next read rebuilds them lazily.
+
+    Reads call `sync` first; it reads the counter at most once per
+    `check_interval` seconds (0 checks on every read), which bounds how
+    stale another worker's writes can look. The version seen is also what
+    ETags are built from, so every worker tags the same data alike and that
+    one counter read is all a 304 costs.
+    """
+
+    def __init__(self, enabled: bool, check_interval: float):
+        self.enabled = enabled
+        self.check_interval = check_interval
+        self.metrics = CoherenceMetrics()
+        self.seen: int | None = None
+        self._checked_at = float("-inf")
+        self._hooks: list[Callable[[], None]] = []
+
+    def reset(self) -> None:
+        self.metrics = CoherenceMetrics()
+        self._checked_at = float("-inf")
+        self._see(None)
+
+    def _see(self, version: int | None) -> None:
+        self.seen = version
+        leaderboard_version.observe_shared(version if self.enabled else None)
+
+    async def sync(self, db: AsyncSession) -> None:
+        """Drop local state if another worker wrote since the last check"""
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return
+        self._checked_at = now
+        self.metrics.checks += 1
+        version = await read_counter(db, DATA_VERSION)
+        if self.seen is not None and version > self.seen:
+            self._refresh()
+        if self.seen is None or version > self.seen:
+            self._see(version)
+
+    def observe_local(self, version: int) -> None:
+        """Account for a version this worker committed
+
+        Versions are handed out one at a time under the counter's row lock,
+        so anything but the successor of the last seen version means other
+        workers committed in between.
+        """
+        if not self.enabled:
+            return
+        if self.seen is not None and version > self.seen + 1:
+            self._refresh()
+        if self.seen is None or version > self.seen:
+            self._see(version)
+
+    def on_refresh(self, hook: Callable[[], None]) -> None:
+        """Also call `hook` whenever local state is dropped"""
+        self._hooks.append(hook)
+
+    def _refresh(self) -> None:
+        self.metrics.refreshes += 1
+        self.drop_local_state()
+
+    def drop_local_state(self) -> None:
+        """Forget everything derived in-process from score data"""
+        leaderboard_version.bump()
+        leaderboard.reset()
+        rank_index.reset()
+        response_cache.invalidate_all()
+        score_distribution.invalidate()
+        for hook in self._hooks:
+            hook()
+
+
+shared_version = SharedDataVersion(
+    enabled=settings.worker_coherence,
+    check_interval=settings.worker_coherence_interval_ms / 1000,
+)
+
+
+_DELETED = "scores_deleted"
+
+
+# ORM score and player deletes (cascades included) are writes too: they bump
+# the data version inside the deleting transaction, which other workers
+# notice, and drop this process's state once committed. Indexes such as the
+# bounded top N cannot take a removal incrementally; they rebuild instead.
+@event.listens_for(Score, "after_delete")
+@event.listens_for(Player, "after_delete")
+def _deleted(mapper, connection, target) -> None:
+    stmt = dialect_insert(connection.dialect.name)(Counter).values(
+        name=DATA_VERSION, value=1
+    )
+    connection.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[Counter.name], set_={"value": Counter.value + 1}
+        )
+    )
+    session = object_session(target)
+    if session is not None:
+        session.info[_DELETED] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    if session.info.pop(_DELETED, False):
+        shared_version.drop_local_state()
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_DELETED, None)
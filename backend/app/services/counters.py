@@ -0,0 +1,115 @@
+from collections import Counter as Tally
+from datetime import date
+
+from sqlalchemy import delete, event, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.database import dialect_insert
+from app.models.counter import Counter
+from app.models.player_best import PlayerBest
+from app.models.score import Player, Score
+
+SCORES = "scores"
+PLAYERS = "players"
+RANKED_PLAYERS = "ranked_players"  # players with at least one score
+ROLLUP_PREFIX = "rollup:"  # per-period totals, owned by services.rollups
+DATA_VERSION = "data_version"  # bumped by every write that changes read results
+
+
+def level_counter(level: int) -> str:
+    """Counter name for the number of scores at a level"""
+    return f"scores:level:{level}"
+
+
+def rollup_counter(kind: str, start: date) -> str:
+    """Counter name for the number of scores in a day / week period"""
+    return f"{ROLLUP_PREFIX}{kind}:{start.isoformat()}"
+
+
+def score_counter_deltas(rows: list[dict]) -> dict[str, int]:
+    """Counter increments for a set of inserted score rows"""
+    deltas = Tally(level_counter(row["level"]) for row in rows)
+    deltas[SCORES] = len(rows)
+    return dict(deltas)
+
+
+async def increment_counters(db: AsyncSession, deltas: dict[str, int]) -> dict[str, int]:
+    """Add deltas to counters in one upsert (caller commits)
+
+    Returns the incremented counters' new values. Rows go in name order so
+    concurrent writers lock the counter rows in the same order (PostgreSQL
+    would otherwise deadlock two batches listing levels in opposite order).
+    """
+    if not deltas:
+        return {}
+    insert = dialect_insert(db.bind.dialect.name)
+    stmt = insert(Counter).values(
+        [{"name": name, "value": deltas[name]} for name in sorted(deltas)]
+    )
+    result = await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[Counter.name],
+            set_={"value": Counter.value + stmt.excluded.value},
+        ).returning(Counter.name, Counter.value)
+    )
+    return dict(result.all())
+
+
+async def read_counter(db: AsyncSession, name: str) -> int:
+    """Read a counter by primary key (0 if it was never incremented)"""
+    value = await db.scalar(select(Counter.value).where(Counter.name == name))
+    return value or 0
+
+
+def rebuild_counters(db: Session) -> dict[str, int]:
+    """Recompute every counter from the base tables
+
+    Rollup period counters are left alone: they track the rollup table, which
+    is not derived from the full score history. So is the data version, which
+    must never go backwards.
+    """
+    values = {
+        SCORES: db.scalar(select(func.count()).select_from(Score)),
+        PLAYERS: db.scalar(select(func.count()).select_from(Player)),
+        RANKED_PLAYERS: db.scalar(select(func.count(func.distinct(Score.player_id)))),
+    }
+    for level, count in db.execute(
+        select(Score.level, func.count()).group_by(Score.level)
+    ):
+        values[level_counter(level)] = count
+
+    db.execute(
+        delete(Counter).where(
+            Counter.name.not_like(f"{ROLLUP_PREFIX}%"), Counter.name != DATA_VERSION
+        )
+    )
+    db.execute(
+        dialect_insert(db.get_bind().dialect.name)(Counter),
+        [{"name": name, "value": value} for name, value in values.items()],
+    )
+    db.commit()
+    return values
+
+
+def _decrement(connection, names: list[str]) -> None:
+    connection.execute(
+        update(Counter).where(Counter.name.in_(names)).values(value=Counter.value - 1)
+    )
+
+
+# ORM deletes (including player -> score cascades) keep counters in step
+# inside the deleting transaction
+@event.listens_for(Score, "after_delete")
+def _score_deleted(mapper, connection, target) -> None:
+    _decrement(connection, [SCORES, level_counter(target.level)])
+
+
+@event.listens_for(Player, "after_delete")
+def _player_deleted(mapper, connection, target) -> None:
+    _decrement(connection, [PLAYERS])
+
+
+@event.listens_for(PlayerBest, "after_delete")
+def _player_best_deleted(mapper, connection, target) -> None:
+    _decrement(connection, [RANKED_PLAYERS])
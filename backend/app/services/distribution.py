@@ -0,0 +1,212 @@
+import asyncio
+import logging
+
+from sqlalchemy import Connection, delete, event, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import dialect_insert
+from app.models.score import Score
+from app.models.sketch import ScoreSketchBucket
+from app.services.sketch import QuantileSketch
+
+logger = logging.getLogger(__name__)
+
+# Bucket boundaries depend on it: changing it needs `rebuild-sketches`
+RELATIVE_ACCURACY = 0.01
+ALL = "all"
+
+
+def level_sketch(level: int) -> str:
+    """Sketch key for the scores at a level"""
+    return f"level:{level}"
+
+
+def new_sketch() -> QuantileSketch:
+    return QuantileSketch(RELATIVE_ACCURACY)
+
+
+def sketches_from_scores(conn: Connection | Session) -> dict[str, QuantileSketch]:
+    """Build every sketch from the score table (one grouped scan)"""
+    sketches: dict[str, QuantileSketch] = {ALL: new_sketch()}
+    grouped = conn.execute(
+        select(Score.level, Score.score, func.count()).group_by(Score.level, Score.score)
+    )
+    for level, score, count in grouped:
+        sketches[ALL].add(score, count)
+        sketches.setdefault(level_sketch(level), new_sketch()).add(score, count)
+    return sketches
+
+
+def bucket_rows(sketches: dict[str, QuantileSketch]) -> list[dict]:
+    return [
+        {"sketch": key, "bucket": bucket, "count": count}
+        for key, sketch in sketches.items()
+        for bucket, count in sketch.buckets()
+    ]
+
+
+def rebuild_sketches(db: Session) -> int:
+    """Recompute the checkpointed sketches from history; returns the row count
+
+    Scores that running workers have not checkpointed yet are added again
+    by their next checkpoint, so run this while the API is stopped.
+    """
+    rows = bucket_rows(sketches_from_scores(db))
+    db.execute(delete(ScoreSketchBucket))
+    if rows:
+        db.execute(insert(ScoreSketchBucket), rows)
+    db.commit()
+    return len(rows)
+
+
+class ScoreDistribution:
+    """Score distribution per level and overall, from quantile sketches
+
+    New scores are added in O(1) to the in-memory sketches and to a pending
+    delta. A background task checkpoints the delta every
+    `checkpoint_interval` seconds by adding its bucket counts to
+    score_sketch_bucket, then reloads the sketches from that table, which
+    also picks up other workers' checkpoints. A restart costs one read of
+    those rows instead of a scan of the score table; scores published since
+    the last checkpoint are lost if the process dies (`rebuild-sketches`
+    recomputes everything from history).
+    """
+
+    def __init__(self, checkpoint_interval: float):
+        self.checkpoint_interval = checkpoint_interval
+        self._view: dict[str, QuantileSketch] | None = None
+        self._pending: dict[str, QuantileSketch] = {}
+        self._session_factory: async_sessionmaker[AsyncSession] | None = None
+        self._lock: asyncio.Lock | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._view is not None
+
+    def reset(self) -> None:
+        """Forget the loaded sketches and any pending delta"""
+        self._view = None
+        self._pending = {}
+
+    def invalidate(self) -> None:
+        """Reload the sketches (checkpoints plus pending delta) on next read"""
+        self._view = None
+
+    def add(self, score: int, level: int) -> None:
+        """Record a committed score"""
+        for key in (ALL, level_sketch(level)):
+            self._pending.setdefault(key, new_sketch()).add(score)
+            if self._view is not None:
+                self._view.setdefault(key, new_sketch()).add(score)
+
+    def sketch(self, level: int | None = None) -> QuantileSketch:
+        """The sketch for a level (or every level); load() first"""
+        key = ALL if level is None else level_sketch(level)
+        return self._view.get(key) or new_sketch()
+
+    async def load(self, db: AsyncSession) -> None:
+        """Read the checkpointed sketches and apply the pending delta"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            await self._load(db)
+
+    async def _load(self, db: AsyncSession) -> None:
+        result = await db.execute(
+            select(
+                ScoreSketchBucket.sketch, ScoreSketchBucket.bucket, ScoreSketchBucket.count
+            )
+        )
+        view: dict[str, QuantileSketch] = {}
+        for key, bucket, count in result:
+            view.setdefault(key, new_sketch()).add_bucket(bucket, count)
+        # Scores published while the query ran are in the pending delta too
+        for key, sketch in self._pending.items():
+            view.setdefault(key, new_sketch()).merge(sketch)
+        self._view = view
+
+    async def checkpoint(self, db: AsyncSession) -> int:
+        """Persist the pending delta and reload; returns the buckets written"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            delta, self._pending = self._pending, {}
+            rows = bucket_rows(delta)
+            if rows:
+                try:
+                    stmt = dialect_insert(db.bind.dialect.name)(ScoreSketchBucket)
+                    await db.execute(
+                        stmt.on_conflict_do_update(
+                            index_elements=[
+                                ScoreSketchBucket.sketch,
+                                ScoreSketchBucket.bucket,
+                            ],
+                            set_={"count": ScoreSketchBucket.count + stmt.excluded.count},
+                        ),
+                        rows,
+                    )
+                    await db.commit()
+                except BaseException:
+                    # Failed or cancelled (stop() during a periodic run): keep
+                    # the delta for the next attempt
+                    for key, sketch in delta.items():
+                        self._pending.setdefault(key, new_sketch()).merge(sketch)
+                    raise
+            await self._load(db)
+        return len(rows)
+
+    def start(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        """Start the periodic checkpoint task"""
+        if self._task is not None:
+            return
+        self._session_factory = session_factory
+        self._lock = asyncio.Lock()
+        self.reset()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the checkpoint task and persist what is still pending"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        if self._pending:
+            async with self._session_factory() as db:
+                await self.checkpoint(db)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.checkpoint_interval)
+            try:
+                async with self._session_factory() as db:
+                    await self.checkpoint(db)
+            except Exception:
+                logger.exception("Failed to checkpoint score distribution sketches")
+
+
+score_distribution = ScoreDistribution(settings.distribution_checkpoint_seconds)
+
+
+# ORM deletes (including player -> score cascades) take the score out of
+# the checkpointed sketches inside the deleting transaction. A score not
+# checkpointed yet has nothing to take out of: counts stop at zero rather
+# than going negative (`rebuild-sketches` corrects what its checkpoint adds)
+@event.listens_for(Score, "after_delete")
+def _score_deleted(mapper, connection, target) -> None:
+    bucket = new_sketch().bucket(target.score)
+    connection.execute(
+        update(ScoreSketchBucket)
+        .where(
+            ScoreSketchBucket.sketch.in_([ALL, level_sketch(target.level)]),
+            ScoreSketchBucket.bucket == bucket,
+            ScoreSketchBucket.count > 0,
+        )
+        .values(count=ScoreSketchBucket.count - 1)
+    )
@@ -0,0 +1,48 @@
+from uuid import uuid4
+
+
+class LeaderboardVersion:
+    """Process-wide, monotonically increasing score data version
+
+    Every committed score write bumps the version, so an ETag built from it
+    changes whenever ranking or history data may have changed. The epoch is
+    random per process: a restart never reissues a tag for different data.
+
+    With several workers a per-process tag would never match on another
+    worker, so once the shared `data_version` counter is known (worker
+    coherence) the ETag is built from it instead and is the same everywhere.
+    """
+
+    def __init__(self) -> None:
+        self.epoch = uuid4().hex[:8]
+        self.value = 0
+        self.shared: int | None = None
+
+    def bump(self) -> None:
+        self.value += 1
+
+    def observe_shared(self, version: int | None) -> None:
+        """Build ETags from the database's data version (None: process-local)"""
+        self.shared = version
+
+    def etag(self, *parts: str) -> str:
+        """Strong ETag for the current version plus representation parts"""
+        if self.shared is not None:
+            version = [f"d{self.shared}"]
+        else:
+            version = [self.epoch, str(self.value)]
+        return '"' + "-".join([*version, *parts]) + '"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Whether an If-None-Match header matches (weak comparison, RFC 9110)"""
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(",")
+    )
+
+
+leaderboard_version = LeaderboardVersion()
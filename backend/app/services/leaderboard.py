@@ -0,0 +1,317 @@
+import base64
+import hashlib
+import hmac
+import json
+import secrets
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import ColumnElement, Select, and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.player_best import PlayerBest
+from app.models.score import Player, Score
+from app.services.counters import SCORES, read_counter
+
+
+@dataclass(frozen=True, slots=True)
+class LeaderboardEntry:
+    """Single ranked score held by the in-memory index"""
+
+    score: int
+    created_at: datetime
+    nickname: str
+    level: int
+    lines: int
+    score_id: str
+
+
+def ranking_key(entry: LeaderboardEntry) -> tuple:
+    """Sort key matching the SQL ranking order (score DESC, created_at, id)"""
+    return (-entry.score, entry.created_at, entry.score_id)
+
+
+# Per-process fallback: cursors then only verify on the worker that issued them
+_CURSOR_SECRET = (settings.cursor_secret or secrets.token_hex(32)).encode()
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _b64decode(value: str) -> bytes:
+    return base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+
+
+def _cursor_signature(raw: bytes) -> bytes:
+    return hmac.new(_CURSOR_SECRET, raw, hashlib.sha256).digest()[:16]
+
+
+@dataclass(frozen=True, slots=True)
+class RankingCursor:
+    """Keyset position of the last entry on a ranking page
+
+    `mode` names the ranking the page came from ("all", "unique" or
+    "<window>:<period start>"): the keyset and the rank only hold there.
+    """
+
+    rank: int
+    score: int
+    created_at: datetime
+    score_id: str
+    mode: str = "all"
+
+    @property
+    def key(self) -> tuple:
+        return (-self.score, self.created_at, self.score_id)
+
+    @classmethod
+    def after(
+        cls, rank: int, entry: LeaderboardEntry, mode: str = "all"
+    ) -> "RankingCursor":
+        """Cursor pointing just past `entry`, which sits at `rank`"""
+        return cls(rank, entry.score, entry.created_at, entry.score_id, mode)
+
+    def encode(self) -> str:
+        """Opaque, URL-safe cursor string, signed with settings.cursor_secret"""
+        payload = [
+            self.rank,
+            self.score,
+            self.created_at.isoformat(),
+            self.score_id,
+            self.mode,
+        ]
+        raw = json.dumps(payload, separators=(",", ":")).encode()
+        return f"{_b64encode(raw)}.{_b64encode(_cursor_signature(raw))}"
+
+    @classmethod
+    def decode(cls, value: str) -> "RankingCursor":
+        """Parse a cursor string; raises ValueError if malformed or tampered with
+
+        The rank is echoed back in the next page, so only cursors this
+        server signed are accepted.
+        """
+        try:
+            body, signature = value.split(".")
+            raw = _b64decode(body)
+            if not hmac.compare_digest(_b64decode(signature), _cursor_signature(raw)):
+                raise ValueError("Bad cursor signature")
+            rank, score, created_at, score_id, mode = json.loads(raw)
+            cursor = cls(
+                int(rank),
+                int(score),
+                datetime.fromisoformat(created_at),
+                str(score_id),
+                str(mode),
+            )
+        except (TypeError, ValueError) as e:
+            raise ValueError("Invalid cursor") from e
+        if cursor.rank < 1:
+            raise ValueError("Invalid cursor")
+        return cursor
+
+
+def ranked_after(after: RankingCursor, score, created_at, score_id) -> ColumnElement:
+    """Keyset condition for rows ranked after the cursor
+
+    Takes the (score, created_at, id) columns so projections that share the
+    ranking order can reuse it.
+    """
+    return or_(
+        score < after.score,
+        and_(score == after.score, created_at > after.created_at),
+        and_(
+            score == after.score,
+            created_at == after.created_at,
+            score_id > after.score_id,
+        ),
+    )
+
+
+def _entry_select() -> Select:
+    """Select LeaderboardEntry columns from score joined with player"""
+    return select(
+        Score.score,
+        Score.created_at,
+        Player.nickname,
+        Score.level,
+        Score.lines,
+        Score.id,
+    ).join(Player, Score.player_id == Player.id)
+
+
+def ranking_statement(limit: int, after: RankingCursor | None = None) -> Select:
+    """Ranking query selecting LeaderboardEntry columns in ranking order
+
+    With a cursor, seeks past it on (score DESC, created_at, id) instead of
+    using OFFSET, so deep pages cost the same as the first one.
+    """
+    stmt = (
+        _entry_select()
+        .order_by(Score.score.desc(), Score.created_at.asc(), Score.id.asc())
+        .limit(limit)
+    )
+    if after is not None:
+        stmt = stmt.where(ranked_after(after, Score.score, Score.created_at, Score.id))
+    return stmt
+
+
+async def query_rankings(
+    db: AsyncSession, limit: int, after: RankingCursor | None = None
+) -> list[LeaderboardEntry]:
+    """Run the ranking query against the database"""
+    result = await db.execute(ranking_statement(limit, after))
+    return [LeaderboardEntry(*row) for row in result.all()]
+
+
+async def query_rankings_before(
+    db: AsyncSession, limit: int, before: RankingCursor
+) -> list[LeaderboardEntry]:
+    """Up to `limit` entries ranked directly above the cursor, in ranking order"""
+    result = await db.execute(
+        _entry_select()
+        .where(
+            or_(
+                Score.score > before.score,
+                and_(Score.score == before.score, Score.created_at < before.created_at),
+                and_(
+                    Score.score == before.score,
+                    Score.created_at == before.created_at,
+                    Score.id < before.score_id,
+                ),
+            )
+        )
+        .order_by(Score.score.asc(), Score.created_at.desc(), Score.id.desc())
+        .limit(limit)
+    )
+    return [LeaderboardEntry(*row) for row in reversed(result.all())]
+
+
+async def query_player_best(db: AsyncSession, player_id: str) -> LeaderboardEntry | None:
+    """A player's best-ranked score
+
+    Read from the player's player_best row (a primary-key lookup); the
+    player's score history is only sorted when that row is missing.
+    """
+    result = await db.execute(
+        select(
+            PlayerBest.best_score,
+            PlayerBest.achieved_at,
+            PlayerBest.nickname,
+            PlayerBest.level,
+            PlayerBest.lines,
+            PlayerBest.score_id,
+        ).where(PlayerBest.player_id == player_id)
+    )
+    row = result.first()
+    if row:
+        return LeaderboardEntry(*row)
+    result = await db.execute(
+        _entry_select()
+        .where(Score.player_id == player_id)
+        .order_by(Score.score.desc(), Score.created_at.asc(), Score.id.asc())
+        .limit(1)
+    )
+    row = result.first()
+    return LeaderboardEntry(*row) if row else None
+
+
+async def count_ties_ahead(db: AsyncSession, entry: LeaderboardEntry) -> int:
+    """Scores equal to `entry` that rank ahead of it (earlier or lower id)"""
+    return await db.scalar(
+        select(func.count())
+        .select_from(Score)
+        .where(
+            Score.score == entry.score,
+            or_(
+                Score.created_at < entry.created_at,
+                and_(Score.created_at == entry.created_at, Score.id < entry.score_id),
+            ),
+        )
+    )
+
+
+class LeaderboardIndex:
+    """Process-local top-N ranking index
+
+    Keeps the best `depth` scores sorted in ranking order so that ranking
+    reads within that depth never touch the database. Writes only add
+    scores, so a bounded list stays exact: a score that falls out of the
+    top N can never climb back in. Deletes drop the whole index instead
+    (see app.services.coherence).
+    """
+
+    def __init__(self, depth: int):
+        self.depth = depth
+        self.loaded = False
+        self.total = 0
+        self._entries: list[LeaderboardEntry] = []
+        self._writes = 0
+
+    def reset(self) -> None:
+        """Drop the index so the next read rebuilds it"""
+        self.loaded = False
+        self.total = 0
+        self._entries = []
+
+    async def load(self, db: AsyncSession) -> None:
+        """Build the index from the database"""
+        while True:
+            # Scores committed while the queries are awaited would be missed
+            # by add(), so retry until a load completes without interleaving
+            writes = self._writes
+            entries = await query_rankings(db, self.depth)
+            total = await read_counter(db, SCORES)
+            if writes == self._writes:
+                break
+        self._entries = entries
+        self.total = total
+        self.loaded = True
+
+    def add(self, entry: LeaderboardEntry) -> None:
+        """Record a newly saved score"""
+        self._writes += 1
+        if not self.loaded:
+            return
+        self.total += 1
+        if len(self._entries) >= self.depth and ranking_key(entry) >= ranking_key(
+            self._entries[-1]
+        ):
+            return
+        insort(self._entries, entry, key=ranking_key)
+        del self._entries[self.depth :]
+
+    def page(
+        self, limit: int, after: RankingCursor | None = None
+    ) -> list[LeaderboardEntry] | None:
+        """Return up to `limit` entries after the cursor
+
+        Returns None when the page reaches past the index while the database
+        holds more scores than the index does.
+        """
+        if not self.loaded or limit < 0:
+            return None
+        start = 0
+        if after is not None:
+            start = bisect_right(self._entries, after.key, key=ranking_key)
+        end = start + limit
+        if end > len(self._entries) and self.total > len(self._entries):
+            return None
+        return self._entries[start:end]
+
+    def before(self, limit: int, cursor: RankingCursor) -> list[LeaderboardEntry] | None:
+        """Return up to `limit` entries ranked directly above the cursor
+
+        Returns None when the cursor lies past the end of a partial index.
+        """
+        if not self.loaded:
+            return None
+        end = bisect_left(self._entries, cursor.key, key=ranking_key)
+        if end == len(self._entries) and self.total > len(self._entries):
+            return None
+        return self._entries[max(0, end - limit) : end]
+
+
+leaderboard = LeaderboardIndex(settings.leaderboard_index_depth)
@@ -0,0 +1,270 @@
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import dataclass, field
+
+from pydantic_core import to_json
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.services.coherence import shared_version
+from app.services.leaderboard import LeaderboardEntry, leaderboard, ranking_key
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT = b": ping\n\n"
+RECONNECT_MS = 3000
+COHERENCE_POLL_SECONDS = 1.0  # how often other workers' writes are picked up
+
+
+@dataclass
+class LiveMetrics:
+    """Counters describing live leaderboard subscribers"""
+
+    subscribers: int = 0
+    events: int = 0
+    dropped: int = 0
+
+
+@dataclass(eq=False)
+class Subscriber:
+    """One live connection: a bounded queue of encoded events
+
+    A None in the queue ends the stream.
+    """
+
+    queue: asyncio.Queue = field(repr=False)
+
+
+def entry_payload(rank: int, entry: LeaderboardEntry) -> dict:
+    return {
+        "rank": rank,
+        "id": entry.score_id,
+        "player_nickname": entry.nickname,
+        "score": entry.score,
+        "level": entry.level,
+        "lines": entry.lines,
+        "created_at": entry.created_at,
+    }
+
+
+def leaderboard_diff(
+    old: list[LeaderboardEntry], new: list[LeaderboardEntry]
+) -> dict | None:
+    """What changed between two top-N lists, or None if nothing did
+
+    `entered` carries full entries, `moved` only id and new rank, and
+    `dropped` the ids that left the top N.
+    """
+    old_ranks = {entry.score_id: rank for rank, entry in enumerate(old, 1)}
+    new_ids = {entry.score_id for entry in new}
+    entered, moved = [], []
+    for rank, entry in enumerate(new, 1):
+        previous = old_ranks.get(entry.score_id)
+        if previous is None:
+            entered.append(entry_payload(rank, entry))
+        elif previous != rank:
+            moved.append({"id": entry.score_id, "rank": rank})
+    dropped = [entry.score_id for entry in old if entry.score_id not in new_ids]
+    if not (entered or moved or dropped):
+        return None
+    return {"entered": entered, "moved": moved, "dropped": dropped}
+
+
+def encode_event(event: str, seq: int, data: dict) -> bytes:
+    return b"id: %d\nevent: %s\ndata: %s\n\n" % (seq, event.encode(), to_json(data))
+
+
+class LiveLeaderboard:
+    """Push top-N ranking changes to Server-Sent Events subscribers
+
+    One fan-out task per process serves every connection. Score writes only
+    mark the top N dirty when a new score would enter it; the task then
+    diffs the ranking index against the last published list, encodes the
+    diff once and queues the same bytes to every subscriber. Each queue
+    holds at most `buffer_size` events; a subscriber that falls that far
+    behind is disconnected (clients reconnect and start from a snapshot).
+    """
+
+    def __init__(
+        self, top_n: int, max_subscribers: int, buffer_size: int, heartbeat_seconds: float
+    ):
+        self.top_n = top_n
+        self.max_subscribers = max_subscribers
+        self.buffer_size = buffer_size
+        self.heartbeat = heartbeat_seconds
+        self.metrics = LiveMetrics()
+        self._session_factory: async_sessionmaker[AsyncSession] | None = None
+        self._subscribers: set[Subscriber] = set()
+        self._top: list[LeaderboardEntry] = []
+        self._seq = 0
+        self._stale = True  # nobody listened since the last publish
+        self._dirty = False
+        self._lock: asyncio.Lock | None = None
+        self._wake: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def start(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        """Start the fan-out task"""
+        if self._task is not None:
+            return
+        self._session_factory = session_factory
+        self._subscribers = set()
+        self._top = []
+        self._stale = True
+        self._dirty = False
+        self.metrics = LiveMetrics()
+        self._lock = asyncio.Lock()
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the fan-out task and end every stream"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        for subscriber in list(self._subscribers):
+            self._close(subscriber)
+
+    def notify(self, entries: Iterable[LeaderboardEntry]) -> None:
+        """Note newly committed scores (after the ranking index has them)"""
+        if self._task is None or not self._subscribers or self._dirty:
+            return
+        cutoff = ranking_key(self._top[-1]) if len(self._top) >= self.top_n else None
+        if any(cutoff is None or ranking_key(entry) < cutoff for entry in entries):
+            self._dirty = True
+            self._wake.set()
+
+    def invalidate(self) -> None:
+        """Re-read the top N: local state was dropped (deletes, other workers)
+
+        May run outside the event loop (a sync session committing a delete).
+        """
+        if self._task is None or not self._subscribers:
+            return
+        self._dirty = True
+        self._task.get_loop().call_soon_threadsafe(self._wake.set)
+
+    async def subscribe(self) -> Subscriber | None:
+        """Register a connection; None when not running or at capacity
+
+        The subscriber's queue starts with a snapshot of the current top N,
+        so every later diff applies on top of what it has received.
+        """
+        if self._task is None or len(self._subscribers) >= self.max_subscribers:
+            return None
+        subscriber = Subscriber(asyncio.Queue(maxsize=self.buffer_size))
+        async with self._lock:
+            if self._stale:
+                # Writes are not tracked while nobody listens
+                self._top = await self._current_top()
+                self._stale = False
+                self._dirty = False
+            snapshot = {
+                "rankings": [
+                    entry_payload(rank, entry) for rank, entry in enumerate(self._top, 1)
+                ]
+            }
+            subscriber.queue.put_nowait(
+                b"retry: %d\n" % RECONNECT_MS + encode_event("snapshot", self._seq, snapshot)
+            )
+            self._subscribers.add(subscriber)
+        self.metrics.subscribers = len(self._subscribers)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self._subscribers.discard(subscriber)
+        self.metrics.subscribers = len(self._subscribers)
+        if not self._subscribers:
+            self._stale = True
+
+    async def events(self, subscriber: Subscriber) -> AsyncIterator[bytes]:
+        """The subscriber's event stream, ending when it is dropped"""
+        try:
+            while (event := await subscriber.queue.get()) is not None:
+                yield event
+        finally:
+            self.unsubscribe(subscriber)
+
+    async def _current_top(self) -> list[LeaderboardEntry]:
+        async with self._session_factory() as db:
+            if shared_version.enabled:
+                await shared_version.sync(db)
+            if not leaderboard.loaded:
+                await leaderboard.load(db)
+        return leaderboard.page(self.top_n) or []
+
+    async def _publish(self) -> None:
+        """Broadcast the diff between the last published and current top N"""
+        async with self._lock:
+            self._dirty = False
+            top = await self._current_top()
+            diff = leaderboard_diff(self._top, top)
+            self._top = top
+            if diff is None:
+                return
+            self._seq += 1
+            self.metrics.events += 1
+            self._broadcast(encode_event("diff", self._seq, diff))
+
+    def _broadcast(self, event: bytes) -> None:
+        for subscriber in list(self._subscribers):
+            try:
+                subscriber.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self._drop(subscriber)
+
+    def _close(self, subscriber: Subscriber) -> None:
+        """End a subscriber's stream, discarding whatever it has not read"""
+        while not subscriber.queue.empty():
+            subscriber.queue.get_nowait()
+        subscriber.queue.put_nowait(None)
+        self.unsubscribe(subscriber)
+
+    def _drop(self, subscriber: Subscriber) -> None:
+        self._close(subscriber)
+        self.metrics.dropped += 1
+
+    async def _run(self) -> None:
+        interval = self.heartbeat
+        if shared_version.enabled:
+            interval = min(interval, COHERENCE_POLL_SECONDS)
+        next_heartbeat = time.monotonic() + self.heartbeat
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), interval)
+            except TimeoutError:
+                pass
+            self._wake.clear()
+            if not self._subscribers:
+                continue
+            if self._dirty or shared_version.enabled:
+                try:
+                    await self._publish()
+                except Exception:
+                    logger.exception("Failed to publish live leaderboard changes")
+            if time.monotonic() >= next_heartbeat:
+                # Keeps idle connections open through proxies and notices
+                # clients that went away
+                next_heartbeat = time.monotonic() + self.heartbeat
+                self._broadcast(HEARTBEAT)
+
+
+live_leaderboard = LiveLeaderboard(
+    top_n=settings.live_top_n,
+    max_subscribers=settings.live_max_subscribers,
+    buffer_size=settings.live_client_buffer,
+    heartbeat_seconds=settings.live_heartbeat_seconds,
+)
+# Deletes and other workers' writes reset the ranking index without notify()
+shared_version.on_refresh(live_leaderboard.invalidate)
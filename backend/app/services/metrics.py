@@ -0,0 +1,212 @@
+import re
+import time
+from bisect import bisect_left
+from collections.abc import Iterable
+from functools import lru_cache
+
+from sqlalchemy import Engine, event
+
+from app.services.query_budget import record_statement
+
+# Upper bounds (seconds); +Inf is implied
+REQUEST_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SQL_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.1, 0.5, 1)
+FINGERPRINT_MAX_LENGTH = 200
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values, strict=True)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """Prometheus histogram keyed by label values
+
+    An observation is a bisect plus two list / float updates on an entry
+    created once per label set; no lock is taken. Observations come from
+    the event loop thread, and the GIL keeps a rare racing update from a
+    worker thread from corrupting anything beyond a single count.
+    """
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...], buckets: tuple):
+        self.name = name
+        self.help = help
+        self.label_names = labels
+        self.buckets = buckets
+        # label values -> [per-bucket counts (last is +Inf), sum]
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, value: float, *labels) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def clear(self) -> None:
+        self._series.clear()
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        for labels, (counts, total) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts, strict=True):
+                cumulative += count
+                le = 'le="' + (bound if bound == "+Inf" else _number(float(bound))) + '"'
+                yield f"{self.name}_bucket{_labels(self.label_names, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.label_names, labels)} {_number(total)}"
+            yield f"{self.name}_count{_labels(self.label_names, labels)} {cumulative}"
+
+
+class Gauge:
+    """Prometheus gauge keyed by label values"""
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = labels
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) - amount
+
+    def clear(self) -> None:
+        self._values.clear()
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} gauge"
+        for labels, value in sorted(self._values.items()):
+            yield f"{self.name}{_labels(self.label_names, labels)} {_number(value)}"
+
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time to serve a request, by route template and status",
+    ("method", "route", "status"),
+    REQUEST_BUCKETS,
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "Requests currently being served", ("method",)
+)
+SQL_DURATION = Histogram(
+    "db_statement_duration_seconds",
+    "Cursor execution time, by normalized statement",
+    ("statement",),
+    SQL_BUCKETS,
+)
+
+REGISTRY = [REQUESTS_IN_FLIGHT, REQUEST_DURATION, SQL_DURATION]
+
+
+def reset_metrics() -> None:
+    for metric in REGISTRY:
+        metric.clear()
+
+
+def render_metrics(extra: dict[str, dict[str, float]] | None = None) -> str:
+    """Prometheus text exposition of every metric
+
+    `extra` maps a metric prefix to flat counters (e.g. the response cache
+    metrics dataclass), exported as untyped samples.
+    """
+    lines = [line for metric in REGISTRY for line in metric.render()]
+    for prefix, values in (extra or {}).items():
+        for field, value in values.items():
+            name = f"{prefix}_{field}"
+            lines.append(f"# TYPE {name} untyped")
+            lines.append(f"{name} {_number(value)}")
+    return "\n".join(lines) + "\n"
+
+
+# Placeholders in any DB-API paramstyle (not a PostgreSQL ::cast), and literals
+_PLACEHOLDER = re.compile(r"%s|\$\d+|(?<![:\w]):\w+|%\(\w+\)s")
+_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_VALUES = re.compile(r"VALUES\s*\(\?\)(?:\s*,\s*\(\?\))+", re.IGNORECASE)
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_SPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> str:
+    """Statement text with literals and expanded IN / VALUES lists folded
+
+    `IN (?, ?, ?)` and multi-row `VALUES (...), (...)` collapse to one
+    placeholder group, so statements differing only in list length share
+    a series.
+    """
+    text = _SPACE.sub(" ", statement).strip()
+    # First, so the literal pass never sees the digits of "$1"
+    text = _PLACEHOLDER.sub("?", text)
+    text = _LITERAL.sub("?", text)
+    text = _LIST.sub("(?)", text)
+    text = _VALUES.sub("VALUES (?)", text)
+    return text[:FINGERPRINT_MAX_LENGTH]
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._metrics_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_metrics_started", None)
+    if started is not None:
+        elapsed = time.perf_counter() - started
+        statement = fingerprint(statement)
+        SQL_DURATION.observe(elapsed, statement)
+        record_statement(statement, elapsed)
+
+
+class MetricsMiddleware:
+    """ASGI middleware timing every HTTP request
+
+    Routes are labelled with their template (/scores/{player_id}), never
+    the raw path, so label cardinality stays bounded; unmatched paths
+    share one label.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc(method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            REQUESTS_IN_FLIGHT.dec(method)
+            route = scope.get("route")
+            template = getattr(route, "path_format", None) or "unmatched"
+            REQUEST_DURATION.observe(
+                time.perf_counter() - started, method, template, status
+            )
@@ -0,0 +1,195 @@
+from collections import Counter as Tally
+
+from sqlalchemy import Row, Select, case, delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.database import dialect_insert
+from app.models.player_best import PlayerBest
+from app.models.score import Player, Score
+from app.services.leaderboard import LeaderboardEntry, RankingCursor, ranked_after
+
+
+def ranking_order(row: dict) -> tuple:
+    """Sort key of a score row in ranking order"""
+    return (-row["score"], row["created_at"], row["id"])
+
+
+def _best_rows(rows: list[dict], nicknames: dict[str, str]) -> list[dict]:
+    """Reduce score rows to one candidate best row per player"""
+    games = Tally(row["player_id"] for row in rows)
+    totals: dict[str, Tally] = {}
+    best: dict[str, dict] = {}
+    for row in rows:
+        totals.setdefault(row["player_id"], Tally()).update(
+            total_score=row["score"],
+            total_lines=row["lines"],
+            total_play_time_seconds=row["play_time_seconds"],
+        )
+        current = best.get(row["player_id"])
+        if current is None or ranking_order(row) < ranking_order(current):
+            best[row["player_id"]] = row
+    return [
+        {
+            "player_id": player_id,
+            "nickname": nicknames[player_id],
+            "score_id": row["id"],
+            "best_score": row["score"],
+            "level": row["level"],
+            "lines": row["lines"],
+            "achieved_at": row["created_at"],
+            "games_played": games[player_id],
+            **totals[player_id],
+        }
+        for player_id, row in best.items()
+    ]
+
+
+async def upsert_player_best(
+    db: AsyncSession, rows: list[dict], nicknames: dict[str, str]
+) -> int:
+    """Fold new score rows into player_best (caller commits)
+
+    The best score is replaced when beaten; games and totals are added.
+
+    Returns how many players got their first row, so callers can keep the
+    ranked-player counter in step.
+    """
+    values = _best_rows(rows, nicknames)
+    if not values:
+        return 0
+    insert = dialect_insert(db.bind.dialect.name)
+    stmt = insert(PlayerBest).values(values)
+    improved = stmt.excluded.best_score > PlayerBest.best_score
+
+    def keep_best(column):
+        return case((improved, stmt.excluded[column.key]), else_=column)
+
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[PlayerBest.player_id],
+        set_={
+            "score_id": keep_best(PlayerBest.score_id),
+            "best_score": keep_best(PlayerBest.best_score),
+            "level": keep_best(PlayerBest.level),
+            "lines": keep_best(PlayerBest.lines),
+            "achieved_at": keep_best(PlayerBest.achieved_at),
+            "games_played": PlayerBest.games_played + stmt.excluded.games_played,
+            "total_score": PlayerBest.total_score + stmt.excluded.total_score,
+            "total_lines": PlayerBest.total_lines + stmt.excluded.total_lines,
+            "total_play_time_seconds": (
+                PlayerBest.total_play_time_seconds + stmt.excluded.total_play_time_seconds
+            ),
+        },
+    ).returning(PlayerBest.player_id, PlayerBest.games_played)
+
+    result = await db.execute(stmt)
+    games = {value["player_id"]: value["games_played"] for value in values}
+    # A row whose total equals this batch's games was just inserted
+    return sum(1 for player_id, played in result.all() if played == games[player_id])
+
+
+async def query_player_stats(db: AsyncSession, player_id: str) -> Row | None:
+    """A player's nickname and player_best totals in one primary-key lookup
+
+    None when the player does not exist; the totals are None until the
+    player's first score.
+    """
+    result = await db.execute(
+        select(
+            Player.nickname,
+            PlayerBest.games_played,
+            PlayerBest.best_score,
+            PlayerBest.total_score,
+            PlayerBest.total_lines,
+            PlayerBest.total_play_time_seconds,
+        )
+        .outerjoin(PlayerBest, PlayerBest.player_id == Player.id)
+        .where(Player.id == player_id)
+    )
+    return result.first()
+
+
+def unique_ranking_statement(limit: int, after: RankingCursor | None = None) -> Select:
+    """Best-per-player ranking read from player_best alone"""
+    stmt = (
+        select(
+            PlayerBest.best_score,
+            PlayerBest.achieved_at,
+            PlayerBest.nickname,
+            PlayerBest.level,
+            PlayerBest.lines,
+            PlayerBest.score_id,
+        )
+        .order_by(
+            PlayerBest.best_score.desc(),
+            PlayerBest.achieved_at.asc(),
+            PlayerBest.score_id.asc(),
+        )
+        .limit(limit)
+    )
+    if after is not None:
+        stmt = stmt.where(
+            ranked_after(
+                after, PlayerBest.best_score, PlayerBest.achieved_at, PlayerBest.score_id
+            )
+        )
+    return stmt
+
+
+async def query_unique_rankings(
+    db: AsyncSession, limit: int, after: RankingCursor | None = None
+) -> list[LeaderboardEntry]:
+    """Run the best-per-player ranking query"""
+    result = await db.execute(unique_ranking_statement(limit, after))
+    return [LeaderboardEntry(*row) for row in result.all()]
+
+
+def rebuild_player_best(db: Session) -> int:
+    """Recompute player_best from the score table; returns the row count"""
+    ranked = (
+        select(
+            Score.player_id,
+            Player.nickname,
+            Score.id.label("score_id"),
+            Score.score.label("best_score"),
+            Score.level,
+            Score.lines,
+            Score.created_at.label("achieved_at"),
+            func.count().over(partition_by=Score.player_id).label("games_played"),
+            func.sum(Score.score).over(partition_by=Score.player_id).label("total_score"),
+            func.sum(Score.lines).over(partition_by=Score.player_id).label("total_lines"),
+            func.sum(Score.play_time_seconds)
+            .over(partition_by=Score.player_id)
+            .label("total_play_time_seconds"),
+            func.row_number()
+            .over(
+                partition_by=Score.player_id,
+                order_by=(Score.score.desc(), Score.created_at.asc(), Score.id.asc()),
+            )
+            .label("position"),
+        )
+        .join(Player, Score.player_id == Player.id)
+        .subquery()
+    )
+    columns = [
+        "player_id",
+        "nickname",
+        "score_id",
+        "best_score",
+        "level",
+        "lines",
+        "achieved_at",
+        "games_played",
+        "total_score",
+        "total_lines",
+        "total_play_time_seconds",
+    ]
+    db.execute(delete(PlayerBest))
+    result = db.execute(
+        PlayerBest.__table__.insert().from_select(
+            columns,
+            select(*(ranked.c[name] for name in columns)).where(ranked.c.position == 1),
+        )
+    )
+    db.commit()
+    return result.rowcount
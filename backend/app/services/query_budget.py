@@ -0,0 +1,98 @@
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class QueryStats:
+    """Statements run on behalf of one request"""
+
+    statements: int = 0
+    db_seconds: float = 0.0
+    fingerprints: Counter = field(default_factory=Counter)
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def record_statement(fingerprint: str, seconds: float) -> None:
+    """Charge a statement to the request running in this context, if any
+
+    SQLAlchemy's async engine runs cursors in a greenlet that shares the
+    calling task's context, so statements land on the right request.
+    """
+    stats = _current.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.db_seconds += seconds
+        stats.fingerprints[fingerprint] += 1
+
+
+def server_timing(stats: QueryStats, elapsed: float) -> bytes:
+    return (
+        f'db;dur={stats.db_seconds * 1000:.2f};desc="queries={stats.statements}", '
+        f"app;dur={elapsed * 1000:.2f}"
+    ).encode()
+
+
+class QueryBudgetMiddleware:
+    """ASGI middleware counting each request's SQL statements
+
+    The count and database time up to the response headers go out in a
+    `Server-Timing` header. Requests running more than
+    `query_budget_max_statements` statements or taking longer than
+    `slow_request_ms` to start their response are logged with their
+    statement fingerprints. Time spent streaming a body (exports, live
+    streams) does not count towards the latency threshold.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+        responded = None
+
+        async def send_with_timing(message):
+            nonlocal responded
+            if message["type"] == "http.response.start":
+                responded = time.perf_counter() - started
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", server_timing(stats, responded)))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            elapsed = time.perf_counter() - started
+            if (
+                stats.statements > settings.query_budget_max_statements
+                or (responded if responded is not None else elapsed) * 1000
+                > settings.slow_request_ms
+            ):
+                logger.warning(
+                    "%s %s: %d statements, %.1f ms in database, %.1f ms total; %s",
+                    scope["method"],
+                    scope["path"],
+                    stats.statements,
+                    stats.db_seconds * 1000,
+                    elapsed * 1000,
+                    "; ".join(
+                        f"{count} x {statement}"
+                        for statement, count in stats.fingerprints.most_common()
+                    ),
+                )
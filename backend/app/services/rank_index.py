@@ -0,0 +1,104 @@
+from array import array
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.score import Score
+
+MAX_SCORE = 9_999_999  # upper bound enforced by ScoreCreate
+BUCKET_WIDTH = 1024
+
+
+class FenwickTree:
+    """Binary indexed tree of counts over positions 0..size-1"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._tree = array("Q", bytes(8 * (size + 1)))
+
+    def add(self, position: int, delta: int = 1) -> None:
+        """Add delta to the count at position"""
+        i = position + 1
+        while i <= self.size:
+            self._tree[i] += delta
+            i += i & -i
+
+    def prefix_sum(self, position: int) -> int:
+        """Sum of counts at positions 0..position (inclusive)"""
+        total = 0
+        i = min(position, self.size - 1) + 1
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+
+class ScoreRankIndex:
+    """Order-statistic index over score values
+
+    A Fenwick tree over fixed-width score buckets holds per-bucket counts,
+    and each non-empty bucket lazily gets its own Fenwick tree over the
+    scores inside it. Counting the scores above a value costs
+    O(log buckets + log bucket width) and memory grows only with the
+    number of occupied buckets.
+    """
+
+    def __init__(self, max_score: int = MAX_SCORE, bucket_width: int = BUCKET_WIDTH):
+        self.bucket_width = bucket_width
+        self.bucket_count = max_score // bucket_width + 1
+        self.loaded = False
+        self.total = 0
+        self._buckets = FenwickTree(self.bucket_count)
+        self._leaves: dict[int, FenwickTree] = {}
+        self._writes = 0
+
+    def reset(self) -> None:
+        """Drop the index so the next read rebuilds it"""
+        self.loaded = False
+        self.total = 0
+        self._buckets = FenwickTree(self.bucket_count)
+        self._leaves = {}
+
+    def _insert(self, score: int, count: int) -> None:
+        bucket, offset = divmod(score, self.bucket_width)
+        leaf = self._leaves.get(bucket)
+        if leaf is None:
+            leaf = self._leaves[bucket] = FenwickTree(self.bucket_width)
+        leaf.add(offset, count)
+        self._buckets.add(bucket, count)
+        self.total += count
+
+    async def load(self, db: AsyncSession) -> None:
+        """Build the index from per-score counts in the database"""
+        while True:
+            # Same retry rule as the leaderboard index: a score added while
+            # the query is awaited would otherwise be lost
+            writes = self._writes
+            result = await db.execute(
+                select(Score.score, func.count()).group_by(Score.score)
+            )
+            counts = result.all()
+            if writes == self._writes:
+                break
+        self.reset()
+        for score, count in counts:
+            self._insert(score, count)
+        self.loaded = True
+
+    def add(self, score: int) -> None:
+        """Record a newly saved score"""
+        self._writes += 1
+        if self.loaded:
+            self._insert(score, 1)
+
+    def count_above(self, score: int) -> int:
+        """Number of recorded scores strictly greater than `score`"""
+        bucket, offset = divmod(score, self.bucket_width)
+        at_or_below = self._buckets.prefix_sum(bucket - 1) if bucket else 0
+        leaf = self._leaves.get(bucket)
+        if leaf is not None:
+            at_or_below += leaf.prefix_sum(offset)
+        return self.total - at_or_below
+
+
+rank_index = ScoreRankIndex()
@@ -0,0 +1,397 @@
+import asyncio
+import functools
+import inspect
+import math
+import os
+import sqlite3
+import threading
+import time
+from abc import abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable
+
+from limits import RateLimitItem
+from limits.errors import ConfigurationError
+from limits.storage import MemoryStorage, Storage
+from limits.storage.base import StorageRegistry
+from limits.strategies import STRATEGIES, RateLimiter
+from limits.util import WindowStats
+from slowapi import Limiter
+from slowapi.util import get_remote_address
+from starlette.concurrency import run_in_threadpool
+
+from app.config import Settings, settings
+
+TOKEN_BUCKET = "token-bucket"
+BUCKET_SCHEME_PREFIX = "bucket+"
+
+
+class TokenBucketStorage(metaclass=StorageRegistry):
+    """Storage holding one token bucket per rate limit key
+
+    Buckets are kept in GCRA form: a single "theoretical arrival time"
+    (TAT) per key instead of a token count and a refill timestamp. A
+    request costing `increment` seconds of refill is allowed when
+    `max(tat, now) + increment - now <= burst`; a TAT in the past means a
+    full bucket, so such keys can be dropped without changing any decision.
+
+    Registered by URI scheme like the `limits` storages, but without their
+    counter API: only the token-bucket strategy can use it.
+    """
+
+    #: Whether checks wait on I/O (and so belong off the event loop)
+    blocking = False
+
+    def __init__(
+        self,
+        uri: str | None = None,
+        max_keys: int = 100_000,
+        clock: Callable[[], float] = time.time,
+        **options,
+    ):
+        self.max_keys = int(max_keys)
+        self.clock = clock
+
+    async def open(self) -> None:
+        """Prepare the storage before the first check (app startup)"""
+
+    @abstractmethod
+    def acquire(
+        self, key: str, increment: float, burst: float
+    ) -> tuple[bool, float]:
+        """Take `increment` from a bucket; returns (allowed, tat after the call)"""
+
+    @abstractmethod
+    def peek(self, key: str) -> float | None:
+        """The bucket's TAT, or None if the key is not stored"""
+
+    @abstractmethod
+    def check(self) -> bool:
+        """Whether the storage is reachable"""
+
+    @abstractmethod
+    def reset(self) -> int | None:
+        """Drop every bucket"""
+
+    @abstractmethod
+    def clear(self, key: str) -> None:
+        """Drop one bucket"""
+
+
+class MemoryBucketStorage(TokenBucketStorage):
+    """Token buckets in this process, as an LRU bounded to `max_keys`
+
+    Every check is a dict lookup plus a move to the LRU tail; evicting the
+    least recently used key only forgets a bucket that has been idle the
+    longest. Limits are per process: use `SQLiteBucketStorage` when several
+    workers must share them.
+    """
+
+    STORAGE_SCHEME = ["bucket+memory"]
+
+    def __init__(self, uri: str | None = None, **options):
+        super().__init__(uri, **options)
+        self._buckets: OrderedDict[str, float] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(
+        self, key: str, increment: float, burst: float
+    ) -> tuple[bool, float]:
+        now = self.clock()
+        with self._lock:
+            tat = max(self._buckets.get(key, now), now)
+            allowed = tat + increment - now <= burst
+            if allowed:
+                tat += increment
+            self._buckets[key] = tat
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, tat
+
+    def peek(self, key: str) -> float | None:
+        return self._buckets.get(key)
+
+    def check(self) -> bool:
+        return True
+
+    def reset(self) -> int | None:
+        with self._lock:
+            count = len(self._buckets)
+            self._buckets.clear()
+        return count
+
+    def clear(self, key: str) -> None:
+        with self._lock:
+            self._buckets.pop(key, None)
+
+
+class SQLiteBucketStorage(TokenBucketStorage):
+    """Token buckets in a SQLite file shared by every worker on the host
+
+    A check is one UPSERT ... RETURNING on the key's primary key, which
+    SQLite runs atomically under its write lock, so concurrent workers
+    never both spend the last token. Point the URI at a tmpfs path
+    (e.g. ``bucket+sqlite:////dev/shm/tetris-ratelimit.db``) to keep it in
+    shared memory.
+
+    Every `sweep_interval` checks, full buckets (TAT in the past) are
+    deleted; if more than `max_keys` remain, those closest to full go too.
+    A check can wait up to `busy_timeout_ms` for another worker's write, so
+    the limiter runs it in the thread pool.
+    """
+
+    STORAGE_SCHEME = ["bucket+sqlite"]
+    blocking = True
+
+    ACQUIRE = """
+        INSERT INTO rate_limit_bucket (bucket_key, tat, allowed)
+        VALUES (:key, CASE WHEN :increment <= :burst THEN :now + :increment
+                           ELSE :now END,
+                :increment <= :burst)
+        ON CONFLICT (bucket_key) DO UPDATE SET
+            allowed = max(tat, :now) + :increment - :now <= :burst,
+            tat = CASE WHEN max(tat, :now) + :increment - :now <= :burst
+                       THEN max(tat, :now) + :increment
+                       ELSE max(tat, :now) END
+        RETURNING allowed, tat
+    """
+
+    def __init__(
+        self,
+        uri: str,
+        sweep_interval: int = 1000,
+        busy_timeout_ms: int = 5000,
+        **options,
+    ):
+        super().__init__(uri, **options)
+        # Same convention as SQLAlchemy: three slashes relative, four absolute
+        _, _, self.path = uri.partition(":///")
+        if not self.path:
+            raise ConfigurationError(f"SQLite rate limit storage needs a file: {uri}")
+        self.sweep_interval = int(sweep_interval)
+        self.busy_timeout_ms = int(busy_timeout_ms)
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+        self._pid: int | None = None
+        self._checks = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        # Connections must not cross a fork (gunicorn --preload)
+        if self._connection is None or self._pid != os.getpid():
+            connection = sqlite3.connect(
+                self.path, isolation_level=None, check_same_thread=False
+            )
+            connection.execute(f"PRAGMA busy_timeout={self.busy_timeout_ms}")
+            # Losing recent buckets on power loss only relaxes limits briefly
+            connection.execute("PRAGMA synchronous=OFF")
+            try:
+                self._initialize(connection)
+            except sqlite3.Error:
+                connection.close()
+                raise
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+
+    def _initialize(self, connection: sqlite3.Connection) -> None:
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limit_bucket ("
+            " bucket_key TEXT PRIMARY KEY,"
+            " tat REAL NOT NULL,"
+            " allowed INTEGER NOT NULL)"
+        )
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS idx_rate_limit_bucket_tat"
+            " ON rate_limit_bucket (tat)"
+        )
+
+    async def open(self) -> None:
+        """Connect and create the bucket table, retrying while workers race
+
+        Workers starting together race to create the file and switch it to
+        WAL, which can report "locked" without waiting on busy_timeout.
+        """
+        deadline = time.monotonic() + self.busy_timeout_ms / 1000
+        while True:
+            try:
+                await run_in_threadpool(self.check)
+                return
+            except sqlite3.OperationalError:
+                if time.monotonic() > deadline:
+                    raise
+                await asyncio.sleep(0.01)
+
+    def acquire(
+        self, key: str, increment: float, burst: float
+    ) -> tuple[bool, float]:
+        now = self.clock()
+        params = {"key": key, "increment": increment, "burst": burst, "now": now}
+        with self._lock:
+            connection = self._connect()
+            allowed, tat = connection.execute(self.ACQUIRE, params).fetchone()
+            self._checks += 1
+            if self._checks >= self.sweep_interval:
+                self._checks = 0
+                self._sweep(connection, now)
+        return bool(allowed), tat
+
+    def _sweep(self, connection: sqlite3.Connection, now: float) -> None:
+        connection.execute("DELETE FROM rate_limit_bucket WHERE tat <= ?", (now,))
+        connection.execute(
+            "DELETE FROM rate_limit_bucket WHERE bucket_key IN ("
+            " SELECT bucket_key FROM rate_limit_bucket ORDER BY tat"
+            " LIMIT max(0, (SELECT count(*) FROM rate_limit_bucket) - ?))",
+            (self.max_keys,),
+        )
+
+    def sweep(self) -> None:
+        """Drop full buckets and enforce `max_keys` now"""
+        with self._lock:
+            self._sweep(self._connect(), self.clock())
+
+    def key_count(self) -> int:
+        with self._lock:
+            row = self._connect().execute("SELECT count(*) FROM rate_limit_bucket")
+            return row.fetchone()[0]
+
+    def peek(self, key: str) -> float | None:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT tat FROM rate_limit_bucket WHERE bucket_key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def check(self) -> bool:
+        with self._lock:
+            self._connect().execute("SELECT 1")
+        return True
+
+    def reset(self) -> int | None:
+        with self._lock:
+            return self._connect().execute("DELETE FROM rate_limit_bucket").rowcount
+
+    def clear(self, key: str) -> None:
+        with self._lock:
+            self._connect().execute(
+                "DELETE FROM rate_limit_bucket WHERE bucket_key = ?", (key,)
+            )
+
+
+class TokenBucketRateLimiter(RateLimiter):
+    """Token bucket strategy: "20/minute" holds 20 tokens refilled evenly
+
+    Unlike a fixed window it never admits twice the limit around a window
+    boundary, and each check is a single storage operation.
+    """
+
+    def __init__(self, storage: Storage | TokenBucketStorage):
+        if not isinstance(storage, TokenBucketStorage):
+            raise ConfigurationError(
+                f"{TOKEN_BUCKET} needs a {BUCKET_SCHEME_PREFIX}* storage"
+            )
+        # Not RateLimiter.__init__: it only accepts counter storages
+        self.storage: TokenBucketStorage = storage
+
+    @staticmethod
+    def _interval(item: RateLimitItem) -> float:
+        """Seconds to refill one token"""
+        return item.get_expiry() / item.amount
+
+    def hit(self, item: RateLimitItem, *identifiers: str, cost: int = 1) -> bool:
+        allowed, _ = self.storage.acquire(
+            item.key_for(*identifiers),
+            increment=self._interval(item) * cost,
+            burst=item.get_expiry(),
+        )
+        return allowed
+
+    def test(self, item: RateLimitItem, *identifiers: str, cost: int = 1) -> bool:
+        return self.get_window_stats(item, *identifiers).remaining >= cost
+
+    def get_window_stats(self, item: RateLimitItem, *identifiers: str) -> WindowStats:
+        now = self.storage.clock()
+        tat = max(self.storage.peek(item.key_for(*identifiers)) or now, now)
+        interval = self._interval(item)
+        remaining = math.floor((now + item.get_expiry() - tat) / interval + 1e-9)
+        # Reset: when the bucket is full again
+        return WindowStats(tat, max(0, min(item.amount, remaining)))
+
+
+STRATEGIES[TOKEN_BUCKET] = TokenBucketRateLimiter
+
+
+class ThreadpoolLimiter(Limiter):
+    """slowapi Limiter that checks blocking storages off the event loop
+
+    slowapi runs the storage call inline in async routes; with a storage
+    that waits on I/O (a shared SQLite file, Redis, ...) every rate limited
+    request would stall the loop. Here async routes run the check in the
+    thread pool first and slowapi's own check is skipped. In-process
+    storages are still checked inline, which is cheaper than a thread hop.
+
+    This reaches into slowapi internals (`_check_request_limit`,
+    `_auto_check`, `_storage`, `_limiter`), hence the upper bound on slowapi
+    in requirements.txt.
+    """
+
+    @property
+    def storage(self):
+        return self._storage
+
+    @property
+    def blocking(self) -> bool:
+        return getattr(self._storage, "blocking", not isinstance(self._storage, MemoryStorage))
+
+    async def open(self) -> None:
+        """Prepare the storage (called at app startup)"""
+        if self.enabled and isinstance(self._storage, TokenBucketStorage):
+            await self._storage.open()
+
+    def limit(self, *args, **kwargs) -> Callable:
+        decorate = super().limit(*args, **kwargs)
+
+        def decorator(func: Callable) -> Callable:
+            wrapped = decorate(func)
+            if not asyncio.iscoroutinefunction(func):
+                return wrapped
+            position = list(inspect.signature(func).parameters).index("request")
+
+            @functools.wraps(func)
+            async def offloaded(*args, **kwargs):
+                request = kwargs.get("request", args[position] if args else None)
+                if (
+                    self.enabled
+                    and self.blocking
+                    and self._auto_check
+                    and not getattr(request.state, "_rate_limiting_complete", False)
+                ):
+                    await run_in_threadpool(self._check_request_limit, request, func, False)
+                    request.state._rate_limiting_complete = True
+                return await wrapped(*args, **kwargs)
+
+            return offloaded
+
+        return decorator
+
+
+def create_limiter(config: Settings = settings) -> ThreadpoolLimiter:
+    """The app's single limiter, keyed by client address"""
+    options = {}
+    if config.rate_limit_storage_uri.startswith(BUCKET_SCHEME_PREFIX):
+        if config.rate_limit_strategy != TOKEN_BUCKET:
+            raise ConfigurationError(
+                f"{BUCKET_SCHEME_PREFIX}* storages only support {TOKEN_BUCKET}"
+            )
+        options["max_keys"] = config.rate_limit_max_keys
+    return ThreadpoolLimiter(
+        key_func=get_remote_address,
+        enabled=config.rate_limit_enabled,
+        strategy=config.rate_limit_strategy,
+        storage_uri=config.rate_limit_storage_uri,
+        storage_options=options,
+    )
+
+
+limiter = create_limiter()
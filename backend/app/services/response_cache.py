@@ -0,0 +1,163 @@
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+
+from app.config import settings
+
+RANKINGS = "rankings"  # every GET /scores page (totals move with each score)
+
+
+def player_tag(player_id: str) -> str:
+    """Tag for responses built from one player's score history"""
+    return f"player:{player_id}"
+
+
+def cache_key(route: str, **params) -> str:
+    """Cache key for a route and its normalized query parameters"""
+    return route + "?" + "&".join(f"{name}={params[name]}" for name in sorted(params))
+
+
+@dataclass
+class ResponseCacheMetrics:
+    """Counters describing response cache effectiveness"""
+
+    size: int = 0
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+
+@dataclass
+class _Entry:
+    body: bytes
+    tags: tuple[str, ...]
+    expires_at: float
+
+
+class ResponseCache:
+    """Size-bounded LRU of serialized JSON response bodies with a TTL
+
+    Entries are tagged with the data they were built from; writers call
+    `invalidate(tag)` after committing so dependent entries are dropped
+    immediately instead of waiting for the TTL. A `max_entries` of 0 turns
+    the cache off. The interface (get_or_build / invalidate / clear) is all
+    the routes use, so a shared backend can replace this in-process one.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl = ttl_seconds
+        self.metrics = ResponseCacheMetrics()
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._tagged: dict[str, set[str]] = {}
+        # Bumped per tag on invalidation while builds are in flight, so a
+        # build that raced with a write is not stored after the write
+        # already invalidated its tag
+        self._generations: dict[str, int] = {}
+        self._flushes = 0  # the same, for invalidate_all
+        self._building = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def clear(self) -> None:
+        """Drop every entry and reset the metrics"""
+        self._entries.clear()
+        self._tagged.clear()
+        self._generations.clear()
+        self._flushes = 0
+        self.metrics = ResponseCacheMetrics()
+
+    def get(self, key: str) -> bytes | None:
+        """Cached body for a key, if present and fresh"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.metrics.misses += 1
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.metrics.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.metrics.hits += 1
+        return entry.body
+
+    def put(self, key: str, body: bytes, tags: Iterable[str]) -> None:
+        """Store a body, evicting the least recently used entries when full"""
+        if not self.enabled:
+            return
+        if key in self._entries:
+            self._remove(key)
+        entry = _Entry(body, tuple(tags), time.monotonic() + self.ttl)
+        self._entries[key] = entry
+        for tag in entry.tags:
+            self._tagged.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+            self.metrics.evictions += 1
+        self.metrics.size = len(self._entries)
+
+    async def get_or_build(
+        self, key: str, tags: Iterable[str], build: Callable[[], Awaitable[bytes]]
+    ) -> bytes:
+        """Cached body for a key, building and storing it on a miss"""
+        if not self.enabled:
+            return await build()
+        body = self.get(key)
+        if body is not None:
+            return body
+        tags = tuple(tags)
+        generations = self._snapshot(tags)
+        self._building += 1
+        try:
+            body = await build()
+        finally:
+            self._building -= 1
+        if self._snapshot(tags) == generations:
+            self.put(key, body, tags)
+        if not self._building:
+            self._generations.clear()
+            self._flushes = 0
+        return body
+
+    def invalidate(self, *tags: str) -> None:
+        """Drop every entry built from any of the tags"""
+        for tag in tags:
+            if self._building:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+            for key in self._tagged.pop(tag, ()):
+                if key in self._entries:
+                    self._remove(key)
+                    self.metrics.invalidations += 1
+        self.metrics.size = len(self._entries)
+
+    def invalidate_all(self) -> None:
+        """Drop every entry, for changes no tag describes (another worker's writes)"""
+        if self._building:
+            self._flushes += 1
+        self.metrics.invalidations += len(self._entries)
+        self._entries.clear()
+        self._tagged.clear()
+        self.metrics.size = 0
+
+    def _snapshot(self, tags: tuple[str, ...]) -> tuple[int, ...]:
+        return (self._flushes, *(self._generations.get(tag, 0) for tag in tags))
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        for tag in entry.tags:
+            keys = self._tagged.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tagged[tag]
+        self.metrics.size = len(self._entries)
+
+
+response_cache = ResponseCache(
+    max_entries=settings.response_cache_max_entries,
+    ttl_seconds=settings.response_cache_ttl_seconds,
+)
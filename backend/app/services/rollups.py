@@ -0,0 +1,135 @@
+from collections import Counter as Tally
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import delete, event, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.counter import Counter
+from app.models.rollup import ScoreRollup
+from app.models.score import Score
+from app.services.counters import ROLLUP_PREFIX, read_counter, rollup_counter
+from app.services.leaderboard import LeaderboardEntry, RankingCursor, ranked_after
+
+PERIOD_KINDS = ("day", "week")
+
+
+def period_start(kind: str, moment: datetime) -> date:
+    """First day of the UTC day or ISO week containing `moment`"""
+    day = moment.date()
+    if kind == "week":
+        return day - timedelta(days=day.weekday())
+    return day
+
+
+async def insert_rollups(
+    db: AsyncSession, rows: list[dict], nicknames: dict[str, str]
+) -> dict[str, int]:
+    """Add score rows to their day and week periods (caller commits)
+
+    Returns the per-period counter increments for the caller to apply.
+    """
+    values = [
+        {
+            "period_kind": kind,
+            "period_start": period_start(kind, row["created_at"]),
+            "score_id": row["id"],
+            "score": row["score"],
+            "created_at": row["created_at"],
+            "nickname": nicknames[row["player_id"]],
+            "level": row["level"],
+            "lines": row["lines"],
+        }
+        for row in rows
+        for kind in PERIOD_KINDS
+    ]
+    if not values:
+        return {}
+    await db.execute(insert(ScoreRollup), values)
+    return dict(
+        Tally(rollup_counter(v["period_kind"], v["period_start"]) for v in values)
+    )
+
+
+async def query_window_rankings(
+    db: AsyncSession,
+    kind: str,
+    now: datetime,
+    limit: int,
+    after: RankingCursor | None = None,
+) -> tuple[list[LeaderboardEntry], int]:
+    """Ranking page and total for the period containing `now`"""
+    start = period_start(kind, now)
+    stmt = (
+        select(
+            ScoreRollup.score,
+            ScoreRollup.created_at,
+            ScoreRollup.nickname,
+            ScoreRollup.level,
+            ScoreRollup.lines,
+            ScoreRollup.score_id,
+        )
+        .where(ScoreRollup.period_kind == kind, ScoreRollup.period_start == start)
+        .order_by(
+            ScoreRollup.score.desc(),
+            ScoreRollup.created_at.asc(),
+            ScoreRollup.score_id.asc(),
+        )
+        .limit(limit)
+    )
+    if after is not None:
+        stmt = stmt.where(
+            ranked_after(
+                after, ScoreRollup.score, ScoreRollup.created_at, ScoreRollup.score_id
+            )
+        )
+    result = await db.execute(stmt)
+    entries = [LeaderboardEntry(*row) for row in result.all()]
+    return entries, await read_counter(db, rollup_counter(kind, start))
+
+
+def compact_rollups(db: Session, now: datetime) -> int:
+    """Drop rollup rows and counters of ended periods
+
+    Reads already filter on the current period, so this only reclaims space;
+    returns the number of rollup rows removed.
+    """
+    removed = 0
+    for kind in PERIOD_KINDS:
+        current = period_start(kind, now)
+        result = db.execute(
+            delete(ScoreRollup).where(
+                ScoreRollup.period_kind == kind, ScoreRollup.period_start < current
+            )
+        )
+        removed += result.rowcount
+        # ISO dates sort lexically, so older period counters compare lower
+        db.execute(
+            delete(Counter).where(
+                Counter.name.startswith(f"{ROLLUP_PREFIX}{kind}:"),
+                Counter.name < rollup_counter(kind, current),
+            )
+        )
+    db.commit()
+    return removed
+
+
+# ORM score deletes drop the score from its periods inside the deleting
+# transaction (after compaction the rows, and counters, are already gone)
+@event.listens_for(Score, "after_delete")
+def _score_deleted(mapper, connection, target) -> None:
+    for kind in PERIOD_KINDS:
+        start = period_start(kind, target.created_at)
+        result = connection.execute(
+            delete(ScoreRollup).where(
+                ScoreRollup.period_kind == kind,
+                ScoreRollup.period_start == start,
+                ScoreRollup.score_id == target.id,
+            )
+        )
+        if result.rowcount:
+            connection.execute(
+                update(Counter)
+                .where(Counter.name == rollup_counter(kind, start))
+                .values(value=Counter.value - 1)
+            )
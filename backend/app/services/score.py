@@ -0,0 +1,146 @@
+from uuid import uuid4
+
+from sqlalchemy import Row, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import dialect_insert
+from app.models.score import Player, Score, utc_now_naive
+from app.schemas.score import ScoreCreate
+from app.services.coherence import shared_version
+from app.services.counters import (
+    DATA_VERSION,
+    RANKED_PLAYERS,
+    increment_counters,
+    score_counter_deltas,
+)
+from app.services.distribution import score_distribution
+from app.services.etag import leaderboard_version
+from app.services.leaderboard import LeaderboardEntry, leaderboard
+from app.services.live import live_leaderboard
+from app.services.player_best import upsert_player_best
+from app.services.rank_index import rank_index
+from app.services.response_cache import RANKINGS, player_tag, response_cache
+from app.services.rollups import insert_rollups
+
+
+async def upsert_player(db: AsyncSession, player_id: str, nickname: str) -> tuple[Row, bool]:
+    """Create a player or bump its last_played_at in one statement
+
+    Returns the stored row and whether it was newly inserted (an existing
+    player keeps its original created_at).
+    """
+    now = utc_now_naive()
+    insert_stmt = dialect_insert(db.bind.dialect.name)(Player).values(
+        id=player_id, nickname=nickname, created_at=now, last_played_at=now
+    )
+    result = await db.execute(
+        insert_stmt.on_conflict_do_update(
+            index_elements=[Player.id],
+            set_={"last_played_at": insert_stmt.excluded.last_played_at},
+        ).returning(Player.id, Player.nickname, Player.created_at, Player.last_played_at)
+    )
+    row = result.one()
+    return row, row.created_at == now
+
+
+async def find_player_nicknames(db: AsyncSession, player_ids: set[str]) -> dict[str, str]:
+    """Look up the nicknames of existing players in a single query"""
+    result = await db.execute(
+        select(Player.id, Player.nickname).where(Player.id.in_(player_ids))
+    )
+    return dict(result.all())
+
+
+async def touch_players(db: AsyncSession, player_ids: set[str]) -> dict[str, str]:
+    """Bump last_played_at of existing players and return their nicknames
+
+    One UPDATE ... RETURNING both checks which players exist and touches
+    them, replacing a SELECT followed by an UPDATE.
+    """
+    result = await db.execute(
+        update(Player)
+        .where(Player.id.in_(player_ids))
+        .values(last_played_at=utc_now_naive())
+        .returning(Player.id, Player.nickname)
+    )
+    return dict(result.all())
+
+
+def build_score_rows(items: list[ScoreCreate]) -> list[dict]:
+    """Build insertable score rows with generated ids and timestamps"""
+    now = utc_now_naive()
+    return [
+        {
+            "id": str(uuid4()),
+            "player_id": item.player_id,
+            "score": item.score,
+            "level": item.level,
+            "lines": item.lines,
+            "play_time_seconds": item.play_time_seconds,
+            "created_at": now,
+        }
+        for item in items
+    ]
+
+
+async def insert_scores(
+    db: AsyncSession,
+    rows: list[dict],
+    nicknames: dict[str, str],
+    touch: bool = True,
+) -> int | None:
+    """Insert score rows and maintain derived data (caller commits)
+
+    All rows go through one executemany, each affected player gets its
+    last_played_at bumped by a single UPDATE (skipped with touch=False when
+    the caller already used touch_players), and the player_best projection,
+    day / week rollups and score counters are written in the same transaction.
+    Returns the new shared data version, for publish_scores.
+    """
+    if not rows:
+        return None
+    await db.execute(insert(Score), rows)
+    if touch:
+        await db.execute(
+            update(Player)
+            .where(Player.id.in_({row["player_id"] for row in rows}))
+            .values(last_played_at=rows[-1]["created_at"])
+        )
+    new_players = await upsert_player_best(db, rows, nicknames)
+    period_deltas = await insert_rollups(db, rows, nicknames)
+
+    deltas = score_counter_deltas(rows) | period_deltas
+    deltas[DATA_VERSION] = 1
+    if new_players:
+        deltas[RANKED_PLAYERS] = new_players
+    return (await increment_counters(db, deltas))[DATA_VERSION]
+
+
+def publish_scores(
+    rows: list[dict], nicknames: dict[str, str], data_version: int | None = None
+) -> None:
+    """Feed committed score rows to the in-process ranking indexes"""
+    if data_version is not None:
+        # Drops the indexes first if other workers wrote in between
+        shared_version.observe_local(data_version)
+    if rows:
+        leaderboard_version.bump()
+        response_cache.invalidate(
+            RANKINGS, *{player_tag(row["player_id"]) for row in rows}
+        )
+    entries = [
+        LeaderboardEntry(
+            score=row["score"],
+            created_at=row["created_at"],
+            nickname=nicknames[row["player_id"]],
+            level=row["level"],
+            lines=row["lines"],
+            score_id=row["id"],
+        )
+        for row in rows
+    ]
+    for entry in entries:
+        rank_index.add(entry.score)
+        leaderboard.add(entry)
+        score_distribution.add(entry.score, entry.level)
+    live_leaderboard.notify(entries)
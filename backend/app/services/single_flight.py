@@ -0,0 +1,62 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass
+class SingleFlightMetrics:
+    """Counters describing request coalescing"""
+
+    executions: int = 0
+    coalesced: int = 0
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key into one execution
+
+    The first caller for a key runs the work; callers arriving while it is
+    in flight await the same future instead of repeating it. Keys should
+    carry the data version the work reads, so callers arriving after a
+    write never join a flight that started before it.
+    """
+
+    def __init__(self) -> None:
+        self.metrics = SingleFlightMetrics()
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run `fn` once for all concurrent callers of `key`"""
+        while (future := self._inflight.get(key)) is not None:
+            self.metrics.coalesced += 1
+            try:
+                # Shielded: a follower being cancelled must not cancel the leader
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # The leader was cancelled; retry, possibly as the new leader
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        self.metrics.executions += 1
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            future.exception()  # retrieved: no followers is not an error
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._inflight[key]
+
+    def reset(self) -> None:
+        self.metrics = SingleFlightMetrics()
+
+
+read_flights = SingleFlight()
@@ -0,0 +1,101 @@
+import math
+from collections.abc import Iterable, Iterator
+
+
+class QuantileSketch:
+    """Mergeable quantile sketch over non-negative values (DDSketch)
+
+    Values fall into logarithmic buckets: bucket 0 holds zeros and bucket
+    k >= 1 holds (gamma^(k-2), gamma^(k-1)], with gamma = (1 + a) / (1 - a)
+    for a relative accuracy `a`. Adding a value is one index computation
+    and one list increment. Any quantile is answered within relative error
+    `a` of the exact value, and two sketches with the same accuracy merge
+    by adding bucket counts, so the result is the same as if one sketch had
+    seen every value. Scores up to 10^7 need about 800 buckets at a = 1%.
+    """
+
+    def __init__(self, relative_accuracy: float):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.count = 0
+        self._counts: list[int] = []
+
+    def bucket(self, value: float) -> int:
+        """Bucket index holding `value`"""
+        if value < 0:
+            raise ValueError("QuantileSketch only holds non-negative values")
+        if value < 1:
+            # Scores are integers: everything below 1 is a zero
+            return 0
+        return 1 + math.ceil(math.log(value) / self._log_gamma - 1e-12)
+
+    def _value(self, bucket: int) -> float:
+        """Representative value: within relative_accuracy of the bucket's range"""
+        if bucket == 0:
+            return 0.0
+        upper = self.gamma ** (bucket - 1)
+        return 2 * upper / (self.gamma + 1)
+
+    def add(self, value: float, count: int = 1) -> None:
+        self.add_bucket(self.bucket(value), count)
+
+    def add_bucket(self, bucket: int, count: int) -> None:
+        if bucket >= len(self._counts):
+            self._counts.extend([0] * (bucket + 1 - len(self._counts)))
+        self._counts[bucket] += count
+        self.count += count
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Add another sketch's values to this one"""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        for bucket, count in other.buckets():
+            self.add_bucket(bucket, count)
+
+    def copy(self) -> "QuantileSketch":
+        sketch = QuantileSketch(self.relative_accuracy)
+        sketch.merge(self)
+        return sketch
+
+    def buckets(self) -> Iterator[tuple[int, int]]:
+        """Non-empty (bucket, count) pairs"""
+        return ((bucket, count) for bucket, count in enumerate(self._counts) if count)
+
+    @classmethod
+    def from_buckets(
+        cls, relative_accuracy: float, buckets: Iterable[tuple[int, int]]
+    ) -> "QuantileSketch":
+        sketch = cls(relative_accuracy)
+        for bucket, count in buckets:
+            sketch.add_bucket(bucket, count)
+        return sketch
+
+    def quantile(self, q: float) -> float | None:
+        """Value at quantile q (0..1), None when empty"""
+        if self.count == 0:
+            return None
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1")
+        rank = q * (self.count - 1)
+        seen = 0
+        for bucket, count in enumerate(self._counts):
+            seen += count
+            if seen > rank:
+                return self._value(bucket)
+        return self._value(len(self._counts) - 1)
+
+    def rank(self, value: float) -> float:
+        """Estimated number of values below `value`
+
+        Values in `value`'s own bucket are within a factor gamma of it and
+        cannot be ordered against it; half of them are counted.
+        """
+        bucket = self.bucket(value)
+        below = sum(self._counts[:bucket])
+        if bucket == 0:
+            return 0.0
+        same = self._counts[bucket] if bucket < len(self._counts) else 0
+        return below + same / 2
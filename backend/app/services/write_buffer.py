@@ -0,0 +1,170 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.services.score import insert_scores, publish_scores
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+@dataclass
+class WriteBufferMetrics:
+    """Counters describing write-behind buffer activity"""
+
+    queue_depth: int = 0
+    flushes: int = 0
+    rows_flushed: int = 0
+    failed_rows: int = 0
+    retries: int = 0
+    last_flush_ms: float = 0.0
+    max_flush_ms: float = 0.0
+    total_flush_ms: float = 0.0
+
+
+class ScoreWriteBuffer:
+    """Write-behind queue that group-commits score inserts
+
+    Accepted rows are flushed in one transaction when `max_rows` are waiting
+    or `flush_interval_ms` has passed since the oldest waiting row, whichever
+    comes first. A failed flush is retried `max_retries` times with doubling
+    delays before its rows are logged as lost. Rows still queued when the
+    process dies are lost too, which is why this mode is opt-in through
+    `settings.score_write_mode`.
+    """
+
+    def __init__(
+        self,
+        flush_interval_ms: int,
+        max_rows: int,
+        max_size: int,
+        max_retries: int = 3,
+        retry_delay_ms: int = 100,
+    ):
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_rows = max_rows
+        self.max_size = max_size
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay_ms / 1000
+        self.metrics = WriteBufferMetrics()
+        self._session_factory: async_sessionmaker[AsyncSession] | None = None
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: asyncio.Task | None = None
+        self._accepting = False
+
+    @property
+    def running(self) -> bool:
+        """Whether new scores are being accepted"""
+        return self._accepting
+
+    def start(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        """Start the background flush task"""
+        if self._task is not None:
+            return
+        self._session_factory = session_factory
+        self._queue = asyncio.Queue()
+        self.metrics = WriteBufferMetrics()
+        self._task = asyncio.create_task(self._run())
+        self._accepting = True
+
+    async def stop(self) -> None:
+        """Stop accepting scores and flush everything still queued"""
+        if self._task is None:
+            return
+        self._accepting = False
+        # Everything accepted so far is ahead of the sentinel in the queue
+        self._queue.put_nowait(_STOP)
+        await self._task
+        self._task = None
+
+    def submit(self, row: dict, nickname: str) -> bool:
+        """Queue a score row; False if the buffer is stopped or full"""
+        if not self._accepting or self._queue.qsize() >= self.max_size:
+            return False
+        self._queue.put_nowait((row, nickname))
+        self.metrics.queue_depth = self._queue.qsize()
+        return True
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.max_rows:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except TimeoutError:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._flush(batch)
+
+    async def _flush(self, batch: list[tuple[dict, str]]) -> None:
+        rows = [row for row, _ in batch]
+        nicknames = {row["player_id"]: nickname for row, nickname in batch}
+        started = time.perf_counter()
+        try:
+            data_version = await self._commit(rows, nicknames)
+        except Exception:
+            # Clients were already answered: name every score that is lost
+            logger.exception(
+                "Dropping %d buffered scores after %d attempts: %s",
+                len(rows),
+                self.max_retries + 1,
+                ", ".join(row["id"] for row in rows),
+            )
+            self.metrics.failed_rows += len(rows)
+        else:
+            self.metrics.rows_flushed += len(rows)
+            try:
+                publish_scores(rows, nicknames, data_version)
+            except Exception:
+                # Committed already; the indexes pick the rows up when rebuilt
+                logger.exception("Failed to publish %d flushed scores", len(rows))
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        self.metrics.flushes += 1
+        self.metrics.last_flush_ms = elapsed_ms
+        self.metrics.max_flush_ms = max(self.metrics.max_flush_ms, elapsed_ms)
+        self.metrics.total_flush_ms += elapsed_ms
+        self.metrics.queue_depth = self._queue.qsize()
+
+    async def _commit(self, rows: list[dict], nicknames: dict[str, str]) -> int | None:
+        """Insert and commit a batch, retrying with doubling delays"""
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self._session_factory() as db:
+                    data_version = await insert_scores(db, rows, nicknames)
+                    await db.commit()
+                return data_version
+            except Exception:
+                if attempt == self.max_retries:
+                    raise
+                logger.warning(
+                    "Failed to flush %d buffered scores, retrying", len(rows), exc_info=True
+                )
+                self.metrics.retries += 1
+                await asyncio.sleep(self.retry_delay * 2**attempt)
+
+
+score_buffer = ScoreWriteBuffer(
+    flush_interval_ms=settings.score_flush_interval_ms,
+    max_rows=settings.score_flush_max_rows,
+    max_size=settings.score_queue_max_size,
+    max_retries=settings.score_flush_max_retries,
+    retry_delay_ms=settings.score_flush_retry_delay_ms,
+)
@@ -0,0 +1,299 @@
+"""
+Score API load benchmark
+
+Starts a real uvicorn process on a seeded database (or targets --url),
+drives scripted request mixes through an async HTTP client and reports
+throughput plus p50 / p95 / p99 latency per endpoint as JSON.
+
+Usage:
+    python -m benchmarks.load [--players 10000] [--scores 100000]
+                              [--mix read_heavy|write_heavy|balanced|all]
+                              [--requests 5000] [--concurrency 32] [--workers 1]
+    python -m benchmarks.load --database-url sqlite:///./bench.db  # already seeded
+    python -m benchmarks.load --url http://127.0.0.1:8000          # running server
+
+Rate limiting is switched off in the spawned server; a server given with
+--url must run with RATE_LIMIT_ENABLED=false for the numbers to mean much.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+import httpx
+from sqlalchemy import select
+
+from app.config import Settings
+from app.database import create_sync_engine
+from app.models.score import Player
+from benchmarks.seed import seed
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+API = "/api/v1"
+SAMPLE_PLAYERS = 1000
+
+# Relative weights of each operation
+MIXES = {
+    "read_heavy": {
+        "get_rankings": 60,
+        "get_player_scores": 25,
+        "create_score": 10,
+        "create_player": 5,
+    },
+    "balanced": {
+        "get_rankings": 35,
+        "get_player_scores": 15,
+        "create_score": 40,
+        "create_player": 10,
+    },
+    "write_heavy": {
+        "get_rankings": 10,
+        "get_player_scores": 5,
+        "create_score": 75,
+        "create_player": 10,
+    },
+}
+
+
+def percentile(ordered: list[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-len(ordered) * q // 100))  # ceil
+    return ordered[int(rank) - 1]
+
+
+def summarize(latencies: list[float], errors: int, seconds: float) -> dict:
+    ordered = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "throughput_rps": round(len(ordered) / seconds, 1) if seconds else 0.0,
+        "p50_ms": round(percentile(ordered, 50) * 1000, 2),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 2),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 2),
+    }
+
+
+class Operations:
+    """The scripted requests, each returning its HTTP response"""
+
+    def __init__(self, client: httpx.AsyncClient, player_ids: list[str]):
+        self.client = client
+        self.player_ids = player_ids
+
+    async def create_player(self, rng: random.Random) -> httpx.Response:
+        player_id = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+        response = await self.client.post(
+            f"{API}/players", json={"id": player_id, "nickname": "LOAD"}
+        )
+        # Only once it exists: score writes for it would otherwise 404
+        if response.status_code == 200:
+            self.player_ids.append(player_id)
+        return response
+
+    def create_score(self, rng: random.Random) -> Awaitable[httpx.Response]:
+        level = rng.randint(1, 10)
+        return self.client.post(
+            f"{API}/scores",
+            json={
+                "player_id": rng.choice(self.player_ids),
+                "score": rng.randrange(1_000_000),
+                "level": level,
+                "lines": level * 10,
+                "play_time_seconds": 60 * level,
+            },
+        )
+
+    def get_rankings(self, rng: random.Random) -> Awaitable[httpx.Response]:
+        return self.client.get(f"{API}/scores", params={"limit": 10})
+
+    def get_player_scores(self, rng: random.Random) -> Awaitable[httpx.Response]:
+        return self.client.get(f"{API}/scores/{rng.choice(self.player_ids)}")
+
+
+async def run_mix(
+    base_url: str,
+    weights: dict[str, int],
+    player_ids: list[str],
+    requests: int,
+    concurrency: int,
+    seed: int,
+) -> dict:
+    """Closed loop: `concurrency` clients issue `requests` requests in total"""
+    names = list(weights)
+    latencies: dict[str, list[float]] = {name: [] for name in names}
+    errors = dict.fromkeys(names, 0)
+    remaining = requests
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits) as client:
+        ops = Operations(client, list(player_ids))
+        calls: dict[str, Callable] = {name: getattr(ops, name) for name in names}
+
+        async def worker(rng: random.Random) -> None:
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                name = rng.choices(names, weights=[weights[n] for n in names])[0]
+                started = time.perf_counter()
+                try:
+                    response = await calls[name](rng)
+                    ok = response.status_code < 400
+                except httpx.HTTPError:
+                    ok = False
+                latencies[name].append(time.perf_counter() - started)
+                if not ok:
+                    errors[name] += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(worker(random.Random(seed * 1000 + i)) for i in range(concurrency))
+        )
+        seconds = time.perf_counter() - started
+
+    every = [latency for values in latencies.values() for latency in values]
+    return {
+        "duration_seconds": round(seconds, 2),
+        **summarize(every, sum(errors.values()), seconds),
+        "endpoints": {
+            name: summarize(latencies[name], errors[name], seconds) for name in names
+        },
+    }
+
+
+def sample_player_ids(database_url: str) -> list[str]:
+    engine = create_sync_engine(Settings(database_url=database_url))
+    try:
+        with engine.connect() as connection:
+            return list(
+                connection.scalars(select(Player.id).limit(SAMPLE_PLAYERS))
+            )
+    finally:
+        engine.dispose()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def uvicorn_server(database_url: str, workers: int, write_mode: str):
+    """Run the API in a separate uvicorn process until the block exits"""
+    port = free_port()
+    env = os.environ | {
+        "DATABASE_URL": database_url,
+        "RATE_LIMIT_ENABLED": "false",
+        "SCORE_WRITE_MODE": write_mode,
+        "WORKER_COHERENCE": "true" if workers > 1 else "false",
+    }
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.main:app",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "--log-level",
+            "warning",
+            "--no-access-log",
+        ],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with {process.returncode}")
+            try:
+                if httpx.get(f"{base_url}/health").status_code == 200:
+                    break
+            except httpx.HTTPError:
+                pass
+            if time.monotonic() > deadline:
+                raise RuntimeError("uvicorn did not become healthy in 30s")
+            time.sleep(0.2)
+        yield base_url
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load")
+    parser.add_argument("--url", help="Benchmark a running server instead")
+    parser.add_argument("--database-url", help="Use an already seeded database")
+    parser.add_argument("--players", type=int, default=10_000)
+    parser.add_argument("--scores", type=int, default=100_000)
+    parser.add_argument("--mix", choices=[*MIXES, "all"], default="all")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--write-mode", choices=["sync", "write_behind"], default="sync")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    mixes = list(MIXES) if args.mix == "all" else [args.mix]
+    results = {"config": {k: v for k, v in vars(args).items() if v is not None}}
+
+    with tempfile.TemporaryDirectory(prefix="tetris-load-") as tmp:
+        database_url = args.database_url
+        if args.url is None and database_url is None:
+            database_url = f"sqlite:///{tmp}/bench.db"
+            results["seed"] = seed(database_url, args.players, args.scores, args.seed)
+
+        if args.url is not None:
+            server = nullcontext(args.url)
+            player_ids = []
+        else:
+            server = uvicorn_server(database_url, args.workers, args.write_mode)
+            player_ids = sample_player_ids(database_url)
+
+        with server as base_url:
+            if not player_ids:
+                # Unknown database: register the players the mixes use
+                player_ids = [str(uuid.uuid4()) for _ in range(100)]
+                for player_id in player_ids:
+                    httpx.post(
+                        f"{base_url}{API}/players",
+                        json={"id": player_id, "nickname": "LOAD"},
+                    )
+            results["mixes"] = {
+                name: asyncio.run(
+                    run_mix(
+                        base_url,
+                        MIXES[name],
+                        player_ids,
+                        args.requests,
+                        args.concurrency,
+                        args.seed,
+                    )
+                )
+                for name in mixes
+            }
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
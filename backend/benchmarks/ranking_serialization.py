@@ -0,0 +1,79 @@
+"""
+Ranking serialization benchmark
+
+Compares the per-row cost of encoding a ranking page through the response
+model (one RankingEntry per row, then response_model serialization) with
+the direct encoder used by GET /scores.
+
+Usage:
+    python -m benchmarks.ranking_serialization [--limits 10 100 1000]
+"""
+
+import argparse
+import json
+import random
+import timeit
+from datetime import datetime, timedelta
+
+from pydantic import TypeAdapter
+
+from app.routes.score import render_ranking_page, to_ranking_entries
+from app.schemas.score import RankingResponse
+from app.services.leaderboard import LeaderboardEntry
+
+RankingResponseAdapter = TypeAdapter(RankingResponse)
+
+
+def make_entries(count: int, seed: int = 3) -> list[LeaderboardEntry]:
+    rng = random.Random(seed)
+    base = datetime(2026, 1, 1)
+    return [
+        LeaderboardEntry(
+            score=rng.randrange(0, 9999999),
+            # Mix whole-second and microsecond timestamps
+            created_at=base
+            + timedelta(seconds=rng.randrange(86400), microseconds=rng.choice([0, 1, 250000])),
+            nickname=rng.choice(["AAA", "PLAYER", "B-2 C_3"]),
+            level=rng.randint(1, 10),
+            lines=rng.randint(0, 9999),
+            score_id=str(i),
+        )
+        for i in range(count)
+    ]
+
+
+def model_path(entries: list[LeaderboardEntry], first_rank: int) -> bytes:
+    """Previous path: one RankingEntry per row, then response_model serialization"""
+    page = RankingResponse(
+        data=to_ranking_entries(entries, first_rank), total=5000, next_cursor="abc"
+    )
+    return RankingResponseAdapter.dump_json(RankingResponseAdapter.validate_python(page))
+
+
+def per_row_us(fn, entries: list[LeaderboardEntry], number: int = 5) -> float:
+    """Best-of-five per-row cost in microseconds"""
+    best = min(timeit.repeat(lambda: fn(entries), number=number, repeat=5))
+    return best / number / len(entries) * 1e6
+
+
+def run(limit: int) -> dict:
+    entries = make_entries(limit)
+    model_cost = per_row_us(lambda e: model_path(e, 1), entries)
+    fast_cost = per_row_us(lambda e: render_ranking_page(e, 1, 5000, "abc"), entries)
+    return {
+        "model_us_per_row": round(model_cost, 3),
+        "fast_us_per_row": round(fast_cost, 3),
+        "speedup": round(model_cost / fast_cost, 2),
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.ranking_serialization")
+    parser.add_argument("--limits", type=int, nargs="+", default=[10, 100, 1000])
+    args = parser.parse_args(argv)
+
+    print(json.dumps({limit: run(limit) for limit in args.limits}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
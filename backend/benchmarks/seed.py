@@ -0,0 +1,128 @@
+"""
+Benchmark data generator
+
+Bulk-seeds a database with players and scores, from 10k up to 10M rows,
+then rebuilds the maintained counters, player_best projection and score
+distribution sketches as the maintenance commands would. The same seed produces the same rows, with
+timestamps spread over the 90 days before seeding.
+
+Usage:
+    python -m benchmarks.seed sqlite:///./bench.db [--players 10000] [--scores 100000]
+"""
+
+import argparse
+import json
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.config import Settings
+from app.database import create_sync_engine
+from app.migrations import migrate
+from app.models.score import Player, Score, utc_now_naive
+from app.services.counters import rebuild_counters
+from app.services.distribution import rebuild_sketches
+from app.services.player_best import rebuild_player_best
+from app.services.rank_index import MAX_SCORE
+
+CHUNK_ROWS = 20_000
+HISTORY_DAYS = 90  # scores are spread over this many days before now
+
+
+def player_ids(count: int, seed: int) -> list[str]:
+    """Deterministic player ids for a seed"""
+    rng = random.Random(seed)
+    return [str(uuid.UUID(int=rng.getrandbits(128), version=4)) for _ in range(count)]
+
+
+def _chunks(count: int):
+    for start in range(0, count, CHUNK_ROWS):
+        yield start, min(start + CHUNK_ROWS, count)
+
+
+def seed(database_url: str, players: int, scores: int, seed: int = 1) -> dict:
+    """Create the schema and insert players and scores in bulk"""
+    engine = create_sync_engine(Settings(database_url=database_url))
+    rng = random.Random(seed)
+    now = utc_now_naive()
+    start_time = now - timedelta(days=HISTORY_DAYS)
+    span = int((now - start_time).total_seconds())
+    ids = player_ids(players, seed)
+    timings = {}
+    try:
+        migrate(engine)
+        with Session(engine) as db:
+            started = time.perf_counter()
+            for lo, hi in _chunks(players):
+                db.execute(
+                    insert(Player),
+                    [
+                        {
+                            "id": ids[i],
+                            "nickname": f"P{i}"[:10],
+                            "created_at": start_time,
+                            "last_played_at": now,
+                        }
+                        for i in range(lo, hi)
+                    ],
+                )
+                db.commit()
+            timings["players_seconds"] = time.perf_counter() - started
+
+            started = time.perf_counter()
+            for lo, hi in _chunks(scores):
+                db.execute(
+                    insert(Score),
+                    [_score_row(rng, ids, start_time, span) for _ in range(lo, hi)],
+                )
+                db.commit()
+            timings["scores_seconds"] = time.perf_counter() - started
+
+            started = time.perf_counter()
+            rebuild_counters(db)
+            rebuild_player_best(db)
+            rebuild_sketches(db)
+            timings["rebuild_seconds"] = time.perf_counter() - started
+    finally:
+        engine.dispose()
+
+    return {
+        "players": players,
+        "scores": scores,
+        **{name: round(value, 2) for name, value in timings.items()},
+    }
+
+
+def _score_row(
+    rng: random.Random, ids: list[str], start_time: datetime, span: int
+) -> dict:
+    # Skewed like real play: most games end early, few reach high levels
+    level = min(10, 1 + int(rng.expovariate(0.5)))
+    return {
+        "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+        "player_id": ids[rng.randrange(len(ids))],
+        "score": min(MAX_SCORE, int(rng.paretovariate(1.5) * 1000) * level),
+        "level": level,
+        "lines": rng.randrange(level * 10, level * 10 + 10),
+        "play_time_seconds": rng.randrange(30, 60 * level + 60),
+        "created_at": start_time + timedelta(seconds=rng.randrange(span)),
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.seed")
+    parser.add_argument("database_url")
+    parser.add_argument("--players", type=int, default=10_000)
+    parser.add_argument("--scores", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    print(json.dumps(seed(args.database_url, args.players, args.scores, args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+SQLite pragma benchmark
+
+Compares insert and read throughput of a stock SQLite connection against
+the tuned one built by app.database (WAL, synchronous=NORMAL, mmap, cache).
+
+Usage:
+    python -m benchmarks.sqlite_tuning [--inserts 2000] [--reads 2000]
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.config import Settings
+from app.database import create_sync_engine
+from app.migrations import migrate
+from app.models.score import Player, Score
+
+
+def run(tuned: bool, inserts: int, reads: int, seed_rows: int) -> dict:
+    """Time committed single-score inserts and top-10 ranking reads"""
+    fd, path = tempfile.mkstemp(prefix="tetris-bench-", suffix=".db")
+    os.close(fd)
+    engine = create_sync_engine(
+        Settings(database_url=f"sqlite:///{path}", sqlite_tuning=tuned)
+    )
+    rng = random.Random(1)
+    try:
+        migrate(engine)
+        with Session(engine) as db:
+            player_id = str(uuid.uuid4())
+            db.add(Player(id=player_id, nickname="BENCH"))
+            base = datetime(2026, 1, 1)
+            db.execute(
+                insert(Score),
+                [
+                    {
+                        "id": str(uuid.uuid4()),
+                        "player_id": player_id,
+                        "score": rng.randrange(10_000_000),
+                        "level": 1,
+                        "lines": 0,
+                        "play_time_seconds": 0,
+                        "created_at": base + timedelta(seconds=i),
+                    }
+                    for i in range(seed_rows)
+                ],
+            )
+            db.commit()
+
+            # One transaction per score, like POST /scores in sync mode
+            start = time.perf_counter()
+            for _ in range(inserts):
+                db.execute(
+                    insert(Score).values(
+                        id=str(uuid.uuid4()),
+                        player_id=player_id,
+                        score=rng.randrange(10_000_000),
+                        level=1,
+                        lines=0,
+                        play_time_seconds=0,
+                        created_at=datetime.now(),
+                    )
+                )
+                db.commit()
+            insert_seconds = time.perf_counter() - start
+
+            ranking = (
+                select(Score.score, Score.created_at, Player.nickname)
+                .join(Player)
+                .order_by(Score.score.desc(), Score.created_at)
+                .limit(10)
+            )
+            start = time.perf_counter()
+            for _ in range(reads):
+                db.execute(ranking).all()
+                db.commit()
+            read_seconds = time.perf_counter() - start
+    finally:
+        engine.dispose()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+    return {
+        "inserts_per_second": round(inserts / insert_seconds, 1),
+        "reads_per_second": round(reads / read_seconds, 1),
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.sqlite_tuning")
+    parser.add_argument("--inserts", type=int, default=2000)
+    parser.add_argument("--reads", type=int, default=2000)
+    parser.add_argument("--seed-rows", type=int, default=50_000)
+    args = parser.parse_args(argv)
+
+    results = {
+        name: run(tuned, args.inserts, args.reads, args.seed_rows)
+        for name, tuned in (("default", False), ("tuned", True))
+    }
+    results["speedup"] = {
+        metric: round(results["tuned"][metric] / results["default"][metric], 2)
+        for metric in results["default"]
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
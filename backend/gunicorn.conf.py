@@ -0,0 +1,36 @@
+"""
+Gunicorn config for multi-worker deployments
+
+Runs one uvicorn worker per core (WEB_CONCURRENCY overrides):
+
+    gunicorn -c gunicorn.conf.py app.main:app
+
+Workers keep their own ranking indexes and response caches, so this turns
+on WORKER_COHERENCE (reads notice other workers' writes through the shared
+data version), points the rate limiter at a store every worker shares and
+gives every worker the same page-cursor signing key. All three can still be
+overridden from the environment.
+"""
+
+import multiprocessing
+import os
+import secrets
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Each worker imports the app after forking, so database connections and
+# in-process state are never shared by accident
+preload_app = False
+
+# Long enough for a worker to drain its write-behind queue on shutdown
+graceful_timeout = 30
+timeout = 60
+
+# Read by app.config when each worker imports the app
+os.environ.setdefault("WORKER_COHERENCE", "true")
+os.environ.setdefault("RATE_LIMIT_STORAGE_URI", "bucket+sqlite:///./ratelimit.db")
+# One page-cursor key for every worker of this master (set it explicitly to
+# keep cursors valid across restarts)
+os.environ.setdefault("CURSOR_SECRET", secrets.token_hex(32))
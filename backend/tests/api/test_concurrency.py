@@ -0,0 +1,113 @@
+"""
+Async Database Concurrency Tests
+
+느린 쓰기 요청이 진행 중일 때도 읽기 요청이 이벤트 루프를 막지 않는지,
+동시에 들어온 동일한 조회가 하나의 쿼리로 합쳐지는지 검증
+"""
+
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.rate_limit import limiter
+from app.services.response_cache import response_cache
+from app.services.single_flight import read_flights
+from tests.conftest import (
+    async_engine,
+    create_player_async,
+    post_score_async,
+    score_body,
+)
+
+
+class TestAsyncDatabasePath:
+    """Async session concurrency tests"""
+
+    async def test_reads_progress_while_write_in_flight(
+        self, async_client: AsyncClient, monkeypatch
+    ):
+        """GET requests should complete while a POST is stuck in commit"""
+        pid = await create_player_async(async_client, "SLOW")
+
+        commit_started = asyncio.Event()
+        release_commit = asyncio.Event()
+        original_commit = AsyncSession.commit
+
+        async def slow_commit(self):
+            commit_started.set()
+            await release_commit.wait()
+            await original_commit(self)
+
+        monkeypatch.setattr(AsyncSession, "commit", slow_commit)
+
+        write = asyncio.create_task(
+            async_client.post("/api/v1/scores", json=score_body(pid, 1000))
+        )
+        await asyncio.wait_for(commit_started.wait(), timeout=5)
+
+        for _ in range(5):
+            read = await asyncio.wait_for(async_client.get("/api/v1/scores"), timeout=5)
+            assert read.status_code == 200
+            history = await asyncio.wait_for(
+                async_client.get(f"/api/v1/scores/{pid}"), timeout=5
+            )
+            assert history.status_code == 200
+        assert not write.done()
+
+        release_commit.set()
+        response = await asyncio.wait_for(write, timeout=5)
+        assert response.status_code == 200
+
+        rankings = await async_client.get("/api/v1/scores")
+        assert rankings.json()["total"] == 1
+
+
+class TestReadCoalescing:
+    """Single-flight load tests for identical concurrent reads"""
+
+    @pytest.fixture
+    def uncached(self, monkeypatch):
+        """Disable the response cache and rate limits; slow every query down"""
+        monkeypatch.setattr(response_cache, "max_entries", 0)
+        monkeypatch.setattr(limiter, "enabled", False)
+        original_execute = AsyncSession.execute
+
+        async def slow_execute(self, *args, **kwargs):
+            await asyncio.sleep(0.02)
+            return await original_execute(self, *args, **kwargs)
+
+        monkeypatch.setattr(AsyncSession, "execute", slow_execute)
+
+    async def burst(self, async_client: AsyncClient, url: str, n: int) -> int:
+        """Fire n identical GETs at once; return the SQL statement count"""
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+        try:
+            responses = await asyncio.gather(
+                *(async_client.get(url) for _ in range(n))
+            )
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+        assert all(r.status_code == 200 for r in responses)
+        assert len({r.content for r in responses}) == 1
+        return len(statements)
+
+    async def test_query_count_stays_flat(self, async_client: AsyncClient, uncached):
+        """1, 10 and 100 concurrent identical requests cost the same SQL"""
+        pid = await create_player_async(async_client, "SF")
+        await post_score_async(async_client, pid, 500, 2)
+
+        for url in ("/api/v1/scores?unique_players=true", f"/api/v1/scores/{pid}"):
+            counts = [await self.burst(async_client, url, n) for n in (1, 10, 100)]
+            assert counts[0] > 0
+            assert counts == [counts[0]] * 3
+
+        assert read_flights.metrics.coalesced > 0
@@ -0,0 +1,83 @@
+"""
+Conditional GET Tests
+
+랭킹/기록 조회가 ETag로 304 응답을 반환하고 점수 저장 시 태그가 바뀌는지 검증
+"""
+
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.services.etag import etag_matches
+from tests.conftest import async_engine, create_player, post_score
+
+
+class TestConditionalGet:
+    """ETag / If-None-Match tests"""
+
+    @pytest.fixture
+    def player_id(self, client: TestClient) -> str:
+        return create_player(client, "TAG")
+
+    @pytest.mark.parametrize("path", ["/api/v1/scores", "/api/v1/scores/{pid}"])
+    def test_revalidation_returns_304_without_queries(
+        self, client: TestClient, player_id: str, path: str
+    ):
+        """A current ETag short-circuits before any database work"""
+        post_score(client, player_id)
+        url = path.format(pid=player_id)
+
+        first = client.get(url)
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+        assert etag.startswith('"') and not etag.startswith("W/")
+        assert first.headers["cache-control"] == "max-age=5"
+
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+        try:
+            second = client.get(url, headers={"If-None-Match": etag})
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["etag"] == etag
+        assert statements == []
+
+    def test_score_write_changes_etag(self, client: TestClient, player_id: str):
+        """A committed score bumps the version, so old tags get a full body"""
+        etag = client.get("/api/v1/scores").headers["etag"]
+        post_score(client, player_id)
+
+        response = client.get("/api/v1/scores", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()["total"] == 1
+        assert response.headers["etag"] != etag
+
+    def test_windows_have_distinct_tags(self, client: TestClient):
+        """Day / week tags include their period so rollover invalidates them"""
+        tags = {
+            client.get(f"/api/v1/scores?window={window}").headers["etag"]
+            for window in ("all", "day", "week")
+        }
+        assert len(tags) == 3
+
+
+class TestEtagMatching:
+    """If-None-Match parsing tests"""
+
+    def test_matches(self):
+        assert etag_matches('"a-1"', '"a-1"')
+        assert etag_matches('W/"a-1"', '"a-1"')
+        assert etag_matches('"a-0", "a-1"', '"a-1"')
+        assert etag_matches("*", '"a-1"')
+
+    def test_mismatches(self):
+        assert not etag_matches(None, '"a-1"')
+        assert not etag_matches('"a-0"', '"a-1"')
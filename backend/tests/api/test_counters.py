@@ -0,0 +1,175 @@
+"""
+Maintained Counter Tests
+
+점수/플레이어 카운터가 쓰기와 같은 트랜잭션에서 갱신되고 재계산 명령과 일치하는지 검증
+"""
+
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.models.counter import Counter
+from app.models.score import Player, Score
+from app.services.counters import DATA_VERSION, ROLLUP_PREFIX, rebuild_counters
+from tests.conftest import (
+    async_engine,
+    create_player,
+    post_batch,
+    post_score,
+    score_body,
+)
+
+
+def counters(db: Session) -> dict[str, int]:
+    """Read every counter row except rollup periods (see test_rollups) and
+    the data version"""
+    db.rollback()
+    return dict(
+        db.execute(
+            select(Counter.name, Counter.value).where(
+                Counter.name.not_like(f"{ROLLUP_PREFIX}%"),
+                Counter.name != DATA_VERSION,
+            )
+        ).all()
+    )
+
+
+def data_version(db: Session) -> int:
+    db.rollback()
+    return db.scalar(select(Counter.value).where(Counter.name == DATA_VERSION)) or 0
+
+
+class TestScoreCounters:
+    """Maintained counter tests"""
+
+    @pytest.fixture
+    def player_ids(self, client: TestClient) -> list[str]:
+        """Create two players"""
+        return [create_player(client, "CNT") for _ in range(2)]
+
+    def test_counters_follow_inserts(
+        self, client: TestClient, db_session: Session, player_ids: list[str]
+    ):
+        """Players, scores and per-level counts should track writes"""
+        post_score(client, player_ids[0], level=1)
+        post_score(client, player_ids[1], level=1)
+        post_score(client, player_ids[1], level=4)
+        post_batch(client, [score_body(player_ids[0], 10, 4, play_time_seconds=5)])
+
+        assert counters(db_session) == {
+            "players": 2,
+            "ranked_players": 2,
+            "scores": 4,
+            "scores:level:1": 2,
+            "scores:level:4": 2,
+        }
+
+    def test_existing_player_is_not_counted_twice(
+        self, client: TestClient, db_session: Session, player_ids: list[str]
+    ):
+        """Re-registering a player should not bump the player counter"""
+        response = client.post(
+            "/api/v1/players", json={"id": player_ids[0], "nickname": "CNT"}
+        )
+        assert response.status_code == 200
+        assert counters(db_session)["players"] == 2
+
+    def test_writes_bump_data_version(
+        self, client: TestClient, db_session: Session, player_ids: list[str]
+    ):
+        """Every write that changes read results moves the data version"""
+        before = data_version(db_session)
+        assert before == 2  # the two new players
+        post_score(client, player_ids[0], level=1)
+        response = client.post(
+            "/api/v1/players", json={"id": player_ids[0], "nickname": "CNT"}
+        )
+        assert response.status_code == 200
+        assert data_version(db_session) == before + 1
+
+    def test_counter_rows_are_written_in_name_order(
+        self, client: TestClient, player_ids: list[str]
+    ):
+        """Writers lock counter rows in one global order, whatever the batch"""
+        names = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if statement.lower().startswith("insert into counter"):
+                names.append([p for p in parameters if isinstance(p, str)])
+
+        event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+        try:
+            post_batch(client, [score_body(player_ids[0], 10, level) for level in (9, 2, 5)])
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+        assert len(names) == 1
+        assert "scores:level:9" in names[0]
+        assert names[0] == sorted(names[0])
+
+    def test_rankings_total_reads_counter(
+        self, client: TestClient, player_ids: list[str]
+    ):
+        """GET /scores should not run COUNT(*) over the score table"""
+        for level in (1, 2, 3):
+            post_score(client, player_ids[0], level=level)
+
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement.lower())
+
+        event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+        try:
+            data = client.get("/api/v1/scores").json()
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+        assert data["total"] == 3
+        assert not any("count(" in statement for statement in statements)
+
+    def test_orm_deletes_decrement_counters(
+        self, client: TestClient, db_session: Session, player_ids: list[str]
+    ):
+        """Deleting a player should cascade into the score counters"""
+        post_score(client, player_ids[0], level=2)
+        post_score(client, player_ids[0], level=3)
+        post_score(client, player_ids[1], level=3)
+
+        db_session.delete(db_session.get(Player, player_ids[0]))
+        db_session.commit()
+
+        assert counters(db_session) == {
+            "players": 1,
+            "ranked_players": 1,
+            "scores": 1,
+            "scores:level:2": 0,
+            "scores:level:3": 1,
+        }
+
+    def test_rebuild_recomputes_from_base_tables(
+        self, client: TestClient, db_session: Session, player_ids: list[str]
+    ):
+        """Rebuild should repair counters after out-of-band changes"""
+        post_score(client, player_ids[0], level=5)
+        post_score(client, player_ids[1], level=6)
+
+        # Bulk delete bypasses ORM events and leaves the counters stale
+        db_session.query(Score).filter(Score.level == 5).delete()
+        db_session.query(Counter).filter(Counter.name == "players").delete()
+        db_session.commit()
+
+        values = rebuild_counters(db_session)
+
+        expected = {
+            "players": 2,
+            "ranked_players": 1,
+            "scores": 1,
+            "scores:level:6": 1,
+        }
+        assert values == expected
+        assert counters(db_session) == expected
+        # The data version never goes backwards
+        assert data_version(db_session) == 4
@@ -0,0 +1,197 @@
+"""
+Score Distribution Tests
+
+점수 분포 통계가 정확한 분위수에 근접하고, 체크포인트를 통해 재시작 후에도
+유지되며, 재계산 결과와 일치하는지 검증
+"""
+
+import uuid
+from bisect import bisect_left
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.score import Score
+from app.models.sketch import ScoreSketchBucket
+from app.services.distribution import rebuild_sketches, score_distribution
+from tests.conftest import (
+    create_player,
+    post_batch,
+    post_score,
+    score_body,
+    seed_scores,
+)
+
+URL = "/api/v1/stats/distribution"
+
+
+def sketch_rows(db: Session) -> dict[tuple[str, int], int]:
+    """Snapshot of the checkpointed buckets, without empty ones"""
+    db.rollback()
+    return {
+        (row.sketch, row.bucket): row.count
+        for row in db.scalars(select(ScoreSketchBucket))
+        if row.count
+    }
+
+
+def restart(client: TestClient) -> None:
+    """Run the app's shutdown and startup; shutdown checkpoints the sketches"""
+    client.__exit__(None, None, None)
+    client.__enter__()
+
+
+class TestDistributionEndpoint:
+    """GET /api/v1/stats/distribution"""
+
+    @pytest.fixture
+    def scores(self, db_session: Session) -> list[tuple[int, int]]:
+        seed_scores(db_session, 2000)
+        return [(row.score, row.level) for row in db_session.scalars(select(Score))]
+
+    def test_percentiles_close_to_exact(self, client: TestClient, scores):
+        ordered = sorted(score for score, _ in scores)
+        data = client.get(URL).json()
+
+        assert data["games"] == len(ordered)
+        for name, q in {"p25": 0.25, "p50": 0.5, "p75": 0.75, "p90": 0.9, "p99": 0.99}.items():
+            exact = ordered[int(q * (len(ordered) - 1))]
+            assert abs(data["percentiles"][name] - exact) <= 0.01 * exact + 1
+
+    def test_filters_by_level(self, client: TestClient, scores):
+        data = client.get(URL, params={"level": 3}).json()
+
+        assert data["level"] == 3
+        assert data["games"] == sum(1 for _, level in scores if level == 3)
+
+    def test_beats_percent(self, client: TestClient, scores):
+        ordered = sorted(score for score, _ in scores)
+        data = client.get(URL, params={"score": 2550}).json()
+
+        # Seeded scores are multiples of 100: none share 2550's bucket
+        exact = 100 * bisect_left(ordered, 2550) / len(ordered)
+        assert data["score"] == 2550
+        assert data["beats_percent"] == pytest.approx(exact, abs=0.1)
+
+    def test_empty_distribution(self, client: TestClient):
+        data = client.get(URL, params={"score": 100}).json()
+
+        assert data == {
+            "level": None,
+            "games": 0,
+            "percentiles": None,
+            "score": 100,
+            "beats_percent": None,
+        }
+
+    def test_rejects_invalid_level(self, client: TestClient):
+        assert client.get(URL, params={"level": 11}).status_code == 422
+
+
+class TestDistributionMaintenance:
+    """Incremental sketches, checkpoints and rebuilds"""
+
+    @pytest.fixture
+    def player_id(self, client: TestClient) -> str:
+        return create_player(client, "DIST")
+
+    def test_new_scores_show_up_immediately(self, client: TestClient, player_id: str):
+        assert client.get(URL).json()["games"] == 0
+
+        post_score(client, player_id, 5000, 2)
+        post_batch(client, [score_body(player_id, 100), score_body(player_id, 900, 2)])
+
+        assert client.get(URL).json()["games"] == 3
+        level = client.get(URL, params={"level": 2}).json()
+        assert level["games"] == 2
+        assert level["percentiles"]["p50"] == pytest.approx(900, rel=0.01)
+
+    def test_checkpoint_survives_restart(
+        self, client: TestClient, db_session: Session, player_id: str, query_budget
+    ):
+        for value in (100, 2000, 3000):
+            post_score(client, player_id, value)
+        before = client.get(URL).json()
+
+        restart(client)
+        # The sketches are read back from their buckets, not the score table
+        with query_budget(1) as statements:
+            after = client.get(URL).json()
+
+        assert "score_sketch_bucket" in statements[0]
+        assert after == before
+        assert sum(
+            count for (key, _), count in sketch_rows(db_session).items() if key == "all"
+        ) == 3
+
+    async def test_failed_checkpoint_keeps_delta(self, db_session: Session):
+        score_distribution.reset()
+        score_distribution.add(700, 1)
+
+        class FailingSession:
+            bind = db_session.bind
+
+            async def execute(self, *args, **kwargs):
+                raise RuntimeError("database unavailable")
+
+        with pytest.raises(RuntimeError):
+            await score_distribution.checkpoint(FailingSession())
+        assert score_distribution._pending["all"].count == 1
+        score_distribution.reset()
+
+    def test_checkpoint_matches_rebuild(
+        self, client: TestClient, db_session: Session, player_id: str
+    ):
+        for value, level in ((0, 1), (150, 1), (150, 4), (9999999, 10)):
+            post_score(client, player_id, value, level)
+        restart(client)
+
+        incremental = sketch_rows(db_session)
+        rebuild_sketches(db_session)
+
+        assert sketch_rows(db_session) == incremental
+
+    def test_deleting_scores_updates_sketches(
+        self, client: TestClient, db_session: Session, player_id: str
+    ):
+        for value, level in ((300, 1), (800, 2)):
+            post_score(client, player_id, value, level)
+        restart(client)
+
+        db_session.rollback()
+        db_session.delete(db_session.scalar(select(Score).where(Score.score == 800)))
+        db_session.commit()
+        incremental = sketch_rows(db_session)
+        rebuild_sketches(db_session)
+
+        assert incremental == sketch_rows(db_session)
+        assert client.get(URL, params={"level": 2}).json()["games"] == 0
+
+    def test_deleting_uncheckpointed_score_keeps_counts_non_negative(
+        self, client: TestClient, db_session: Session, player_id: str
+    ):
+        post_score(client, player_id, 300, 1)
+        restart(client)
+        # Same bucket as the checkpointed score, but never checkpointed
+        db_session.rollback()
+        for value in (301, 302):
+            db_session.add(
+                Score(
+                    id=str(uuid.uuid4()),
+                    player_id=player_id,
+                    score=value,
+                    level=1,
+                    lines=3,
+                    play_time_seconds=60,
+                )
+            )
+        db_session.commit()
+
+        for row in db_session.scalars(select(Score).where(Score.score > 300)).all():
+            db_session.delete(row)
+        db_session.commit()
+
+        counts = db_session.scalars(select(ScoreSketchBucket.count)).all()
+        assert counts and min(counts) == 0
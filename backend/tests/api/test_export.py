@@ -0,0 +1,276 @@
+"""
+Score Export Tests
+
+관리자 전용 점수 내보내기(NDJSON/CSV)의 인증, 워터마크 증분 조회, 스트리밍 메모리 사용량을 검증
+"""
+
+import csv
+import io
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.config import Settings, settings
+from app.database import create_sync_engine
+from app.migrations import migrate
+from app.models.score import Player, Score
+
+TOKEN = "test-admin-token"
+AUTH = {"Authorization": f"Bearer {TOKEN}"}
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+
+def add_scores(db: Session, created: list[datetime]) -> list[str]:
+    db.add(Player(id="exporter", nickname="EXPORT"))
+    ids = []
+    for i, created_at in enumerate(created):
+        score_id = f"s{i:03d}"
+        db.add(
+            Score(
+                id=score_id,
+                player_id="exporter",
+                score=100 * i,
+                level=1,
+                lines=i,
+                play_time_seconds=30,
+                created_at=created_at,
+            )
+        )
+        ids.append(score_id)
+    db.commit()
+    return ids
+
+
+class TestScoreExport:
+    """GET /api/v1/scores/export tests"""
+
+    BASE = datetime(2026, 3, 1, 12, 0, 0)
+
+    @pytest.fixture(autouse=True)
+    def admin_token(self, monkeypatch):
+        monkeypatch.setattr(settings, "admin_token", TOKEN)
+
+    @pytest.fixture
+    def score_ids(self, db_session: Session) -> list[str]:
+        return add_scores(db_session, [self.BASE + timedelta(minutes=i) for i in range(5)])
+
+    def test_requires_admin_token(self, client: TestClient, score_ids):
+        assert client.get("/api/v1/scores/export").status_code == 401
+        bad = {"Authorization": "Bearer wrong"}
+        assert client.get("/api/v1/scores/export", headers=bad).status_code == 401
+
+    def test_disabled_without_configured_token(
+        self, client: TestClient, monkeypatch
+    ):
+        monkeypatch.setattr(settings, "admin_token", "")
+        response = client.get("/api/v1/scores/export", headers=AUTH)
+        assert response.status_code == 403
+
+    def test_ndjson_streams_every_score_in_created_order(
+        self, client: TestClient, score_ids
+    ):
+        response = client.get("/api/v1/scores/export", headers=AUTH)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [row["id"] for row in rows] == score_ids
+        assert rows[1] == {
+            "id": "s001",
+            "player_id": "exporter",
+            "score": 100,
+            "level": 1,
+            "lines": 1,
+            "play_time_seconds": 30,
+            "created_at": "2026-03-01T12:01:00",
+        }
+        assert response.headers["x-export-watermark"] == "2026-03-01T12:04:00"
+
+    def test_csv_has_header_and_rows(self, client: TestClient, score_ids):
+        response = client.get(
+            "/api/v1/scores/export", params={"format": "csv"}, headers=AUTH
+        )
+
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert [row["id"] for row in rows] == score_ids
+        assert rows[0]["created_at"] == "2026-03-01T12:00:00"
+        assert rows[4]["score"] == "400"
+
+    def test_since_watermark_pulls_increments(
+        self, client: TestClient, db_session: Session, score_ids
+    ):
+        first = client.get("/api/v1/scores/export", headers=AUTH)
+        watermark = first.headers["x-export-watermark"]
+
+        db_session.add(
+            Score(
+                id="late",
+                player_id="exporter",
+                score=1,
+                level=1,
+                lines=0,
+                play_time_seconds=1,
+                created_at=self.BASE + timedelta(hours=1),
+            )
+        )
+        db_session.commit()
+
+        second = client.get(
+            "/api/v1/scores/export", params={"since": watermark}, headers=AUTH
+        )
+        assert [json.loads(line)["id"] for line in second.text.splitlines()] == ["late"]
+        assert second.headers["x-export-watermark"] == "2026-03-01T13:00:00"
+
+        # Nothing new: empty body, watermark unchanged
+        third = client.get(
+            "/api/v1/scores/export",
+            params={"since": second.headers["x-export-watermark"]},
+            headers=AUTH,
+        )
+        assert third.text == ""
+        assert third.headers["x-export-watermark"] == "2026-03-01T13:00:00"
+
+    def test_timezone_aware_since_is_compared_in_utc(
+        self, client: TestClient, score_ids
+    ):
+        response = client.get(
+            "/api/v1/scores/export",
+            params={"since": "2026-03-01T21:02:00+09:00"},
+            headers=AUTH,
+        )
+        assert [json.loads(line)["id"] for line in response.text.splitlines()] == [
+            "s003",
+            "s004",
+        ]
+
+    def test_empty_table(self, client: TestClient, db_session: Session):
+        response = client.get(
+            "/api/v1/scores/export", params={"format": "csv"}, headers=AUTH
+        )
+        assert response.status_code == 200
+        assert response.text == "id,player_id,score,level,lines,play_time_seconds,created_at\n"
+        assert "x-export-watermark" not in response.headers
+
+    def test_player_history_route_still_matches_ids(
+        self, client: TestClient, score_ids
+    ):
+        assert client.get("/api/v1/scores/exporter").status_code == 200
+
+
+def read_status_kib(pid: int, field: str) -> int:
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+    raise KeyError(field)
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="reads /proc")
+def free_port() -> int:
+    """A port nothing listens on right now"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.mark.slow
+class TestExportMemory:
+    """A million-row export must not grow the server's memory with the table"""
+
+    ROWS = 1_000_000
+    RSS_BUDGET_MIB = 32
+
+    @pytest.fixture
+    def million_row_db(self, tmp_path) -> str:
+        url = f"sqlite:///{tmp_path / 'export.db'}"
+        engine = create_sync_engine(Settings(database_url=url))
+        try:
+            migrate(engine)
+            with engine.begin() as conn:
+                conn.execute(
+                    text(
+                        "INSERT INTO player (id, nickname, created_at, last_played_at) "
+                        "VALUES ('bulk', 'BULK', '2026-01-01', '2026-01-01')"
+                    )
+                )
+                conn.execute(
+                    text(
+                        "WITH RECURSIVE n(i) AS "
+                        f"(SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < {self.ROWS}) "
+                        "INSERT INTO score (id, player_id, score, level, lines, "
+                        "play_time_seconds, created_at) "
+                        "SELECT printf('%08d', i), 'bulk', i % 100000, 1 + i % 10, "
+                        "i % 500, i % 3600, "
+                        "datetime('2026-01-01', '+' || i || ' seconds') FROM n"
+                    )
+                )
+        finally:
+            engine.dispose()
+        return url
+
+    def test_million_row_export_stays_within_rss_budget(self, million_row_db):
+        port = free_port()
+        process = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "uvicorn",
+                "app.main:app",
+                "--host",
+                "127.0.0.1",
+                "--port",
+                str(port),
+                "--log-level",
+                "warning",
+            ],
+            cwd=BACKEND_DIR,
+            env=os.environ
+            | {
+                "DATABASE_URL": million_row_db,
+                "ADMIN_TOKEN": TOKEN,
+                "RATE_LIMIT_ENABLED": "false",
+                # SQLite's page cache and mmap are bounded by these pragmas
+                # but would otherwise dwarf what the export itself uses
+                "SQLITE_MMAP_SIZE": "0",
+                "SQLITE_CACHE_SIZE": "-8192",
+            },
+        )
+        base_url = f"http://127.0.0.1:{port}"
+        try:
+            deadline = time.monotonic() + 30
+            while True:
+                try:
+                    if httpx.get(f"{base_url}/health").status_code == 200:
+                        break
+                except httpx.HTTPError:
+                    pass
+                assert process.poll() is None and time.monotonic() < deadline
+                time.sleep(0.2)
+            baseline_kib = read_status_kib(process.pid, "VmRSS")
+
+            lines = 0
+            with httpx.stream(
+                "GET", f"{base_url}/api/v1/scores/export", headers=AUTH, timeout=120
+            ) as response:
+                assert response.status_code == 200
+                for chunk in response.iter_bytes():
+                    lines += chunk.count(b"\n")
+            peak_kib = read_status_kib(process.pid, "VmHWM")
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+        assert lines == self.ROWS
+        assert (peak_kib - baseline_kib) / 1024 < self.RSS_BUDGET_MIB
@@ -0,0 +1,277 @@
+"""
+Leaderboard Index Tests
+
+인메모리 랭킹 인덱스가 SQL 랭킹 쿼리와 동일한 결과를 내는지 검증
+"""
+
+import base64
+import json
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.models.counter import Counter
+from app.models.player_best import PlayerBest
+from app.models.score import Score
+from app.services.counters import DATA_VERSION
+from app.services.leaderboard import LeaderboardEntry, leaderboard, ranking_statement
+from tests.conftest import post_score, seed_scores
+
+
+def sql_ranking(db: Session, limit: int) -> list[dict]:
+    """Ranking entries as the SQL path would return them"""
+    return [
+        {
+            "rank": idx + 1,
+            "player_nickname": entry.nickname,
+            "score": entry.score,
+            "level": entry.level,
+            "lines": entry.lines,
+            "created_at": entry.created_at.isoformat(),
+        }
+        for idx, entry in enumerate(
+            LeaderboardEntry(*row) for row in db.execute(ranking_statement(limit))
+        )
+    ]
+
+
+def collect_pages(client: TestClient, limit: int) -> list[dict]:
+    """Follow next_cursor until the last ranking page"""
+    entries = []
+    url = f"/api/v1/scores?limit={limit}"
+    while True:
+        data = client.get(url).json()
+        entries.extend(data["data"])
+        if data["next_cursor"] is None:
+            return entries
+        url = f"/api/v1/scores?limit={limit}&cursor={data['next_cursor']}"
+
+
+class TestLeaderboardIndex:
+    """In-memory ranking index tests"""
+
+    @pytest.fixture
+    def small_index(self):
+        """Shrink the index depth so fallback paths are exercised"""
+        original = leaderboard.depth
+        leaderboard.depth = 20
+        yield leaderboard
+        leaderboard.depth = original
+
+    def test_index_matches_sql_after_load(
+        self, client: TestClient, db_session: Session, small_index
+    ):
+        """Rankings served from memory should equal the SQL query"""
+        seed_scores(db_session, 200)
+
+        for limit in (1, 10, 20):
+            response = client.get(f"/api/v1/scores?limit={limit}")
+            assert response.json()["data"] == sql_ranking(db_session, limit)
+
+    def test_index_matches_sql_after_inserts(
+        self, client: TestClient, db_session: Session, small_index
+    ):
+        """Scores posted after load should land in the same place as in SQL"""
+        player_ids = seed_scores(db_session, 200)
+        client.get("/api/v1/scores")  # build index
+
+        for value in (4900, 2500, 0, 4900, 100000):
+            post_score(client, player_ids[0], value, 3, lines=7)
+
+        response = client.get("/api/v1/scores?limit=20")
+        data = response.json()
+        assert data["data"] == sql_ranking(db_session, 20)
+        assert data["total"] == db_session.query(Score).count()
+
+    def test_deep_limit_falls_back_to_sql(
+        self, client: TestClient, db_session: Session, small_index
+    ):
+        """Ranks deeper than the index should come from the database"""
+        seed_scores(db_session, 200)
+
+        response = client.get("/api/v1/scores?limit=50")
+        data = response.json()
+        assert len(data["data"]) == 50
+        assert data["data"] == sql_ranking(db_session, 50)
+
+    def test_index_does_not_query_database_once_loaded(
+        self, client: TestClient, db_session: Session
+    ):
+        """Ranking reads within depth should be answered from memory"""
+        seed_scores(db_session, 30)
+        client.get("/api/v1/scores")
+
+        # Rows removed behind the index's back stay invisible to it
+        db_session.query(Score).delete()
+        db_session.commit()
+
+        response = client.get("/api/v1/scores?limit=5")
+        assert len(response.json()["data"]) == 5
+
+    def test_orm_deletes_drop_served_state(self, client: TestClient, db_session: Session):
+        """A deleted score leaves rankings, rank and ETag at once"""
+        player_ids = seed_scores(db_session, 30)
+        first = client.get("/api/v1/scores?limit=5")
+        client.get(f"/api/v1/players/{player_ids[0]}/rank")
+        version = db_session.scalar(
+            select(Counter.value).where(Counter.name == DATA_VERSION)
+        )
+
+        top = db_session.scalar(select(Score).order_by(Score.score.desc()).limit(1))
+        db_session.delete(top)
+        db_session.commit()
+
+        second = client.get("/api/v1/scores?limit=5")
+        assert second.json()["data"] == sql_ranking(db_session, 5)
+        assert second.json()["total"] == 29
+        assert second.headers["etag"] != first.headers["etag"]
+        revalidated = client.get(
+            "/api/v1/scores?limit=5", headers={"If-None-Match": first.headers["etag"]}
+        )
+        assert revalidated.status_code == 200
+        assert db_session.scalar(
+            select(Counter.value).where(Counter.name == DATA_VERSION)
+        ) == (version or 0) + 1
+
+    def test_index_keeps_only_depth_entries(
+        self, client: TestClient, db_session: Session, small_index
+    ):
+        """The index should never hold more than its depth"""
+        seed_scores(db_session, 200)
+        client.get("/api/v1/scores")
+
+        assert len(leaderboard.page(small_index.depth)) == small_index.depth
+        assert leaderboard.page(small_index.depth + 1) is None
+
+
+class TestRankingPagination:
+    """Keyset pagination and page size cap tests"""
+
+    @pytest.fixture
+    def small_index(self):
+        """Shrink the index so later pages come from SQL"""
+        original = leaderboard.depth
+        leaderboard.depth = 25
+        yield leaderboard
+        leaderboard.depth = original
+
+    def test_pages_concatenate_to_full_ranking(
+        self, client: TestClient, db_session: Session, small_index
+    ):
+        """Walking the cursor should visit every score once, in order"""
+        seed_scores(db_session, 120)
+
+        entries = collect_pages(client, 7)
+        assert entries == sql_ranking(db_session, 1000)
+        assert [e["rank"] for e in entries] == list(range(1, 121))
+
+    def test_index_and_sql_pages_agree(
+        self, client: TestClient, db_session: Session, small_index
+    ):
+        """A page straddling the index boundary should match SQL"""
+        seed_scores(db_session, 80)
+
+        first = client.get("/api/v1/scores?limit=20").json()
+        second = client.get(
+            f"/api/v1/scores?limit=20&cursor={first['next_cursor']}"
+        ).json()
+        assert first["data"] + second["data"] == sql_ranking(db_session, 40)
+
+    def test_last_page_has_no_cursor(self, client: TestClient, db_session: Session):
+        """next_cursor should be null once every score was returned"""
+        seed_scores(db_session, 10)
+
+        data = client.get("/api/v1/scores?limit=10").json()
+        assert len(data["data"]) == 10
+        assert data["next_cursor"] is None
+
+    def test_invalid_cursor_returns_400(self, client: TestClient):
+        """Garbage cursors should be rejected"""
+        response = client.get("/api/v1/scores?cursor=not-a-cursor")
+        assert response.status_code == 400
+
+    def test_tampered_cursor_returns_400(self, client: TestClient, db_session: Session):
+        """A cursor whose rank was edited should not be trusted"""
+        seed_scores(db_session, 10)
+        cursor = client.get("/api/v1/scores?limit=2").json()["next_cursor"]
+        body, signature = cursor.split(".")
+        payload = json.loads(base64.urlsafe_b64decode(body + "=" * (-len(body) % 4)))
+        payload[0] = 1000
+        forged = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+        assert client.get(f"/api/v1/scores?cursor={cursor}").status_code == 200
+        response = client.get(f"/api/v1/scores?cursor={forged}.{signature}")
+        assert response.status_code == 400
+
+    @pytest.mark.parametrize("path", ["/api/v1/scores", f"/api/v1/scores/{uuid.uuid4()}"])
+    def test_limit_is_capped(self, client: TestClient, path: str):
+        """Page sizes above the maximum should be rejected"""
+        assert client.get(f"{path}?limit=10000000").status_code == 422
+        assert client.get(f"{path}?limit=0").status_code == 422
+        assert client.get(f"{path}?limit=100").status_code == 200
+
+
+class TestPlayerRankEndpoint:
+    """Rank-around-me endpoint tests"""
+
+    @pytest.fixture(params=[1000, 15], ids=["index", "sql"])
+    def index_depth(self, request):
+        """Run against a covering index and a shallow one"""
+        original = leaderboard.depth
+        leaderboard.depth = request.param
+        yield request.param
+        leaderboard.depth = original
+
+    def test_rank_matches_full_ranking(
+        self, client: TestClient, db_session: Session, index_depth
+    ):
+        """rank, above and below should be slices of the full ranking"""
+        player_ids = seed_scores(db_session, 150)
+        ranking = sql_ranking(db_session, 1000)
+
+        for pid in player_ids[:4]:
+            data = client.get(f"/api/v1/players/{pid}/rank?neighbors=3").json()
+            rank = data["rank"]
+            best = ranking[rank - 1]
+
+            assert data["best"] == best
+            assert data["total"] == 150
+            assert data["above"] == ranking[max(0, rank - 4) : rank - 1]
+            assert data["below"] == ranking[rank : rank + 3]
+
+            pid_scores = db_session.query(Score.score).filter(Score.player_id == pid)
+            assert best["score"] == max(score for (score,) in pid_scores)
+
+    def test_rank_updates_after_new_score(self, client: TestClient, db_session: Session):
+        """A new top score should move the player to rank 1"""
+        player_ids = seed_scores(db_session, 50)
+        pid = player_ids[-1]
+        client.get(f"/api/v1/players/{pid}/rank")  # build indexes
+
+        post_score(client, pid, 9_999_999, 10, lines=300, play_time_seconds=1200)
+
+        data = client.get(f"/api/v1/players/{pid}/rank").json()
+        assert data["rank"] == 1
+        assert data["above"] == []
+        assert data["total"] == 51
+
+    def test_best_score_is_read_from_player_best(
+        self, client: TestClient, db_session: Session, query_budget
+    ):
+        """The player's history is only sorted when player_best has no row"""
+        pid = seed_scores(db_session, 100)[0]
+        with query_budget(5) as statements:
+            expected = client.get(f"/api/v1/players/{pid}/rank").json()
+        assert "FROM player_best" in statements[0]
+
+        db_session.execute(delete(PlayerBest))
+        db_session.commit()
+        assert client.get(f"/api/v1/players/{pid}/rank").json() == expected
+
+    def test_unknown_player_returns_404(self, client: TestClient):
+        """Players without scores have no rank"""
+        response = client.get(f"/api/v1/players/{uuid.uuid4()}/rank")
+        assert response.status_code == 404
@@ -0,0 +1,227 @@
+"""
+Live Leaderboard Stream Tests
+
+/scores/stream이 스냅샷 후 상위 N 변경분만 전송하고, 느린 구독자를 끊고,
+수천 개의 유휴 연결을 하나의 팬아웃으로 처리하는지 검증
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.orm import Session
+
+from app.main import app
+from app.services.live import live_leaderboard
+from tests.conftest import create_player_async, post_score_async, seed_scores
+
+TOP_N = live_leaderboard.top_n
+
+
+class SSEStream:
+    """Drive the ASGI app directly: httpx's ASGI transport buffers bodies"""
+
+    def __init__(self, path: str = "/api/v1/scores/stream"):
+        self.path = path
+        self.messages: asyncio.Queue = asyncio.Queue()
+        self.disconnected = asyncio.Event()
+        self.buffer = b""
+        self.task: asyncio.Task | None = None
+
+    async def __aenter__(self) -> "SSEStream":
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0", "spec_version": "2.3"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": self.path,
+            "raw_path": self.path.encode(),
+            "root_path": "",
+            "query_string": b"",
+            "headers": [(b"host", b"test")],
+            "client": ("127.0.0.1", 50000),
+            "server": ("test", 80),
+        }
+
+        async def receive():
+            await self.disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        self.task = asyncio.create_task(app(scope, receive, self.messages.put))
+        self.start = await asyncio.wait_for(self.messages.get(), timeout=5)
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.disconnected.set()
+        await asyncio.wait_for(self.task, timeout=5)
+
+    @property
+    def headers(self) -> dict[str, str]:
+        return {k.decode(): v.decode() for k, v in self.start["headers"]}
+
+    async def next_event(self, timeout: float = 5) -> tuple[str, dict]:
+        """The next named event (comments and retry hints are skipped)"""
+        while True:
+            while b"\n\n" not in self.buffer:
+                message = await asyncio.wait_for(self.messages.get(), timeout)
+                self.buffer += message.get("body", b"")
+            block, self.buffer = self.buffer.split(b"\n\n", 1)
+            fields = dict(
+                line.split(": ", 1) for line in block.decode().splitlines() if ": " in line
+            )
+            if "event" in fields:
+                return fields["event"], json.loads(fields["data"])
+
+
+async def wait_for(condition, timeout: float = 5) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        await asyncio.sleep(0.005)
+
+
+def apply_diff(rankings: list[dict], diff: dict) -> list[dict]:
+    by_id = {row["id"]: row for row in rankings if row["id"] not in diff["dropped"]}
+    for moved in diff["moved"]:
+        by_id[moved["id"]] = {**by_id[moved["id"]], "rank": moved["rank"]}
+    for entered in diff["entered"]:
+        by_id[entered["id"]] = entered
+    return sorted(by_id.values(), key=lambda row: row["rank"])
+
+
+class TestLiveStream:
+    """GET /api/v1/scores/stream tests"""
+
+    @pytest.fixture
+    def seeded(self, db_session: Session) -> None:
+        seed_scores(db_session, 50)
+
+    @pytest.fixture
+    async def player_id(self, async_client: AsyncClient) -> str:
+        return await create_player_async(async_client, "LIVE")
+
+    async def top_rankings(self, client: AsyncClient) -> list[tuple]:
+        response = await client.get("/api/v1/scores", params={"limit": TOP_N})
+        return [
+            (row["rank"], row["player_nickname"], row["score"])
+            for row in response.json()["data"]
+        ]
+
+    async def test_opens_with_current_top_n(self, seeded, async_client: AsyncClient):
+        async with SSEStream() as stream:
+            assert stream.start["status"] == 200
+            assert stream.headers["content-type"].startswith("text/event-stream")
+            assert stream.headers["cache-control"] == "no-cache"
+
+            name, data = await stream.next_event()
+
+        assert name == "snapshot"
+        assert len(data["rankings"]) == TOP_N
+        assert [
+            (row["rank"], row["player_nickname"], row["score"]) for row in data["rankings"]
+        ] == await self.top_rankings(async_client)
+
+    async def test_top_score_pushes_diff(
+        self, seeded, async_client: AsyncClient, player_id
+    ):
+        async with SSEStream() as stream:
+            _, snapshot = await stream.next_event()
+            await post_score_async(async_client, player_id, 9_999_999)
+
+            name, diff = await stream.next_event()
+
+        assert name == "diff"
+        assert [(e["rank"], e["score"]) for e in diff["entered"]] == [(1, 9_999_999)]
+        assert len(diff["dropped"]) == 1
+        rankings = apply_diff(snapshot["rankings"], diff)
+        assert [
+            (row["rank"], row["player_nickname"], row["score"]) for row in rankings
+        ] == await self.top_rankings(async_client)
+
+    async def test_scores_outside_top_n_send_nothing(
+        self, seeded, async_client: AsyncClient, player_id
+    ):
+        async with SSEStream() as stream:
+            await stream.next_event()
+            await post_score_async(async_client, player_id, 0)
+            await post_score_async(async_client, player_id, 9_999_999)
+
+            # The first event after the snapshot is the top score's diff
+            _, diff = await stream.next_event()
+
+        assert [e["score"] for e in diff["entered"]] == [9_999_999]
+        assert live_leaderboard.metrics.events == 1
+
+    async def test_disconnect_unsubscribes(self, seeded, async_client: AsyncClient):
+        async with SSEStream() as stream:
+            await stream.next_event()
+            assert live_leaderboard.metrics.subscribers == 1
+
+        assert live_leaderboard.metrics.subscribers == 0
+
+    async def test_over_capacity_is_rejected(
+        self, seeded, async_client: AsyncClient, monkeypatch
+    ):
+        monkeypatch.setattr(live_leaderboard, "max_subscribers", 1)
+        async with SSEStream():
+            response = await async_client.get("/api/v1/scores/stream")
+
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "30"
+
+
+class TestFanOut:
+    """Fan-out to many subscribers"""
+
+    @pytest.fixture
+    async def player_id(self, async_client: AsyncClient, db_session: Session) -> str:
+        seed_scores(db_session, 50)
+        return await create_player_async(async_client, "FAN")
+
+    async def test_slow_consumer_is_dropped(
+        self, async_client: AsyncClient, player_id, monkeypatch
+    ):
+        monkeypatch.setattr(live_leaderboard, "buffer_size", 2)
+        fast = await live_leaderboard.subscribe()
+        slow = await live_leaderboard.subscribe()
+        received = []
+
+        async def read_fast():
+            async for event in live_leaderboard.events(fast):
+                received.append(event)
+
+        reader = asyncio.create_task(read_fast())
+        for i in range(3):
+            await post_score_async(async_client, player_id, 9_000_000 + i)
+            await wait_for(lambda i=i: live_leaderboard.metrics.events == i + 1)
+
+        # Snapshot + 1 diff filled the slow queue; the next diff dropped it
+        assert live_leaderboard.metrics.dropped == 1
+        assert slow.queue.get_nowait() is None
+        await wait_for(lambda: len(received) == 4)
+        assert live_leaderboard.metrics.subscribers == 1
+        reader.cancel()
+
+    async def test_one_write_reaches_thousands_of_idle_subscribers(
+        self, async_client: AsyncClient, player_id
+    ):
+        subscribers = [await live_leaderboard.subscribe() for _ in range(5000)]
+        for subscriber in subscribers:
+            subscriber.queue.get_nowait()  # snapshot
+
+        started = time.perf_counter()
+        await post_score_async(async_client, player_id, 9_999_999)
+        await wait_for(lambda: subscribers[-1].queue.qsize() == 1)
+        elapsed = time.perf_counter() - started
+
+        events = [subscriber.queue.get_nowait() for subscriber in subscribers]
+        # Encoded once: every queue holds the same bytes object
+        assert all(event is events[0] for event in events)
+        assert b"event: diff" in events[0]
+        assert elapsed < 1.0
+        assert live_leaderboard.metrics.subscribers == 5000
+        for subscriber in subscribers:
+            live_leaderboard.unsubscribe(subscriber)
@@ -0,0 +1,60 @@
+"""
+Metrics Endpoint Tests
+
+/metrics가 라우트 템플릿별 지연 히스토그램과 SQL 지문별 실행 시간을 Prometheus 형식으로 노출하는지 검증
+"""
+
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services.metrics import reset_metrics
+
+
+class TestMetricsEndpoint:
+    """GET /metrics tests"""
+
+    @pytest.fixture(autouse=True)
+    def fresh_metrics(self):
+        reset_metrics()
+
+    def test_prometheus_text_format(self, client: TestClient):
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert "# TYPE http_request_duration_seconds histogram" in response.text
+        assert "# TYPE http_requests_in_flight gauge" in response.text
+
+    def test_requests_are_labelled_by_route_template(self, client: TestClient):
+        for _ in range(3):
+            client.get(f"/api/v1/scores/{uuid.uuid4()}")
+        client.get("/no-such-path")
+
+        text = client.get("/metrics").text
+
+        assert (
+            'http_request_duration_seconds_count{method="GET",'
+            'route="/scores/{player_id}",status="200"} 3'
+        ) in text
+        assert (
+            'http_request_duration_seconds_count{method="GET",'
+            'route="unmatched",status="404"} 1'
+        ) in text
+        # The scrape itself is the only request in flight
+        assert 'http_requests_in_flight{method="GET"} 1' in text
+
+    def test_statements_are_timed_per_fingerprint(self, client: TestClient):
+        client.get(f"/api/v1/scores/{uuid.uuid4()}")
+        client.get(f"/api/v1/scores/{uuid.uuid4()}")
+
+        history = [
+            line
+            for line in client.get("/metrics").text.splitlines()
+            if line.startswith("db_statement_duration_seconds_count")
+            and "WHERE score.player_id = ?" in line
+        ]
+
+        assert len(history) == 1
+        assert history[0].endswith(" 2")
@@ -0,0 +1,203 @@
+"""
+Player Best Projection Tests
+
+플레이어별 최고 점수·누적 통계 테이블이 점수 기록과 일치하고 유니크 랭킹과
+플레이어 통계를 제공하는지 검증
+"""
+
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.models.player_best import PlayerBest
+from app.models.score import Score
+from app.services.player_best import rebuild_player_best
+from tests.conftest import (
+    async_engine,
+    create_player,
+    post_batch,
+    post_score,
+    score_body,
+    seed_scores,
+)
+
+
+def player_best_rows(db: Session) -> dict[str, tuple]:
+    """Snapshot of player_best keyed by player"""
+    db.rollback()
+    return {
+        row.player_id: (
+            row.nickname,
+            row.score_id,
+            row.best_score,
+            row.level,
+            row.lines,
+            row.achieved_at,
+            row.games_played,
+            row.total_score,
+            row.total_lines,
+            row.total_play_time_seconds,
+        )
+        for row in db.scalars(select(PlayerBest))
+    }
+
+
+class TestPlayerBestProjection:
+    """Per-player best score projection tests"""
+
+    @pytest.fixture
+    def player_ids(self, client: TestClient) -> list[str]:
+        """Create three players"""
+        return [create_player(client, f"BEST{i}") for i in range(3)]
+
+    def test_upsert_matches_rebuild(
+        self, client: TestClient, db_session: Session, player_ids: list[str]
+    ):
+        """Incremental maintenance should equal recomputing from history"""
+        for value in (300, 900, 500):
+            post_score(client, player_ids[0], value)
+        post_score(client, player_ids[1], 700, 4)
+        post_batch(
+            client,
+            [
+                score_body(player_ids[1], 100),
+                score_body(player_ids[1], 800, 6),
+                score_body(player_ids[2], 50),
+            ],
+        )
+
+        incremental = player_best_rows(db_session)
+        assert {pid: row[2] for pid, row in incremental.items()} == {
+            player_ids[0]: 900,
+            player_ids[1]: 800,
+            player_ids[2]: 50,
+        }
+        assert incremental[player_ids[0]][6] == 3
+        assert incremental[player_ids[1]][6] == 3
+
+        rebuild_player_best(db_session)
+        assert player_best_rows(db_session) == incremental
+
+    def test_unique_players_lists_each_player_once(
+        self, client: TestClient, player_ids: list[str]
+    ):
+        """unique_players=true should keep one entry per player"""
+        for value in (9000, 8000, 7000):
+            post_score(client, player_ids[0], value)
+        post_score(client, player_ids[1], 7500)
+
+        data = client.get("/api/v1/scores?unique_players=true").json()
+        assert [(e["player_nickname"], e["score"]) for e in data["data"]] == [
+            ("BEST0", 9000),
+            ("BEST1", 7500),
+        ]
+        assert [e["rank"] for e in data["data"]] == [1, 2]
+        assert data["total"] == 2
+
+        everything = client.get("/api/v1/scores").json()
+        assert everything["total"] == 4
+
+    def test_unique_ranking_pages_match_reference(
+        self, client: TestClient, db_session: Session
+    ):
+        """Cursor pages should equal a GROUP BY reference ranking"""
+        seed_scores(db_session, 300)
+
+        best = player_best_rows(db_session).values()
+        expected = sorted(best, key=lambda row: (-row[2], row[5], row[1]))
+
+        entries = []
+        url = "/api/v1/scores?unique_players=true&limit=3"
+        while url:
+            data = client.get(url).json()
+            entries.extend(data["data"])
+            cursor = data["next_cursor"]
+            url = cursor and f"/api/v1/scores?unique_players=true&limit=3&cursor={cursor}"
+
+        assert [(e["player_nickname"], e["score"]) for e in entries] == [
+            (row[0], row[2]) for row in expected
+        ]
+
+    def test_unique_read_touches_only_player_best(
+        self, client: TestClient, player_ids: list[str]
+    ):
+        """The unique ranking should not read the score table"""
+        post_score(client, player_ids[0], 10)
+
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement.lower())
+
+        event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+        try:
+            client.get("/api/v1/scores?unique_players=true")
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+        assert statements
+        assert not any("from score" in s or "join score" in s for s in statements)
+
+
+class TestPlayerStats:
+    """GET /api/v1/players/{player_id}/stats"""
+
+    @pytest.fixture
+    def player_id(self, client: TestClient) -> str:
+        return create_player(client, "STATS")
+
+    def test_totals_follow_score_writes(self, client: TestClient, player_id: str):
+        post_score(client, player_id, 1200, 3, lines=12, play_time_seconds=300)
+        post_batch(
+            client,
+            [
+                score_body(player_id, value, lines=value // 100, play_time_seconds=60)
+                for value in (500, 301)
+            ],
+        )
+
+        response = client.get(f"/api/v1/players/{player_id}/stats")
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "player_id": player_id,
+            "nickname": "STATS",
+            "games_played": 3,
+            "best_score": 1200,
+            "average_score": 667.0,
+            "total_score": 2001,
+            "total_lines": 20,
+            "total_play_time_seconds": 420,
+        }
+
+    def test_matches_aggregate_of_history(self, client: TestClient, db_session: Session):
+        player_ids = seed_scores(db_session, 500)
+        db_session.rollback()
+
+        for pid in player_ids:
+            scores = db_session.scalars(select(Score).where(Score.player_id == pid)).all()
+            data = client.get(f"/api/v1/players/{pid}/stats").json()
+            assert data["games_played"] == len(scores)
+            assert data["best_score"] == max(s.score for s in scores)
+            assert data["total_score"] == sum(s.score for s in scores)
+            assert data["total_lines"] == sum(s.lines for s in scores)
+            assert data["total_play_time_seconds"] == sum(
+                s.play_time_seconds for s in scores
+            )
+            assert data["average_score"] == round(data["total_score"] / len(scores), 1)
+
+    def test_player_without_scores(self, client: TestClient, player_id: str):
+        data = client.get(f"/api/v1/players/{player_id}/stats").json()
+
+        assert data["games_played"] == 0
+        assert data["best_score"] is None
+        assert data["average_score"] == 0.0
+        assert data["total_score"] == 0
+
+    def test_unknown_player(self, client: TestClient):
+        response = client.get(f"/api/v1/players/{uuid.uuid4()}/stats")
+
+        assert response.status_code == 404
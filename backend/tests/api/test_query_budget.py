@@ -0,0 +1,121 @@
+"""
+Query Budget Tests
+
+엔드포인트별 SQL 실행 횟수 상한, Server-Timing 헤더, 느린 요청 로그를 검증
+"""
+
+import logging
+import re
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from tests.conftest import create_player, post_score, score_body
+
+
+class TestEndpointQueryBudgets:
+    """Statement counts per endpoint (raise deliberately, never by accident)"""
+
+    @pytest.fixture
+    def player_id(self, client: TestClient) -> str:
+        return create_player(client, "BUDGET")
+
+    def test_create_player(self, client: TestClient, query_budget):
+        with query_budget(2):
+            response = client.post(
+                "/api/v1/players", json={"id": str(uuid.uuid4()), "nickname": "NEW"}
+            )
+        assert response.status_code == 200
+
+    def test_create_score(self, client: TestClient, player_id, query_budget):
+        with query_budget(5):
+            response = client.post("/api/v1/scores", json=score_body(player_id))
+        assert response.status_code == 200
+
+    def test_batch_does_not_grow_with_its_size(
+        self, client: TestClient, player_id, query_budget
+    ):
+        other = create_player(client, "OTHER")
+        scores = [score_body(pid, 100 * i) for i in range(10) for pid in (player_id, other)]
+
+        with query_budget(5):
+            response = client.post("/api/v1/scores/batch", json={"scores": scores})
+        assert response.status_code == 200
+
+    def test_rankings(self, client: TestClient, player_id, query_budget):
+        post_score(client, player_id)
+
+        with query_budget(2):
+            client.get("/api/v1/scores")
+        # Served from the index / response cache afterwards
+        with query_budget(0):
+            client.get("/api/v1/scores")
+
+    def test_player_scores(self, client: TestClient, player_id, query_budget):
+        with query_budget(1):
+            response = client.get(f"/api/v1/scores/{player_id}")
+        assert response.status_code == 200
+
+    def test_player_rank(self, client: TestClient, player_id, query_budget):
+        post_score(client, player_id)
+
+        # Cold: includes loading the rank index
+        with query_budget(5):
+            response = client.get(f"/api/v1/players/{player_id}/rank")
+        assert response.status_code == 200
+
+    def test_player_stats(self, client: TestClient, player_id, query_budget):
+        for _ in range(3):
+            post_score(client, player_id)
+
+        with query_budget(1):
+            response = client.get(f"/api/v1/players/{player_id}/stats")
+        assert response.status_code == 200
+
+    def test_budget_failure_lists_statements(self, client: TestClient, query_budget):
+        with pytest.raises(AssertionError, match="SELECT .* FROM score"):
+            with query_budget(0):
+                client.get(f"/api/v1/scores/{uuid.uuid4()}")
+
+
+class TestQueryBudgetMiddleware:
+    """Server-Timing header and slow request log tests"""
+
+    def test_server_timing_reports_statements(self, client: TestClient):
+        response = client.get(f"/api/v1/scores/{uuid.uuid4()}")
+
+        timing = response.headers["server-timing"]
+        assert re.fullmatch(
+            r'db;dur=\d+\.\d\d;desc="queries=1", app;dur=\d+\.\d\d', timing
+        )
+
+    def test_requests_within_thresholds_are_not_logged(
+        self, client: TestClient, caplog
+    ):
+        with caplog.at_level(logging.WARNING, logger="app.services.query_budget"):
+            client.get(f"/api/v1/scores/{uuid.uuid4()}")
+        assert caplog.records == []
+
+    def test_request_over_statement_budget_is_logged(
+        self, client: TestClient, caplog, monkeypatch
+    ):
+        monkeypatch.setattr(settings, "query_budget_max_statements", 0)
+
+        with caplog.at_level(logging.WARNING, logger="app.services.query_budget"):
+            client.get(f"/api/v1/scores/{uuid.uuid4()}")
+
+        [record] = caplog.records
+        assert "GET /api/v1/scores/" in record.message
+        assert "1 statements" in record.message
+        assert "1 x SELECT score.id" in record.message
+
+    def test_slow_request_is_logged(self, client: TestClient, caplog, monkeypatch):
+        monkeypatch.setattr(settings, "slow_request_ms", -1)
+
+        with caplog.at_level(logging.WARNING, logger="app.services.query_budget"):
+            client.get("/health")
+
+        [record] = caplog.records
+        assert "GET /health: 0 statements" in record.message
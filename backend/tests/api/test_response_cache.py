@@ -0,0 +1,104 @@
+"""
+Response Cache Integration Tests
+
+랭킹/기록 조회 응답이 캐시되고 점수·플레이어 저장 시 정확히 무효화되는지 검증
+"""
+
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.services.response_cache import response_cache
+from tests.conftest import async_engine, create_player, post_score
+
+
+class TestResponseCaching:
+    """Cached read route tests"""
+
+    @pytest.fixture
+    def player_ids(self, client: TestClient) -> list[str]:
+        return [create_player(client, "CACHE") for _ in range(2)]
+
+    def count_queries(self, client: TestClient, url: str) -> tuple[bytes, int]:
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+        try:
+            body = client.get(url).content
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+        return body, len(statements)
+
+    def test_repeated_reads_are_served_from_cache(
+        self, client: TestClient, player_ids: list[str]
+    ):
+        """Identical requests return the same bytes without touching the DB"""
+        post_score(client, player_ids[0], 100)
+        for url in (
+            "/api/v1/scores?unique_players=true",
+            f"/api/v1/scores/{player_ids[0]}",
+        ):
+            first, first_queries = self.count_queries(client, url)
+            second, second_queries = self.count_queries(client, url)
+            assert first_queries > 0
+            assert second_queries == 0
+            assert second == first
+
+        assert response_cache.metrics.hits == 2
+
+    def test_cached_body_matches_response_model(
+        self, client: TestClient, player_ids: list[str]
+    ):
+        """Cached bytes decode to the documented response shape"""
+        post_score(client, player_ids[0], 100)
+        client.get("/api/v1/scores")
+        response = client.get("/api/v1/scores")
+
+        assert response.headers["content-type"] == "application/json"
+        data = response.json()
+        assert data["total"] == 1
+        assert data["next_cursor"] is None
+        assert data["data"][0]["player_nickname"] == "CACHE"
+
+    def test_score_write_invalidates_rankings_and_own_history(
+        self, client: TestClient, player_ids: list[str]
+    ):
+        """A score drops ranking pages and its player's history only"""
+        first, other = player_ids
+        post_score(client, first, 100)
+        post_score(client, other, 50)
+        client.get("/api/v1/scores")
+        client.get(f"/api/v1/scores/{first}")
+        client.get(f"/api/v1/scores/{other}")
+
+        post_score(client, first, 300)
+
+        assert client.get("/api/v1/scores").json()["data"][0]["score"] == 300
+        assert len(client.get(f"/api/v1/scores/{first}").json()) == 2
+        _, queries = self.count_queries(client, f"/api/v1/scores/{other}")
+        assert queries == 0
+
+    def test_new_player_invalidates_cached_empty_history(self, client: TestClient):
+        """History cached before the player existed is dropped on creation"""
+        pid = str(uuid.uuid4())
+        assert client.get(f"/api/v1/scores/{pid}").json() == []
+
+        response = client.post("/api/v1/players", json={"id": pid, "nickname": "LATE"})
+        assert response.status_code == 200
+        post_score(client, pid, 10)
+
+        assert len(client.get(f"/api/v1/scores/{pid}").json()) == 1
+
+    def test_parameters_are_part_of_the_key(
+        self, client: TestClient, player_ids: list[str]
+    ):
+        for score in (100, 200, 300):
+            post_score(client, player_ids[0], score)
+
+        assert len(client.get("/api/v1/scores?limit=1").json()["data"]) == 1
+        assert len(client.get("/api/v1/scores?limit=3").json()["data"]) == 3
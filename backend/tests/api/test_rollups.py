@@ -0,0 +1,209 @@
+"""
+Rollup Leaderboard Tests
+
+일간/주간 랭킹이 기간별 집계 테이블에서 제공되고 만료 기간이 정리되는지 검증
+"""
+
+import uuid
+from datetime import date, datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.models.counter import Counter
+from app.models.rollup import ScoreRollup
+from app.models.score import Player, Score, utc_now_naive
+from app.services.counters import ROLLUP_PREFIX, rollup_counter
+from app.services.rollups import compact_rollups, period_start
+from tests.conftest import async_engine, create_player, post_score
+
+
+def rollup_counters(db: Session) -> dict[str, int]:
+    """Read the rollup period counters"""
+    db.rollback()
+    return dict(
+        db.execute(
+            select(Counter.name, Counter.value).where(
+                Counter.name.startswith(ROLLUP_PREFIX)
+            )
+        ).all()
+    )
+
+
+def add_rollup(db: Session, kind: str, start: date, score: int) -> None:
+    """Insert a rollup row and bump its period counter directly"""
+    db.add(
+        ScoreRollup(
+            period_kind=kind,
+            period_start=start,
+            score_id=str(uuid.uuid4()),
+            score=score,
+            created_at=datetime.combine(start, datetime.min.time()),
+            nickname="OLD",
+            level=1,
+            lines=0,
+        )
+    )
+    name = rollup_counter(kind, start)
+    counter = db.get(Counter, name)
+    if counter is None:
+        db.add(Counter(name=name, value=1))
+    else:
+        counter.value += 1
+    db.commit()
+
+
+class TestPeriodStart:
+    """Period boundary tests"""
+
+    def test_day_is_calendar_date(self):
+        assert period_start("day", datetime(2026, 3, 4, 23, 59)) == date(2026, 3, 4)
+
+    def test_week_starts_on_monday(self):
+        # 2026-03-08 is a Sunday
+        assert period_start("week", datetime(2026, 3, 8, 12)) == date(2026, 3, 2)
+        assert period_start("week", datetime(2026, 3, 9)) == date(2026, 3, 9)
+
+
+class TestWindowRankings:
+    """GET /scores?window= tests"""
+
+    @pytest.fixture
+    def player_id(self, client: TestClient) -> str:
+        return create_player(client, "WIN")
+
+    def test_writes_maintain_current_periods(
+        self, client: TestClient, db_session: Session, player_id: str
+    ):
+        """Each score lands in the current day and week with their counters"""
+        for score in (300, 100, 200):
+            post_score(client, player_id, score)
+
+        now = utc_now_naive()
+        for window in ("day", "week"):
+            response = client.get(f"/api/v1/scores?window={window}")
+            assert response.status_code == 200
+            data = response.json()
+            assert [e["score"] for e in data["data"]] == [300, 200, 100]
+            assert [e["rank"] for e in data["data"]] == [1, 2, 3]
+            assert data["total"] == 3
+
+        assert rollup_counters(db_session) == {
+            rollup_counter("day", period_start("day", now)): 3,
+            rollup_counter("week", period_start("week", now)): 3,
+        }
+
+    def test_expired_periods_are_not_served(
+        self, client: TestClient, db_session: Session, player_id: str
+    ):
+        """Rows from earlier periods stay out of the current window"""
+        today = period_start("day", utc_now_naive())
+        add_rollup(db_session, "day", today - timedelta(days=1), 9000)
+        add_rollup(db_session, "week", today - timedelta(days=7 + today.weekday()), 9000)
+        post_score(client, player_id, 50)
+
+        for window in ("day", "week"):
+            data = client.get(f"/api/v1/scores?window={window}").json()
+            assert [e["score"] for e in data["data"]] == [50]
+            assert data["total"] == 1
+
+    def test_window_pagination(self, client: TestClient, player_id: str):
+        """Cursor pages through the window without gaps or repeats"""
+        for score in range(10, 0, -1):
+            post_score(client, player_id, score * 10)
+
+        scores, cursor = [], None
+        while True:
+            url = "/api/v1/scores?window=day&limit=3"
+            if cursor:
+                url += f"&cursor={cursor}"
+            data = client.get(url).json()
+            scores += [e["score"] for e in data["data"]]
+            cursor = data["next_cursor"]
+            if cursor is None:
+                break
+
+        assert scores == [score * 10 for score in range(10, 0, -1)]
+
+    def test_cursor_is_bound_to_its_ranking(self, client: TestClient, player_id: str):
+        """A day-window cursor cannot continue the all-time or another board"""
+        for score in range(5, 0, -1):
+            post_score(client, player_id, score * 10)
+        cursor = client.get("/api/v1/scores?window=day&limit=2").json()["next_cursor"]
+
+        assert client.get(f"/api/v1/scores?window=day&cursor={cursor}").status_code == 200
+        for query in ("", "window=week&", "unique_players=true&"):
+            response = client.get(f"/api/v1/scores?{query}cursor={cursor}")
+            assert response.status_code == 400
+            assert response.json()["detail"] == "Cursor belongs to a different ranking"
+
+    def test_window_read_avoids_score_table(
+        self, client: TestClient, player_id: str
+    ):
+        """Window reads should not scan or count the score table"""
+        post_score(client, player_id, 10)
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement.lower())
+
+        event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+        try:
+            client.get("/api/v1/scores?window=week")
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+        assert not any("from score " in statement for statement in statements)
+        assert not any("count(" in statement for statement in statements)
+
+    def test_unknown_window_rejected(self, client: TestClient):
+        assert client.get("/api/v1/scores?window=month").status_code == 422
+
+    def test_unique_players_requires_all_window(self, client: TestClient):
+        response = client.get("/api/v1/scores?window=day&unique_players=true")
+        assert response.status_code == 400
+
+
+class TestRollupMaintenance:
+    """Compaction and delete tests"""
+
+    def test_compaction_drops_ended_periods(self, client: TestClient, db_session: Session):
+        """Expired rows and counters go, the current periods stay"""
+        now = utc_now_naive()
+        today = period_start("day", now)
+        this_week = period_start("week", now)
+        add_rollup(db_session, "day", today - timedelta(days=2), 10)
+        add_rollup(db_session, "day", today - timedelta(days=1), 20)
+        add_rollup(db_session, "day", today, 30)
+        add_rollup(db_session, "week", this_week - timedelta(days=7), 40)
+        add_rollup(db_session, "week", this_week, 50)
+
+        assert compact_rollups(db_session, now) == 3
+
+        remaining = db_session.execute(
+            select(ScoreRollup.period_kind, ScoreRollup.score)
+        ).all()
+        assert sorted(remaining) == [("day", 30), ("week", 50)]
+        assert rollup_counters(db_session) == {
+            rollup_counter("day", today): 1,
+            rollup_counter("week", this_week): 1,
+        }
+
+    def test_orm_score_delete_leaves_periods(
+        self, client: TestClient, db_session: Session
+    ):
+        """Deleting a player removes its scores from the rollups"""
+        pids = [create_player(client, "DEL") for _ in range(2)]
+        for pid in pids:
+            post_score(client, pid)
+
+        db_session.delete(db_session.get(Player, pids[0]))
+        db_session.commit()
+
+        assert set(rollup_counters(db_session).values()) == {1}
+        remaining = db_session.scalars(select(ScoreRollup.score_id)).all()
+        assert set(remaining) == set(
+            db_session.scalars(select(Score.id).where(Score.player_id == pids[1]))
+        )
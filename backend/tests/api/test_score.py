@@ -9,6 +9,9 @@ import uuid
 
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from tests.conftest import async_engine, create_player, post_score
 
 
 class TestHealthEndpoint:
@@ -97,6 +100,72 @@ class TestPlayerEndpoint:
         # Should fail validation
         assert response.status_code == 422
 
+    def test_create_player_is_rate_limited(self, client: TestClient):
+        """POST /api/v1/players should return 429 past 10 requests a minute"""
+        statuses = [
+            client.post(
+                "/api/v1/players",
+                json={"id": str(uuid.uuid4()), "nickname": "TEST"},
+            ).status_code
+            for _ in range(11)
+        ]
+        assert statuses == [200] * 10 + [429]
+
+
+class TestWriteStatementCounts:
+    """Write endpoints should not read back what they just wrote"""
+
+    @staticmethod
+    def record(client: TestClient, path: str, payload: dict) -> list[str]:
+        """POST and return the SQL statements it ran"""
+        statements = []
+
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement.split()[0].upper())
+
+        event.listen(async_engine.sync_engine, "before_cursor_execute", count)
+        try:
+            response = client.post(path, json=payload)
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", count)
+        assert response.status_code == 200
+        return statements
+
+    def test_existing_player_is_one_statement(self, client: TestClient):
+        """Re-registering runs a single upsert"""
+        payload = {"id": str(uuid.uuid4()), "nickname": "ONE"}
+        first = self.record(client, "/api/v1/players", payload)
+        second = self.record(client, "/api/v1/players", payload)
+
+        # New player: upsert + player counter
+        assert first == ["INSERT", "INSERT"]
+        assert second == ["INSERT"]
+
+    def test_upsert_keeps_created_at(self, client: TestClient):
+        payload = {"id": str(uuid.uuid4()), "nickname": "KEEP"}
+        first = client.post("/api/v1/players", json=payload).json()
+        second = client.post("/api/v1/players", json=payload).json()
+
+        assert second["created_at"] == first["created_at"]
+        assert second["last_played_at"] > first["last_played_at"]
+
+    def test_create_score_does_not_select(self, client: TestClient):
+        """Player check + touch, score, best, rollups and counters only"""
+        pid = create_player(client, "NOSEL")
+        statements = self.record(
+            client,
+            "/api/v1/scores",
+            {
+                "player_id": pid,
+                "score": 100,
+                "level": 1,
+                "lines": 1,
+                "play_time_seconds": 30,
+            },
+        )
+
+        assert statements == ["UPDATE", "INSERT", "INSERT", "INSERT", "INSERT"]
+
 
 class TestCreateScoreEndpoint:
     """Score creation endpoint tests"""
@@ -104,9 +173,7 @@ class TestCreateScoreEndpoint:
     @pytest.fixture
     def player_id(self, client: TestClient) -> str:
         """Create a player for score tests"""
-        pid = str(uuid.uuid4())
-        client.post("/api/v1/players", json={"id": pid, "nickname": "TEST"})
-        return pid
+        return create_player(client, "TEST")
 
     def test_create_score_returns_200(self, client: TestClient, player_id: str):
         """POST /api/v1/scores should return 200"""
@@ -200,33 +267,120 @@ class TestCreateScoreEndpoint:
         assert response.status_code == 422
 
 
+class TestBatchScoreEndpoint:
+    """Batch score submission endpoint tests"""
+
+    @pytest.fixture
+    def player_id(self, client: TestClient) -> str:
+        """Create a player for batch tests"""
+        return create_player(client, "BATCH")
+
+    @staticmethod
+    def score_item(player_id: str, score: int) -> dict:
+        """Build a score payload"""
+        return {
+            "player_id": player_id,
+            "score": score,
+            "level": 3,
+            "lines": 12,
+            "play_time_seconds": 90,
+        }
+
+    def test_batch_creates_all_scores(self, client: TestClient, player_id: str):
+        """POST /api/v1/scores/batch should save every item"""
+        items = [self.score_item(player_id, value) for value in (100, 200, 300)]
+        response = client.post("/api/v1/scores/batch", json={"scores": items})
+        assert response.status_code == 200
+
+        data = response.json()
+        assert data["created"] == 3
+        assert [r["status"] for r in data["results"]] == ["created"] * 3
+        assert [r["score"]["score"] for r in data["results"]] == [100, 200, 300]
+
+        history = client.get(f"/api/v1/scores/{player_id}").json()
+        assert sorted(s["score"] for s in history) == [100, 200, 300]
+
+    def test_batch_reports_unknown_players_per_item(
+        self, client: TestClient, player_id: str
+    ):
+        """Unknown players should fail only their own items"""
+        items = [
+            self.score_item(player_id, 100),
+            self.score_item(str(uuid.uuid4()), 200),
+            self.score_item(player_id, 300),
+        ]
+        response = client.post("/api/v1/scores/batch", json={"scores": items})
+        data = response.json()
+
+        assert data["created"] == 2
+        assert [r["index"] for r in data["results"]] == [0, 1, 2]
+        assert [r["status"] for r in data["results"]] == [
+            "created",
+            "player_not_found",
+            "created",
+        ]
+        assert data["results"][1]["score"] is None
+        assert data["results"][2]["score"]["score"] == 300
+
+    def test_batch_scores_appear_in_rankings(self, client: TestClient, player_id: str):
+        """Batched scores should be visible to the ranking endpoint"""
+        client.get("/api/v1/scores")  # build ranking index first
+        items = [self.score_item(player_id, value) for value in (500, 900)]
+        client.post("/api/v1/scores/batch", json={"scores": items})
+
+        data = client.get("/api/v1/scores").json()
+        assert [e["score"] for e in data["data"]] == [900, 500]
+        assert data["total"] == 2
+
+    def test_batch_uses_constant_statement_count(
+        self, client: TestClient, player_id: str
+    ):
+        """Batch size should not change the number of SQL statements"""
+        statements = []
+
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(async_engine.sync_engine, "before_cursor_execute", count)
+        try:
+            client.post(
+                "/api/v1/scores/batch",
+                json={"scores": [self.score_item(player_id, 1)]},
+            )
+            single = len(statements)
+            statements.clear()
+            client.post(
+                "/api/v1/scores/batch",
+                json={"scores": [self.score_item(player_id, i) for i in range(50)]},
+            )
+            assert len(statements) == single
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", count)
+
+    def test_batch_rejects_empty_list(self, client: TestClient):
+        """Empty batches should fail validation"""
+        response = client.post("/api/v1/scores/batch", json={"scores": []})
+        assert response.status_code == 422
+
+    def test_batch_validates_items(self, client: TestClient, player_id: str):
+        """Invalid items should fail validation for the whole batch"""
+        bad = self.score_item(player_id, 100) | {"level": 11}
+        response = client.post("/api/v1/scores/batch", json={"scores": [bad]})
+        assert response.status_code == 422
+
+
 class TestRankingEndpoint:
     """Ranking retrieval endpoint tests"""
 
     @pytest.fixture
     def setup_scores(self, client: TestClient):
         """Create multiple players and scores for ranking tests"""
-        players = []
-        for i in range(3):
-            pid = str(uuid.uuid4())
-            client.post(
-                "/api/v1/players", json={"id": pid, "nickname": f"PLAYER{i+1}"}
-            )
-            players.append(pid)
+        players = [create_player(client, f"PLAYER{i+1}") for i in range(3)]
 
         # Create scores with different values
         scores = [5000, 3000, 1000]
         for pid, score in zip(players, scores, strict=True):
-            client.post(
-                "/api/v1/scores",
-                json={
-                    "player_id": pid,
-                    "score": score,
-                    "level": 5,
-                    "lines": 20,
-                    "play_time_seconds": 180,
-                },
-            )
+            post_score(client, pid, score, 5, lines=20, play_time_seconds=180)
         return players
 
     def test_get_rankings_returns_200(self, client: TestClient):
@@ -279,19 +433,10 @@ class TestRankingEndpoint:
     def test_get_rankings_default_limit_10(self, client: TestClient):
         """GET /api/v1/scores should default to limit=10"""
         # Create 15 scores
+        # One player: player registration is limited to 10 per minute
+        pid = create_player(client, "P")
         for i in range(15):
-            pid = str(uuid.uuid4())
-            client.post("/api/v1/players", json={"id": pid, "nickname": f"P{i}"})
-            client.post(
-                "/api/v1/scores",
-                json={
-                    "player_id": pid,
-                    "score": i * 100,
-                    "level": 1,
-                    "lines": i,
-                    "play_time_seconds": 60,
-                },
-            )
+            post_score(client, pid, i * 100, lines=i, play_time_seconds=60)
 
         response = client.get("/api/v1/scores")
         data = response.json()
@@ -311,20 +456,17 @@ class TestPlayerScoresEndpoint:
     @pytest.fixture
     def player_with_scores(self, client: TestClient) -> str:
         """Create a player with multiple scores"""
-        pid = str(uuid.uuid4())
-        client.post("/api/v1/players", json={"id": pid, "nickname": "TESTER"})
+        pid = create_player(client, "TESTER")
 
         # Create 5 scores
         for i in range(5):
-            client.post(
-                "/api/v1/scores",
-                json={
-                    "player_id": pid,
-                    "score": (i + 1) * 1000,
-                    "level": i + 1,
-                    "lines": (i + 1) * 10,
-                    "play_time_seconds": (i + 1) * 60,
-                },
+            post_score(
+                client,
+                pid,
+                (i + 1) * 1000,
+                i + 1,
+                lines=(i + 1) * 10,
+                play_time_seconds=(i + 1) * 60,
             )
         return pid
 
@@ -0,0 +1,157 @@
+"""
+Worker Coherence Tests
+
+다른 워커가 저장한 점수를 공유 데이터 버전으로 감지해 인메모리 인덱스와 캐시를 갱신하는지 검증
+"""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.schemas.score import ScoreCreate
+from app.services.coherence import shared_version
+from app.services.etag import LeaderboardVersion, leaderboard_version
+from app.services.score import build_score_rows, insert_scores
+from tests.conftest import TestingAsyncSessionLocal, create_player, post_score
+
+
+def write_from_other_worker(player_id: str, nickname: str, score: int) -> None:
+    """Commit a score the way another worker process would
+
+    Only the database changes: this process's indexes, response cache and
+    ETag version never hear about it.
+    """
+
+    async def write() -> None:
+        rows = build_score_rows(
+            [
+                ScoreCreate(
+                    player_id=player_id,
+                    score=score,
+                    level=1,
+                    lines=1,
+                    play_time_seconds=30,
+                )
+            ]
+        )
+        async with TestingAsyncSessionLocal() as db:
+            await insert_scores(db, rows, {player_id: nickname})
+            await db.commit()
+
+    asyncio.run(write())
+
+
+class TestWorkerCoherence:
+    """Cross-worker data version tests"""
+
+    @pytest.fixture(autouse=True)
+    def coherence(self, monkeypatch):
+        monkeypatch.setattr(shared_version, "enabled", True)
+        monkeypatch.setattr(shared_version, "check_interval", 0)
+
+    @pytest.fixture
+    def player_id(self, client: TestClient) -> str:
+        return create_player(client, "WORKER")
+
+    def test_rankings_see_other_workers_scores(
+        self, client: TestClient, player_id: str
+    ):
+        """A score written elsewhere shows up on the next ranking read"""
+        post_score(client, player_id, 100)
+        first = client.get("/api/v1/scores")
+        assert [e["score"] for e in first.json()["data"]] == [100]
+
+        write_from_other_worker(player_id, "WORKER", 500)
+
+        second = client.get("/api/v1/scores")
+        assert [e["score"] for e in second.json()["data"]] == [500, 100]
+        assert second.json()["total"] == 2
+        assert second.headers["etag"] != first.headers["etag"]
+        revalidated = client.get(
+            "/api/v1/scores", headers={"If-None-Match": first.headers["etag"]}
+        )
+        assert revalidated.status_code == 200
+
+    def test_history_and_rank_see_other_workers_scores(
+        self, client: TestClient, player_id: str
+    ):
+        post_score(client, player_id, 100)
+        client.get(f"/api/v1/scores/{player_id}")
+        client.get(f"/api/v1/players/{player_id}/rank")
+
+        write_from_other_worker(player_id, "WORKER", 900)
+
+        history = client.get(f"/api/v1/scores/{player_id}").json()
+        assert [s["score"] for s in history] == [900, 100]
+        rank = client.get(f"/api/v1/players/{player_id}/rank").json()
+        assert rank["best"]["score"] == 900
+        assert rank["total"] == 2
+
+    def test_own_writes_do_not_drop_local_state(
+        self, client: TestClient, player_id: str
+    ):
+        """Versions this worker committed itself are not foreign writes"""
+        client.get("/api/v1/scores")
+        post_score(client, player_id, 100)
+        post_score(client, player_id, 200)
+        data = client.get("/api/v1/scores").json()
+
+        assert [e["score"] for e in data["data"]] == [200, 100]
+        health = client.get("/health").json()
+        assert health["worker_coherence"]["refreshes"] == 0
+
+    def test_interleaved_foreign_write_is_detected_on_own_write(
+        self, client: TestClient, player_id: str
+    ):
+        """A gap in versions handed to this worker means someone else wrote"""
+        client.get("/api/v1/scores")
+        write_from_other_worker(player_id, "WORKER", 300)
+        post_score(client, player_id, 100)
+
+        assert client.get("/health").json()["worker_coherence"]["refreshes"] == 1
+        data = client.get("/api/v1/scores").json()
+        assert [e["score"] for e in data["data"]] == [300, 100]
+
+    def test_etag_does_not_depend_on_the_process(self):
+        """Two workers that saw the same data version issue the same tag"""
+        first, second = LeaderboardVersion(), LeaderboardVersion()
+        first.bump()
+        assert first.etag("2026-01-01") != second.etag("2026-01-01")
+
+        first.observe_shared(7)
+        second.observe_shared(7)
+        assert first.etag("2026-01-01") == second.etag("2026-01-01")
+        second.observe_shared(8)
+        assert first.etag() != second.etag()
+
+    def test_other_workers_etag_revalidates(
+        self, client: TestClient, player_id: str, monkeypatch
+    ):
+        """A tag issued by one worker gets a 304 from another"""
+        post_score(client, player_id, 100)
+        etag = client.get("/api/v1/scores").headers["etag"]
+
+        # A freshly started worker: its own epoch and version, nothing seen
+        monkeypatch.setattr(leaderboard_version, "epoch", "otherpid")
+        monkeypatch.setattr(leaderboard_version, "value", 0)
+        shared_version.reset()
+
+        revalidated = client.get("/api/v1/scores", headers={"If-None-Match": etag})
+        assert revalidated.status_code == 304
+        assert revalidated.headers["etag"] == etag
+
+    def test_check_interval_limits_version_reads(
+        self, client: TestClient, player_id: str, monkeypatch
+    ):
+        monkeypatch.setattr(shared_version, "check_interval", 3600)
+        for _ in range(5):
+            client.get("/api/v1/scores")
+        assert client.get("/health").json()["worker_coherence"]["checks"] == 1
+
+    def test_disabled_by_default_in_single_worker_mode(
+        self, client: TestClient, monkeypatch
+    ):
+        monkeypatch.setattr(shared_version, "enabled", False)
+        client.get("/api/v1/scores")
+        assert "worker_coherence" not in client.get("/health").json()
@@ -0,0 +1,196 @@
+"""
+Write-Behind Buffer Tests
+
+점수 그룹 커밋 버퍼의 즉시 응답, 배치 플러시, 종료 시 드레인 동작 검증
+"""
+
+import asyncio
+import logging
+import uuid
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.config import Settings
+from app.models.score import Score
+from app.services import write_buffer
+from app.services.write_buffer import score_buffer
+from tests.conftest import (
+    TestingAsyncSessionLocal,
+    create_player_async,
+    post_score_async,
+)
+
+
+def stored_scores(db: Session) -> int:
+    """Count score rows committed to the database"""
+    db.rollback()
+    return db.scalar(select(func.count()).select_from(Score))
+
+
+class TestScoreWriteBuffer:
+    """Write-behind score buffer tests"""
+
+    @pytest.fixture
+    async def player_id(self, async_client: AsyncClient) -> str:
+        """Create a player before the buffer starts"""
+        return await create_player_async(async_client, "WB")
+
+    @pytest.fixture
+    async def write_behind(self, async_client: AsyncClient, monkeypatch):
+        """Run the score buffer against the test database"""
+        monkeypatch.setattr(score_buffer, "flush_interval", 60.0)
+        monkeypatch.setattr(score_buffer, "max_rows", 5)
+        monkeypatch.setattr(score_buffer, "max_size", score_buffer.max_size)
+        monkeypatch.setattr(score_buffer, "retry_delay", 0.01)
+        score_buffer.start(TestingAsyncSessionLocal)
+        yield score_buffer
+        await score_buffer.stop()
+
+    async def test_returns_generated_id_before_commit(
+        self, async_client: AsyncClient, db_session: Session, player_id, write_behind
+    ):
+        """Queued scores should be answered before they reach the database"""
+        data = await post_score_async(async_client, player_id, 700)
+        uuid.UUID(data["id"])
+        assert data["score"] == 700
+
+        assert stored_scores(db_session) == 0
+        assert write_behind.metrics.queue_depth == 1
+
+    async def test_flushes_when_max_rows_waiting(
+        self, async_client: AsyncClient, db_session: Session, player_id, write_behind
+    ):
+        """Reaching max_rows should trigger one group commit"""
+        for value in range(5):
+            await post_score_async(async_client, player_id, value)
+
+        for _ in range(100):
+            if write_behind.metrics.flushes:
+                break
+            await asyncio.sleep(0.01)
+
+        assert write_behind.metrics.flushes == 1
+        assert write_behind.metrics.rows_flushed == 5
+        assert stored_scores(db_session) == 5
+
+    async def test_flushes_after_interval(
+        self, async_client: AsyncClient, db_session: Session, player_id, write_behind
+    ):
+        """A partial batch should be flushed once the interval elapses"""
+        write_behind.flush_interval = 0.05
+        await post_score_async(async_client, player_id, 1)
+        await asyncio.sleep(0.2)
+
+        assert write_behind.metrics.rows_flushed == 1
+        assert stored_scores(db_session) == 1
+
+    async def test_stop_drains_queue(
+        self, async_client: AsyncClient, db_session: Session, player_id, write_behind
+    ):
+        """Stopping the buffer should commit every accepted score"""
+        ids = []
+        for value in range(3):
+            ids.append((await post_score_async(async_client, player_id, value))["id"])
+
+        await write_behind.stop()
+
+        assert not write_behind.running
+        assert stored_scores(db_session) == 3
+        stored_ids = set(db_session.scalars(select(Score.id)))
+        assert stored_ids == set(ids)
+
+    async def test_flushed_scores_reach_rankings(
+        self, async_client: AsyncClient, player_id, write_behind
+    ):
+        """Rankings should include scores once they are flushed"""
+        await async_client.get("/api/v1/scores")  # build ranking index
+        await post_score_async(async_client, player_id, 4242)
+        await write_behind.stop()
+
+        data = (await async_client.get("/api/v1/scores")).json()
+        assert data["total"] == 1
+        assert data["data"][0]["score"] == 4242
+
+    async def test_full_queue_falls_back_to_sync_write(
+        self, async_client: AsyncClient, db_session: Session, player_id, write_behind
+    ):
+        """When the queue is full the score should be committed directly"""
+        write_behind.max_size = 0
+        await post_score_async(async_client, player_id, 9)
+        assert stored_scores(db_session) == 1
+        assert write_behind.metrics.queue_depth == 0
+
+    async def test_failed_flush_is_retried(
+        self,
+        async_client: AsyncClient,
+        db_session: Session,
+        player_id,
+        write_behind,
+        monkeypatch,
+    ):
+        """A transient failure should not lose acknowledged scores"""
+        real_insert = write_buffer.insert_scores
+        failures = iter([True, True])
+
+        async def flaky_insert(*args, **kwargs):
+            if next(failures, False):
+                raise RuntimeError("database is locked")
+            return await real_insert(*args, **kwargs)
+
+        monkeypatch.setattr(write_buffer, "insert_scores", flaky_insert)
+        await post_score_async(async_client, player_id, 5)
+        await write_behind.stop()
+
+        assert write_behind.metrics.retries == 2
+        assert write_behind.metrics.failed_rows == 0
+        assert stored_scores(db_session) == 1
+
+    async def test_exhausted_retries_log_lost_scores(
+        self, async_client: AsyncClient, player_id, write_behind, monkeypatch, caplog
+    ):
+        """Giving up should name every dropped score"""
+
+        async def failing_insert(*args, **kwargs):
+            raise RuntimeError("disk I/O error")
+
+        monkeypatch.setattr(write_buffer, "insert_scores", failing_insert)
+        accepted = await post_score_async(async_client, player_id, 5)
+        with caplog.at_level(logging.ERROR, logger="app.services.write_buffer"):
+            await write_behind.stop()
+
+        assert write_behind.metrics.failed_rows == 1
+        assert accepted["id"] in caplog.records[-1].getMessage()
+
+    async def test_publish_failure_keeps_flushing(
+        self,
+        async_client: AsyncClient,
+        db_session: Session,
+        player_id,
+        write_behind,
+        monkeypatch,
+    ):
+        """An error after commit should not stop the flush task"""
+        write_behind.max_rows = 1
+
+        def failing_publish(*args, **kwargs):
+            raise RuntimeError("index corrupted")
+
+        monkeypatch.setattr(write_buffer, "publish_scores", failing_publish)
+        for value in range(2):
+            await post_score_async(async_client, player_id, value)
+            for _ in range(100):
+                if write_behind.metrics.rows_flushed > value:
+                    break
+                await asyncio.sleep(0.01)
+
+        assert write_behind.metrics.rows_flushed == 2
+        assert not write_behind._task.done()
+        assert stored_scores(db_session) == 2
+
+
+def test_rejects_unknown_write_mode():
+    with pytest.raises(ValueError):
+        Settings(score_write_mode="write-behind")
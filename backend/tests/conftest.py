@@ -1,53 +1,219 @@
+import os
+import tempfile
+
+# Test database (file-backed so the sync and async engines share it). Set
+# before the app is imported so its engines and schema check use it too.
+_db_fd, TEST_DB_PATH = tempfile.mkstemp(prefix="tetris-test-", suffix=".db")
+os.close(_db_fd)
+os.environ["DATABASE_URL"] = f"sqlite:///{TEST_DB_PATH}"
+
+import random
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import Engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
 
-from app.database import Base, get_db
+from app.database import Base, create_async_db_engine, engine, get_async_db
 from app.main import app
+from app.migrations import migrate, schema_metadata
+from app.models.score import Player, Score
+from app.services.counters import rebuild_counters
+from app.services.distribution import rebuild_sketches
+from app.services.metrics import fingerprint
+from app.services.player_best import rebuild_player_best
+from app.services.rate_limit import limiter
 
-# Test database
-SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
-)
+# NullPool: TestClient and async tests each run their own event loop
+async_engine = create_async_db_engine(poolclass=NullPool)
 
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingAsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
 
 
-def override_get_db():
+async def override_get_async_db():
     """Override database dependency for testing"""
-    db = TestingSessionLocal()
-    try:
+    async with TestingAsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
+
+
+def seed_scores(db: Session, count: int, seed: int = 42) -> list[str]:
+    """Insert players and scores directly, with plenty of score ties"""
+    rng = random.Random(seed)
+    base_time = datetime(2026, 1, 1)
+    player_ids = []
+    for i in range(10):
+        pid = str(uuid.uuid4())
+        db.add(Player(id=pid, nickname=f"P{i}"))
+        player_ids.append(pid)
+    for _ in range(count):
+        db.add(
+            Score(
+                id=str(uuid.uuid4()),
+                player_id=rng.choice(player_ids),
+                score=rng.randrange(0, 50) * 100,
+                level=rng.randint(1, 10),
+                lines=rng.randint(0, 200),
+                play_time_seconds=rng.randint(0, 3600),
+                created_at=base_time + timedelta(seconds=rng.randrange(0, count // 2)),
+            )
+        )
+    db.commit()
+    # Rows inserted behind the API's back: recompute the maintained tables
+    rebuild_counters(db)
+    rebuild_player_best(db)
+    rebuild_sketches(db)
+    return player_ids
+
+
+def score_body(player_id: str, score: int = 100, level: int = 1, **fields) -> dict:
+    """A valid POST /scores body; `fields` override lines / play time"""
+    return {
+        "player_id": player_id,
+        "score": score,
+        "level": level,
+        "lines": 1,
+        "play_time_seconds": 30,
+    } | fields
+
+
+def _ok(response) -> dict:
+    # A rejected setup request (404, 422, 429, ...) must fail the test
+    # rather than leave it asserting against an empty board
+    assert response.status_code == 200, f"{response.status_code}: {response.text}"
+    return response.json()
+
+
+def create_player(client: TestClient, nickname: str = "PLAYER") -> str:
+    """Create a player through the API; returns its id"""
+    player_id = str(uuid.uuid4())
+    _ok(client.post("/api/v1/players", json={"id": player_id, "nickname": nickname}))
+    return player_id
+
+
+def post_score(
+    client: TestClient, player_id: str, score: int = 100, level: int = 1, **fields
+) -> dict:
+    """Save a score through the API; returns the response body"""
+    return _ok(
+        client.post("/api/v1/scores", json=score_body(player_id, score, level, **fields))
+    )
+
+
+def post_batch(client: TestClient, scores: list[dict]) -> dict:
+    """Save score bodies through the batch endpoint; returns the response body"""
+    return _ok(client.post("/api/v1/scores/batch", json={"scores": scores}))
+
+
+async def create_player_async(client: AsyncClient, nickname: str = "PLAYER") -> str:
+    """`create_player` for the async client"""
+    player_id = str(uuid.uuid4())
+    _ok(
+        await client.post(
+            "/api/v1/players", json={"id": player_id, "nickname": nickname}
+        )
+    )
+    return player_id
+
+
+async def post_score_async(
+    client: AsyncClient, player_id: str, score: int = 100, level: int = 1, **fields
+) -> dict:
+    """`post_score` for the async client"""
+    return _ok(
+        await client.post(
+            "/api/v1/scores", json=score_body(player_id, score, level, **fields)
+        )
+    )
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """Remove the test database and its WAL files"""
+    engine.dispose()
+    for path in (TEST_DB_PATH, f"{TEST_DB_PATH}-wal", f"{TEST_DB_PATH}-shm"):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_limits():
+    """Start every test with empty rate limit counters"""
+    limiter.reset()
+    yield
 
 
 @pytest.fixture(scope="function")
 def db_session():
-    """Create a fresh database session for each test"""
-    Base.metadata.create_all(bind=engine)
+    """Create a fresh, migrated database session for each test"""
+    migrate(engine)
     db = TestingSessionLocal()
     try:
         yield db
     finally:
         db.close()
         Base.metadata.drop_all(bind=engine)
+        schema_metadata.drop_all(bind=engine)
 
 
 @pytest.fixture(scope="function")
 def client(db_session):
     """Create a test client with database override"""
-    app.dependency_overrides[get_db] = override_get_db
-    Base.metadata.create_all(bind=engine)
+    app.dependency_overrides[get_async_db] = override_get_async_db
 
     with TestClient(app) as test_client:
         yield test_client
 
-    Base.metadata.drop_all(bind=engine)
     app.dependency_overrides.clear()
+
+
+@pytest.fixture(scope="function")
+async def async_client(db_session):
+    """Create an async client sharing the test event loop"""
+    app.dependency_overrides[get_async_db] = override_get_async_db
+
+    async with app.router.lifespan_context(app):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            yield ac
+
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def query_budget():
+    """Fail when the statements run inside a block exceed a budget
+
+        with query_budget(2):
+            client.get("/api/v1/scores")
+
+    The block yields the statement fingerprints, listed in the failure
+    message so an N+1 pattern is easy to spot.
+    """
+
+    @contextmanager
+    def budget(max_statements: int):
+        statements: list[str] = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(fingerprint(statement))
+
+        event.listen(Engine, "after_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(Engine, "after_cursor_execute", record)
+        assert len(statements) <= max_statements, (
+            f"{len(statements)} statements, budget {max_statements}:\n"
+            + "\n".join(statements)
+        )
+
+    return budget
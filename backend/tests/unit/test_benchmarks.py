@@ -0,0 +1,78 @@
+"""
+Benchmark Suite Tests
+
+부하 벤치마크의 데이터 생성기와 백분위 계산이 올바른지 검증 (전체 부하 실행은 하지 않음)
+"""
+
+import random
+
+import httpx
+from sqlalchemy import func, select
+
+from app.config import Settings
+from app.database import create_sync_engine
+from app.models.counter import Counter
+from app.models.player_best import PlayerBest
+from app.models.score import Score
+from app.models.sketch import ScoreSketchBucket
+from benchmarks.load import Operations, percentile, summarize
+from benchmarks.seed import player_ids, seed
+
+
+class TestSeed:
+    def test_seeds_rows_and_maintained_tables(self, tmp_path):
+        url = f"sqlite:///{tmp_path / 'bench.db'}"
+        result = seed(url, players=50, scores=500)
+        assert (result["players"], result["scores"]) == (50, 500)
+
+        engine = create_sync_engine(Settings(database_url=url))
+        try:
+            with engine.connect() as connection:
+                assert connection.scalar(select(func.count()).select_from(Score)) == 500
+                assert connection.scalar(
+                    select(Counter.value).where(Counter.name == "scores")
+                ) == 500
+                ranked = connection.scalar(select(func.count()).select_from(PlayerBest))
+                assert 0 < ranked <= 50
+                assert connection.scalar(
+                    select(func.sum(ScoreSketchBucket.count)).where(
+                        ScoreSketchBucket.sketch == "all"
+                    )
+                ) == 500
+        finally:
+            engine.dispose()
+
+    def test_player_ids_are_deterministic(self):
+        assert player_ids(5, seed=3) == player_ids(5, seed=3)
+        assert player_ids(5, seed=3) != player_ids(5, seed=4)
+
+
+class TestPercentiles:
+    def test_nearest_rank(self):
+        values = [float(i) for i in range(1, 101)]
+        assert percentile(values, 50) == 50
+        assert percentile(values, 95) == 95
+        assert percentile(values, 99) == 99
+        assert percentile([7.0], 99) == 7
+        assert percentile([], 50) == 0
+
+    def test_summary_reports_milliseconds(self):
+        summary = summarize([0.001, 0.002, 0.003, 0.004], errors=1, seconds=2)
+        assert summary["requests"] == 4
+        assert summary["throughput_rps"] == 2.0
+        assert summary["p50_ms"] == 2.0
+        assert summary["p99_ms"] == 4.0
+
+
+class TestOperations:
+    async def test_players_are_used_only_once_created(self):
+        statuses = iter([429, 200])
+        transport = httpx.MockTransport(lambda request: httpx.Response(next(statuses)))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            ops = Operations(client, [])
+            rng = random.Random(1)
+
+            await ops.create_player(rng)
+            assert ops.player_ids == []
+            await ops.create_player(rng)
+            assert len(ops.player_ids) == 1
@@ -0,0 +1,95 @@
+"""
+Engine Factory Tests
+
+DATABASE_URL 설정에 따라 엔진 옵션과 SQLite PRAGMA가 적용되는지 검증
+"""
+
+import os
+import tempfile
+
+from sqlalchemy import text
+
+from app.config import Settings
+from app.database import (
+    async_database_url,
+    create_sync_engine,
+    engine_options,
+    sync_database_url,
+)
+
+
+def read_pragmas(config: Settings) -> dict:
+    engine = create_sync_engine(config)
+    try:
+        with engine.connect() as conn:
+            return {
+                name: conn.execute(text(f"PRAGMA {name}")).scalar()
+                for name in ("journal_mode", "synchronous", "busy_timeout", "cache_size")
+            }
+    finally:
+        engine.dispose()
+
+
+class TestDatabaseUrls:
+    """DATABASE_URL normalization tests"""
+
+    def test_postgres_scheme_is_normalized(self):
+        assert sync_database_url("postgres://u:p@db/tetris") == "postgresql://u:p@db/tetris"
+
+    def test_async_driver_is_added(self):
+        assert async_database_url("sqlite:///./tetris.db") == "sqlite+aiosqlite:///./tetris.db"
+        assert (
+            async_database_url("postgres://u:p@db/tetris")
+            == "postgresql+asyncpg://u:p@db/tetris"
+        )
+
+    def test_explicit_driver_is_kept(self):
+        url = "postgresql+psycopg://u:p@db/tetris"
+        assert async_database_url(url) == url
+
+
+class TestEngineFactory:
+    """Engine option and pragma tests"""
+
+    def test_server_database_gets_pool_settings(self):
+        config = Settings(db_pool_size=7, db_max_overflow=3, db_pool_recycle_seconds=60)
+        assert engine_options("postgresql://db/tetris", config) == {
+            "pool_size": 7,
+            "max_overflow": 3,
+            "pool_pre_ping": True,
+            "pool_recycle": 60,
+        }
+
+    def test_sqlite_pragmas_applied_on_connect(self):
+        fd, path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        try:
+            pragmas = read_pragmas(
+                Settings(
+                    database_url=f"sqlite:///{path}",
+                    sqlite_busy_timeout_ms=1234,
+                    sqlite_cache_size=-2048,
+                )
+            )
+            assert pragmas == {
+                "journal_mode": "wal",
+                "synchronous": 1,  # NORMAL
+                "busy_timeout": 1234,
+                "cache_size": -2048,
+            }
+        finally:
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+
+    def test_sqlite_tuning_can_be_disabled(self):
+        fd, path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        try:
+            pragmas = read_pragmas(
+                Settings(database_url=f"sqlite:///{path}", sqlite_tuning=False)
+            )
+            assert pragmas["journal_mode"] == "delete"
+            assert pragmas["synchronous"] == 2  # FULL
+        finally:
+            os.remove(path)
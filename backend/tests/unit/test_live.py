@@ -0,0 +1,83 @@
+"""
+Live Leaderboard Diff Tests
+
+상위 N 랭킹의 변경분(entered/moved/dropped) 계산과 SSE 이벤트 인코딩을 검증
+"""
+
+import json
+from datetime import datetime, timedelta
+
+from app.services.leaderboard import LeaderboardEntry
+from app.services.live import encode_event, leaderboard_diff
+
+BASE = datetime(2026, 3, 1)
+
+
+def entry(score_id: str, score: int, minutes: int = 0) -> LeaderboardEntry:
+    return LeaderboardEntry(
+        score=score,
+        created_at=BASE + timedelta(minutes=minutes),
+        nickname=score_id.upper(),
+        level=1,
+        lines=10,
+        score_id=score_id,
+    )
+
+
+class TestLeaderboardDiff:
+    """leaderboard_diff tests"""
+
+    def test_unchanged_top_has_no_diff(self):
+        top = [entry("a", 300), entry("b", 200)]
+        assert leaderboard_diff(top, list(top)) is None
+
+    def test_new_leader_enters_shifts_and_drops(self):
+        old = [entry("a", 300), entry("b", 200), entry("c", 100)]
+        new = [entry("d", 400), entry("a", 300), entry("b", 200)]
+
+        diff = leaderboard_diff(old, new)
+
+        assert [e["id"] for e in diff["entered"]] == ["d"]
+        assert diff["entered"][0]["rank"] == 1
+        assert diff["entered"][0]["player_nickname"] == "D"
+        assert diff["moved"] == [{"id": "a", "rank": 2}, {"id": "b", "rank": 3}]
+        assert diff["dropped"] == ["c"]
+
+    def test_entry_below_unmoved_leaders(self):
+        old = [entry("a", 300), entry("b", 100)]
+        new = [entry("a", 300), entry("c", 200), entry("b", 100)]
+
+        assert leaderboard_diff(old, new) == {
+            "entered": [
+                {
+                    "rank": 2,
+                    "id": "c",
+                    "player_nickname": "C",
+                    "score": 200,
+                    "level": 1,
+                    "lines": 10,
+                    "created_at": BASE,
+                }
+            ],
+            "moved": [{"id": "b", "rank": 3}],
+            "dropped": [],
+        }
+
+    def test_first_scores_all_enter(self):
+        diff = leaderboard_diff([], [entry("a", 1)])
+        assert [e["id"] for e in diff["entered"]] == ["a"]
+
+
+class TestEncodeEvent:
+    """SSE framing tests"""
+
+    def test_event_framing(self):
+        raw = encode_event("diff", 7, {"dropped": ["a"], "at": BASE})
+
+        assert raw.endswith(b"\n\n")
+        lines = raw.decode().splitlines()
+        assert lines[:2] == ["id: 7", "event: diff"]
+        assert json.loads(lines[2].removeprefix("data: ")) == {
+            "dropped": ["a"],
+            "at": "2026-03-01T00:00:00",
+        }
@@ -0,0 +1,99 @@
+"""
+Metrics Tests
+
+히스토그램/게이지 집계, SQL 지문 정규화, Prometheus 텍스트 형식과 계측 비용을 검증
+"""
+
+import time
+
+from app.services.metrics import Gauge, Histogram, fingerprint
+
+
+class TestHistogram:
+    """In-process histogram tests"""
+
+    def test_buckets_are_rendered_cumulative(self):
+        histogram = Histogram("work_seconds", "Work", ("kind",), (0.1, 1))
+        for value in (0.05, 0.1, 0.5, 3):
+            histogram.observe(value, "a")
+
+        lines = list(histogram.render())
+
+        assert lines == [
+            "# HELP work_seconds Work",
+            "# TYPE work_seconds histogram",
+            'work_seconds_bucket{kind="a",le="0.1"} 2',
+            'work_seconds_bucket{kind="a",le="1.0"} 3',
+            'work_seconds_bucket{kind="a",le="+Inf"} 4',
+            'work_seconds_sum{kind="a"} 3.65',
+            'work_seconds_count{kind="a"} 4',
+        ]
+
+    def test_label_values_are_escaped(self):
+        histogram = Histogram("q", "Q", ("statement",), (1,))
+        histogram.observe(0.5, 'SELECT "a\\b"\n')
+
+        assert 'q_count{statement="SELECT \\"a\\\\b\\"\\n"} 1' in list(histogram.render())
+
+    def test_observe_costs_microseconds(self):
+        histogram = Histogram("fast", "Fast", ("route", "status"), (0.001, 0.01, 0.1))
+        rounds = 100_000
+
+        started = time.perf_counter()
+        for i in range(rounds):
+            histogram.observe(i * 1e-6, "/scores", 200)
+        per_call = (time.perf_counter() - started) / rounds
+
+        assert per_call < 20e-6
+
+
+class TestGauge:
+    """In-process gauge tests"""
+
+    def test_inc_and_dec_per_label(self):
+        gauge = Gauge("busy", "Busy", ("method",))
+        gauge.inc("GET")
+        gauge.inc("GET")
+        gauge.inc("POST")
+        gauge.dec("GET")
+
+        assert list(gauge.render())[2:] == ['busy{method="GET"} 1', 'busy{method="POST"} 1']
+
+
+class TestFingerprint:
+    """SQL statement normalization tests"""
+
+    def test_whitespace_and_literals_are_normalized(self):
+        assert (
+            fingerprint("SELECT *\n  FROM score\tWHERE score > 100 AND id = 'x''y'")
+            == "SELECT * FROM score WHERE score > ? AND id = ?"
+        )
+
+    def test_in_lists_collapse_regardless_of_length(self):
+        short = fingerprint("SELECT id FROM player WHERE id IN (?, ?)")
+        long = fingerprint("SELECT id FROM player WHERE id IN (?, ?, ?, ?, ?)")
+
+        assert short == long == "SELECT id FROM player WHERE id IN (?)"
+
+    def test_multi_row_values_collapse(self):
+        one = fingerprint("INSERT INTO score (id, score) VALUES (?, ?)")
+        many = fingerprint("INSERT INTO score (id, score) VALUES (?, ?), (?, ?), (?, ?)")
+
+        assert one == many == "INSERT INTO score (id, score) VALUES (?)"
+
+    def test_postgres_placeholders_are_normalized(self):
+        """asyncpg's numbered placeholders fold like qmark ones"""
+        short = fingerprint("SELECT id FROM player WHERE id IN ($1, $2) AND n > $3")
+        long = fingerprint("SELECT id FROM player WHERE id IN ($1, $2, $3, $4) AND n > $5")
+        many = fingerprint("INSERT INTO score (id, score) VALUES ($1, $2), ($3, $4)")
+
+        assert short == long == "SELECT id FROM player WHERE id IN (?) AND n > ?"
+        assert many == "INSERT INTO score (id, score) VALUES (?)"
+        assert fingerprint("SELECT id::text FROM t WHERE a = %(a_1)s AND b = :b") == (
+            "SELECT id::text FROM t WHERE a = ? AND b = ?"
+        )
+
+    def test_identifiers_with_digits_are_kept(self):
+        assert fingerprint("SELECT max(version) AS max_1 FROM t2") == (
+            "SELECT max(version) AS max_1 FROM t2"
+        )
@@ -0,0 +1,242 @@
+"""
+Schema Migration Tests
+
+마이그레이션이 새 DB와 기존 DB 모두에 인덱스를 만들고, 기존 점수로 파생 테이블을 채우며
+버전을 기록하는지 검증
+"""
+
+import os
+import tempfile
+import uuid
+from datetime import UTC, datetime
+
+import pytest
+from sqlalchemy import Engine, create_engine, func, insert, inspect, select, text
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.migrations import (
+    SCHEMA_VERSION,
+    SchemaVersionError,
+    check_schema_version,
+    migrate,
+    v0001_initial_schema,
+)
+from app.models.counter import Counter
+from app.models.player_best import PlayerBest
+from app.models.rollup import ScoreRollup
+from app.models.score import Player, Score
+from app.models.sketch import ScoreSketchBucket
+from app.services.counters import rebuild_counters, rollup_counter
+from app.services.distribution import rebuild_sketches
+from app.services.player_best import rebuild_player_best
+
+
+@pytest.fixture
+def temp_engine():
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    engine = create_engine(f"sqlite:///{path}")
+    yield engine
+    engine.dispose()
+    os.remove(path)
+
+
+def score_indexes(engine: Engine) -> set[str]:
+    return {index["name"] for index in inspect(engine).get_indexes("score")}
+
+
+def derived_tables(db: Session) -> tuple:
+    """Counters (without rollup periods), player_best and sketch rows"""
+    counters = {
+        name: value
+        for name, value in db.execute(select(Counter.name, Counter.value))
+        if not name.startswith("rollup:")
+    }
+    best = sorted(tuple(row) for row in db.execute(select(PlayerBest.__table__)))
+    sketches = sorted(tuple(row) for row in db.execute(select(ScoreSketchBucket.__table__)))
+    return counters, best, sketches
+
+
+def query_plan(engine: Engine, sql: str) -> str:
+    with engine.connect() as conn:
+        return " ".join(row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}")))
+
+
+class TestMigrations:
+    """Migration runner tests"""
+
+    def test_fresh_database(self, temp_engine: Engine):
+        applied = migrate(temp_engine)
+
+        assert [m.version for m in applied] == list(range(1, SCHEMA_VERSION + 1))
+        assert check_schema_version(temp_engine) == SCHEMA_VERSION
+        assert {"idx_score_score_desc", "idx_score_player_created"} <= score_indexes(
+            temp_engine
+        )
+        # Re-running is a no-op
+        assert migrate(temp_engine) == []
+
+    def test_migrated_schema_matches_models(self, temp_engine: Engine):
+        """Frozen migrations end up at the tables and indexes the models declare"""
+        migrate(temp_engine)
+        inspector = inspect(temp_engine)
+
+        for name, table in Base.metadata.tables.items():
+            assert {c["name"] for c in inspector.get_columns(name)} == set(table.c.keys())
+            assert {i["name"] for i in inspector.get_indexes(name)} == {
+                index.name for index in table.indexes
+            }
+
+    def test_unversioned_database_is_adopted(self, temp_engine: Engine):
+        """A baseline database (player and score only) gets every table filled"""
+        v0001_initial_schema.metadata.create_all(
+            temp_engine,
+            tables=[v0001_initial_schema.player, v0001_initial_schema.score],
+        )
+        now = datetime.now(UTC).replace(tzinfo=None)
+        with temp_engine.begin() as conn:
+            conn.execute(
+                insert(v0001_initial_schema.player),
+                [
+                    {"id": pid, "nickname": pid.upper(), "created_at": now, "last_played_at": now}
+                    for pid in ("p1", "p2", "p3")
+                ],
+            )
+            conn.execute(
+                insert(v0001_initial_schema.score),
+                [
+                    {
+                        "id": str(uuid.uuid4()),
+                        "player_id": "p1" if value % 3 else "p2",
+                        "score": value * 10,
+                        "level": value % 10 + 1,
+                        "lines": value,
+                        "play_time_seconds": 60,
+                        # The last few fall in the live day / week leaderboards
+                        "created_at": now if value >= 97 else datetime(2026, 1, 1),
+                    }
+                    for value in range(100)
+                ],
+            )
+
+        with pytest.raises(SchemaVersionError, match="python -m app.cli migrate"):
+            check_schema_version(temp_engine)
+
+        migrate(temp_engine)
+
+        assert check_schema_version(temp_engine) == SCHEMA_VERSION
+        assert {"idx_score_score_desc", "idx_score_player_created"} <= score_indexes(
+            temp_engine
+        )
+        with Session(temp_engine) as db:
+            migrated = derived_tables(db)
+            rebuild_counters(db)
+            rebuild_player_best(db)
+            rebuild_sketches(db)
+            assert derived_tables(db) == migrated
+
+            counters = dict(db.execute(select(Counter.name, Counter.value)).all())
+            assert counters["scores"] == 100
+            assert counters["players"] == 3
+            assert counters["ranked_players"] == 2
+            assert counters[rollup_counter("day", now.date())] == 3
+            assert db.scalar(select(func.count()).select_from(ScoreRollup)) == 6
+
+    def test_player_totals_are_added_and_backfilled(self, temp_engine: Engine):
+        """A version 4 player_best gets total columns summed from history"""
+        migrate(temp_engine)
+        with temp_engine.begin() as conn:
+            for column in ("total_score", "total_lines", "total_play_time_seconds"):
+                conn.execute(text(f"ALTER TABLE player_best DROP COLUMN {column}"))
+            conn.execute(text("DELETE FROM schema_version WHERE version = 5"))
+            conn.execute(insert(Player).values(id="p1", nickname="OLD"))
+            conn.execute(
+                insert(Score),
+                [
+                    {
+                        "id": str(uuid.uuid4()),
+                        "player_id": "p1",
+                        "score": value,
+                        "level": 1,
+                        "lines": value // 10,
+                        "play_time_seconds": 60,
+                        "created_at": datetime(2026, 1, 1),
+                    }
+                    for value in (100, 250, 400)
+                ],
+            )
+            conn.execute(
+                text(
+                    "INSERT INTO player_best (player_id, nickname, score_id, best_score, "
+                    "level, lines, achieved_at, games_played) "
+                    "VALUES ('p1', 'OLD', 's', 400, 1, 40, '2026-01-01', 3)"
+                )
+            )
+
+        assert [m.version for m in migrate(temp_engine)] == [5]
+
+        with temp_engine.connect() as conn:
+            assert conn.execute(
+                text(
+                    "SELECT total_score, total_lines, total_play_time_seconds "
+                    "FROM player_best"
+                )
+            ).one() == (750, 75, 180)
+
+    def test_existing_sketch_rows_are_replaced(self, temp_engine: Engine):
+        """Version 4 rebuilds a score_sketch_bucket that already has rows"""
+        migrate(temp_engine)
+        with temp_engine.begin() as conn:
+            conn.execute(text("DELETE FROM schema_version WHERE version >= 4"))
+            conn.execute(insert(Player).values(id="p1", nickname="OLD"))
+            conn.execute(
+                insert(Score),
+                [
+                    {
+                        "id": str(uuid.uuid4()),
+                        "player_id": "p1",
+                        "score": value,
+                        "level": 1,
+                        "lines": 1,
+                        "play_time_seconds": 60,
+                        "created_at": datetime(2026, 1, 1),
+                    }
+                    for value in (100, 100, 5000)
+                ],
+            )
+        with Session(temp_engine) as db:
+            rebuild_sketches(db)
+            expected = derived_tables(db)[2]
+            # A worker checkpointed part of the history before migrate ran
+            db.execute(text("UPDATE score_sketch_bucket SET count = 1"))
+            db.commit()
+
+        assert [m.version for m in migrate(temp_engine)] == [4, 5]
+
+        with Session(temp_engine) as db:
+            assert derived_tables(db)[2] == expected
+
+    def test_read_paths_use_indexes(self, temp_engine: Engine):
+        """Rankings and history no longer scan and sort the score table"""
+        migrate(temp_engine)
+
+        ranking = query_plan(
+            temp_engine,
+            "SELECT * FROM score ORDER BY score DESC, created_at, id LIMIT 10",
+        )
+        history = query_plan(
+            temp_engine,
+            "SELECT * FROM score WHERE player_id = 'p1' "
+            "ORDER BY created_at DESC LIMIT 10",
+        )
+
+        export = query_plan(
+            temp_engine,
+            "SELECT * FROM score WHERE created_at > '2026-01-01' ORDER BY created_at, id",
+        )
+
+        assert "idx_score_score_desc" in ranking
+        assert "idx_score_player_created" in history
+        assert "idx_score_created" in export
+        assert "TEMP B-TREE" not in ranking + history + export
@@ -0,0 +1,70 @@
+"""
+Score Rank Index Tests
+
+Fenwick 트리 기반 점수 순위 인덱스가 정확한 개수를 반환하는지 검증
+"""
+
+import random
+
+from app.services.rank_index import FenwickTree, ScoreRankIndex
+
+
+class TestFenwickTree:
+    """Binary indexed tree tests"""
+
+    def test_prefix_sums_match_naive_counts(self):
+        """prefix_sum should equal summing the counts directly"""
+        rng = random.Random(7)
+        tree = FenwickTree(50)
+        counts = [0] * 50
+        for _ in range(500):
+            pos = rng.randrange(50)
+            tree.add(pos)
+            counts[pos] += 1
+
+        for pos in range(50):
+            assert tree.prefix_sum(pos) == sum(counts[: pos + 1])
+
+    def test_prefix_sum_clamps_to_size(self):
+        """Positions past the end should cover the whole tree"""
+        tree = FenwickTree(4)
+        tree.add(3, 5)
+        assert tree.prefix_sum(100) == 5
+
+
+class TestScoreRankIndex:
+    """Order-statistic index tests"""
+
+    def make_index(self, scores: list[int]) -> ScoreRankIndex:
+        index = ScoreRankIndex(max_score=9_999_999, bucket_width=64)
+        index.loaded = True
+        for score in scores:
+            index.add(score)
+        return index
+
+    def test_count_above_matches_exact_answer(self):
+        """count_above should equal counting greater scores directly"""
+        rng = random.Random(11)
+        scores = [rng.randrange(0, 200_000) for _ in range(2000)] + [0, 9_999_999]
+        index = self.make_index(scores)
+
+        for probe in [*rng.sample(scores, 100), 0, 63, 64, 9_999_999]:
+            assert index.count_above(probe) == sum(s > probe for s in scores)
+
+    def test_ties_are_not_counted_above(self):
+        """Equal scores should not count as higher"""
+        index = self.make_index([500, 500, 500, 900])
+        assert index.count_above(500) == 1
+        assert index.count_above(900) == 0
+        assert index.total == 4
+
+    def test_only_occupied_buckets_allocate_leaves(self):
+        """Memory should follow occupied buckets, not the score range"""
+        index = self.make_index([1, 2, 3, 5_000_000])
+        assert len(index._leaves) == 2
+
+    def test_add_before_load_is_ignored(self):
+        """Scores before the first load are picked up by the load itself"""
+        index = ScoreRankIndex()
+        index.add(100)
+        assert index.total == 0
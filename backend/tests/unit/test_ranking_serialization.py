@@ -0,0 +1,35 @@
+"""
+Ranking Serialization Tests
+
+랭킹 응답 직렬화 빠른 경로가 응답 모델과 같은 바이트를 만드는지 검증
+(속도 비교는 `python -m benchmarks.ranking_serialization`)
+"""
+
+import pytest
+
+from app.routes.score import render_ranking_page
+from app.schemas.score import RankingResponse
+from benchmarks.ranking_serialization import (
+    RankingResponseAdapter,
+    make_entries,
+    model_path,
+)
+
+
+class TestRankingSerialization:
+    """Fast ranking encoder tests"""
+
+    @pytest.mark.parametrize("first_rank", [1, 101])
+    def test_bytes_match_response_model(self, first_rank: int):
+        entries = make_entries(50)
+        fast = render_ranking_page(entries, first_rank, 5000, "abc")
+        assert fast == model_path(entries, first_rank)
+
+    @pytest.mark.parametrize("limit", [10, 100, 1000])
+    def test_bytes_match_at_page_sizes(self, limit: int):
+        entries = make_entries(limit, seed=limit)
+        assert render_ranking_page(entries, 1, 5000, "abc") == model_path(entries, 1)
+
+    def test_empty_last_page(self):
+        expected = RankingResponseAdapter.dump_json(RankingResponse(data=[], total=0))
+        assert render_ranking_page([], 1, 0, None) == expected
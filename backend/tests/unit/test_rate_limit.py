@@ -0,0 +1,286 @@
+"""
+Rate Limit Tests
+
+토큰 버킷 전략, 키 수 제한, 여러 프로세스가 공유하는 SQLite 저장소를 검증
+"""
+
+import multiprocessing
+import sqlite3
+import threading
+import uuid
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from limits import parse
+from limits.errors import ConfigurationError
+from limits.storage import MemoryStorage, storage_from_string
+
+from app.config import Settings
+from app.services.rate_limit import (
+    MemoryBucketStorage,
+    SQLiteBucketStorage,
+    TokenBucketRateLimiter,
+    TokenBucketStorage,
+    create_limiter,
+)
+
+LIMIT = parse("10/minute")  # one token every 6 seconds
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def storage(request, tmp_path):
+    clock = FakeClock()
+    if request.param == "memory":
+        store = MemoryBucketStorage(clock=clock)
+    else:
+        store = SQLiteBucketStorage(
+            f"bucket+sqlite:///{tmp_path / 'limits.db'}", clock=clock
+        )
+    return store
+
+
+class TestTokenBucket:
+    def test_allows_burst_up_to_limit_then_denies(self, storage):
+        limiter = TokenBucketRateLimiter(storage)
+        assert [limiter.hit(LIMIT, "a") for _ in range(12)] == [True] * 10 + [False] * 2
+
+    def test_refills_one_token_per_interval(self, storage):
+        limiter = TokenBucketRateLimiter(storage)
+        for _ in range(10):
+            limiter.hit(LIMIT, "a")
+        storage.clock.now += 5.9
+        assert not limiter.hit(LIMIT, "a")
+        storage.clock.now += 0.1
+        assert limiter.hit(LIMIT, "a")
+        assert not limiter.hit(LIMIT, "a")
+
+    def test_denied_hits_do_not_consume(self, storage):
+        limiter = TokenBucketRateLimiter(storage)
+        for _ in range(50):
+            limiter.hit(LIMIT, "a")
+        storage.clock.now += 60
+        assert [limiter.hit(LIMIT, "a") for _ in range(11)] == [True] * 10 + [False]
+
+    def test_keys_are_independent(self, storage):
+        limiter = TokenBucketRateLimiter(storage)
+        for _ in range(10):
+            limiter.hit(LIMIT, "a")
+        assert not limiter.hit(LIMIT, "a")
+        assert limiter.hit(LIMIT, "b")
+
+    def test_window_stats_and_test(self, storage):
+        limiter = TokenBucketRateLimiter(storage)
+        assert limiter.get_window_stats(LIMIT, "a").remaining == 10
+        for _ in range(4):
+            limiter.hit(LIMIT, "a")
+        stats = limiter.get_window_stats(LIMIT, "a")
+        assert stats.remaining == 6
+        assert stats.reset_time == pytest.approx(storage.clock.now + 24)
+        assert limiter.test(LIMIT, "a", cost=6)
+        assert not limiter.test(LIMIT, "a", cost=7)
+
+    def test_clear_and_reset(self, storage):
+        limiter = TokenBucketRateLimiter(storage)
+        for _ in range(10):
+            limiter.hit(LIMIT, "a")
+        limiter.clear(LIMIT, "a")
+        assert limiter.hit(LIMIT, "a")
+        storage.reset()
+        assert limiter.get_window_stats(LIMIT, "a").remaining == 10
+
+    def test_rejects_counter_storage(self):
+        with pytest.raises(ConfigurationError):
+            TokenBucketRateLimiter(MemoryStorage())
+
+
+class TestKeyEviction:
+    def test_memory_storage_evicts_least_recently_used(self):
+        store = MemoryBucketStorage(max_keys=3)
+        for key in "abcd":
+            store.acquire(key, 1, 10)
+        store.acquire("b", 1, 10)
+        store.acquire("e", 1, 10)
+        assert [key for key in "abcde" if store.peek(key) is not None] == [
+            "b",
+            "d",
+            "e",
+        ]
+
+    def test_sqlite_sweep_drops_full_buckets(self, tmp_path):
+        clock = FakeClock()
+        store = SQLiteBucketStorage(
+            f"bucket+sqlite:///{tmp_path / 'limits.db'}", clock=clock
+        )
+        store.acquire("idle", 1, 10)
+        clock.now += 5
+        store.acquire("busy", 10, 10)
+        store.sweep()
+        assert store.peek("idle") is None
+        assert store.peek("busy") is not None
+
+    def test_sqlite_sweep_caps_key_count(self, tmp_path):
+        clock = FakeClock()
+        store = SQLiteBucketStorage(
+            f"bucket+sqlite:///{tmp_path / 'limits.db'}",
+            clock=clock,
+            max_keys=5,
+            sweep_interval=20,
+        )
+        for i in range(40):
+            clock.now += 0.01
+            store.acquire(f"k{i}", 10, 10)
+        # Swept at the 20th and 40th check; the emptiest buckets survive
+        assert store.key_count() == 5
+        assert store.peek("k39") is not None
+        assert store.peek("k0") is None
+
+
+class TestLimiterConfiguration:
+    def test_bucket_storages_are_registered(self, tmp_path):
+        assert isinstance(storage_from_string("bucket+memory://"), MemoryBucketStorage)
+        store = storage_from_string(f"bucket+sqlite:///{tmp_path / 'limits.db'}")
+        assert isinstance(store, SQLiteBucketStorage)
+
+    def test_sqlite_storage_needs_a_path(self):
+        with pytest.raises(ConfigurationError):
+            SQLiteBucketStorage("bucket+sqlite://")
+
+    def test_create_limiter_from_settings(self, tmp_path):
+        limiter = create_limiter(
+            Settings(
+                rate_limit_storage_uri=f"bucket+sqlite:///{tmp_path / 'limits.db'}",
+                rate_limit_max_keys=7,
+            )
+        )
+        assert isinstance(limiter._limiter, TokenBucketRateLimiter)
+        assert limiter._storage.max_keys == 7
+
+    def test_rate_limiting_can_be_switched_off(self):
+        assert not create_limiter(Settings(rate_limit_enabled=False)).enabled
+
+    def test_counter_storages_still_plug_in(self):
+        limiter = create_limiter(
+            Settings(rate_limit_storage_uri="memory://", rate_limit_strategy="fixed-window")
+        )
+        assert isinstance(limiter._storage, MemoryStorage)
+        assert not limiter.blocking
+
+    def test_bucket_storages_need_token_bucket(self):
+        with pytest.raises(ConfigurationError):
+            create_limiter(Settings(rate_limit_strategy="fixed-window"))
+
+    def test_slowapi_internals_still_exist(self):
+        # ThreadpoolLimiter depends on these; fails first on a slowapi upgrade
+        limiter = create_limiter(Settings())
+        assert callable(limiter._check_request_limit)
+        assert isinstance(limiter._auto_check, bool)
+        assert isinstance(limiter._limiter, TokenBucketRateLimiter)
+        assert isinstance(limiter._storage, TokenBucketStorage)
+
+    def test_bucket_storage_is_abstract(self):
+        class Incomplete(TokenBucketStorage):
+            def check(self) -> bool:
+                return True
+
+        with pytest.raises(TypeError):
+            Incomplete()
+
+
+class TestOffTheEventLoop:
+    def test_sqlite_checks_run_in_the_thread_pool(self, tmp_path, monkeypatch):
+        limiter = create_limiter(
+            Settings(rate_limit_storage_uri=f"bucket+sqlite:///{tmp_path / 'limits.db'}")
+        )
+        threads = []
+        acquire = limiter._storage.acquire
+
+        def recording_acquire(*args, **kwargs):
+            threads.append(threading.current_thread())
+            return acquire(*args, **kwargs)
+
+        monkeypatch.setattr(limiter._storage, "acquire", recording_acquire)
+
+        app = FastAPI()
+        app.state.limiter = limiter
+
+        @app.get("/limited")
+        @limiter.limit("2/minute")
+        async def limited(request: Request):
+            return {"loop": threading.current_thread().name}
+
+        with TestClient(app) as client:
+            responses = [client.get("/limited") for _ in range(3)]
+
+        # Checked once per request (slowapi's inline check is skipped) ...
+        assert len(threads) == 3
+        # ... and never on the thread running the event loop
+        loop_thread = responses[0].json()["loop"]
+        assert all(thread.name != loop_thread for thread in threads)
+        assert limiter.blocking
+
+    async def test_open_retries_while_the_file_is_locked(self, tmp_path, monkeypatch):
+        store = SQLiteBucketStorage(f"bucket+sqlite:///{tmp_path / 'limits.db'}")
+        attempts = []
+        check = store.check
+
+        def flaky_check() -> bool:
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise sqlite3.OperationalError("database is locked")
+            return check()
+
+        monkeypatch.setattr(store, "check", flaky_check)
+        await store.open()
+
+        assert len(attempts) == 3
+        assert store.key_count() == 0
+
+    async def test_open_gives_up_after_busy_timeout(self, tmp_path, monkeypatch):
+        store = SQLiteBucketStorage(
+            f"bucket+sqlite:///{tmp_path / 'limits.db'}", busy_timeout_ms=0
+        )
+
+        def locked() -> bool:
+            raise sqlite3.OperationalError("database is locked")
+
+        monkeypatch.setattr(store, "check", locked)
+        with pytest.raises(sqlite3.OperationalError):
+            await store.open()
+
+
+def _hit_shared_store(args: tuple[str, str, int]) -> int:
+    """Worker process: hit one key of a shared store, count admitted hits"""
+    uri, key, hits = args
+    limiter = TokenBucketRateLimiter(storage_from_string(uri))
+    limit = parse("50/hour")
+    return sum(limiter.hit(limit, key) for _ in range(hits))
+
+
+class TestSharedAcrossProcesses:
+    def test_workers_share_one_budget(self, tmp_path):
+        uri = f"bucket+sqlite:///{tmp_path / 'limits.db'}"
+        key = str(uuid.uuid4())
+        context = multiprocessing.get_context("spawn")
+        with context.Pool(4) as pool:
+            admitted = pool.map(_hit_shared_store, [(uri, key, 40)] * 4)
+        # 160 hits from four processes, one 50-token bucket between them
+        assert sum(admitted) == 50
+
+    def test_workers_keep_separate_keys_apart(self, tmp_path):
+        uri = f"bucket+sqlite:///{tmp_path / 'limits.db'}"
+        context = multiprocessing.get_context("spawn")
+        with context.Pool(3) as pool:
+            admitted = pool.map(
+                _hit_shared_store, [(uri, f"client-{i}", 60) for i in range(3)]
+            )
+        assert admitted == [50, 50, 50]
+
@@ -0,0 +1,110 @@
+"""
+Response Cache Tests
+
+직렬화된 응답 캐시의 LRU 축출, TTL 만료, 태그 무효화를 검증
+"""
+
+import asyncio
+
+from app.services.response_cache import ResponseCache, cache_key
+
+
+async def build_value(body: bytes) -> bytes:
+    return body
+
+
+class TestResponseCache:
+    """In-process LRU + TTL cache tests"""
+
+    def test_lru_eviction(self):
+        """The least recently used entry goes first"""
+        cache = ResponseCache(max_entries=2, ttl_seconds=60)
+        cache.put("a", b"1", ())
+        cache.put("b", b"2", ())
+        assert cache.get("a") == b"1"  # b is now least recent
+        cache.put("c", b"3", ())
+
+        assert cache.get("b") is None
+        assert cache.get("a") == b"1"
+        assert cache.get("c") == b"3"
+        assert cache.metrics.evictions == 1
+        assert cache.metrics.size == 2
+
+    def test_ttl_expiry(self):
+        """Entries past their TTL count as misses"""
+        cache = ResponseCache(max_entries=2, ttl_seconds=0)
+        cache.put("a", b"1", ())
+        assert cache.get("a") is None
+        assert cache.metrics.size == 0
+
+    def test_invalidate_by_tag(self):
+        """Only entries built from an invalidated tag are dropped"""
+        cache = ResponseCache(max_entries=10, ttl_seconds=60)
+        cache.put("rankings", b"r", ("rankings",))
+        cache.put("p1", b"1", ("player:1",))
+        cache.put("p2", b"2", ("player:2",))
+
+        cache.invalidate("rankings", "player:1")
+
+        assert cache.get("rankings") is None
+        assert cache.get("p1") is None
+        assert cache.get("p2") == b"2"
+        assert cache.metrics.invalidations == 2
+
+    async def test_get_or_build_counts_hits_and_misses(self):
+        cache = ResponseCache(max_entries=10, ttl_seconds=60)
+        assert await cache.get_or_build("k", (), lambda: build_value(b"x")) == b"x"
+        assert await cache.get_or_build("k", (), lambda: build_value(b"y")) == b"x"
+        assert (cache.metrics.hits, cache.metrics.misses) == (1, 1)
+
+    async def test_build_racing_invalidation_is_not_stored(self):
+        """A body built from pre-write data must not outlive the write"""
+        cache = ResponseCache(max_entries=10, ttl_seconds=60)
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow_build() -> bytes:
+            started.set()
+            await release.wait()
+            return b"stale"
+
+        task = asyncio.create_task(cache.get_or_build("k", ("t",), slow_build))
+        await started.wait()
+        cache.invalidate("t")
+        release.set()
+
+        assert await task == b"stale"
+        assert cache.get("k") is None
+
+    async def test_invalidate_all_drops_entries_and_racing_builds(self):
+        """Another worker's write invalidates everything, including in-flight builds"""
+        cache = ResponseCache(max_entries=10, ttl_seconds=60)
+        cache.put("p1", b"1", ("player:1",))
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow_build() -> bytes:
+            started.set()
+            await release.wait()
+            return b"stale"
+
+        task = asyncio.create_task(cache.get_or_build("k", ("t",), slow_build))
+        await started.wait()
+        cache.invalidate_all()
+        release.set()
+
+        assert await task == b"stale"
+        assert cache.get("k") is None
+        assert cache.get("p1") is None
+        assert cache.metrics.invalidations == 1
+
+    async def test_disabled_cache_always_builds(self):
+        cache = ResponseCache(max_entries=0, ttl_seconds=60)
+        await cache.get_or_build("k", (), lambda: build_value(b"x"))
+        assert await cache.get_or_build("k", (), lambda: build_value(b"y")) == b"y"
+        assert cache.metrics.size == 0
+
+    def test_cache_key_normalizes_parameter_order(self):
+        assert cache_key("r", limit=10, cursor=None) == cache_key(
+            "r", cursor=None, limit=10
+        )
@@ -0,0 +1,88 @@
+"""
+Single Flight Tests
+
+같은 키로 동시에 들어온 호출이 한 번만 실행되고 결과/예외를 공유하는지 검증
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    """Request coalescing tests"""
+
+    async def test_concurrent_calls_share_one_execution(self):
+        flights = SingleFlight()
+        calls = 0
+
+        async def work() -> int:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return 42
+
+        results = await asyncio.gather(*(flights.do("k", work) for _ in range(20)))
+
+        assert results == [42] * 20
+        assert calls == 1
+        assert flights.metrics.executions == 1
+        assert flights.metrics.coalesced == 19
+
+    async def test_distinct_keys_run_separately(self):
+        flights = SingleFlight()
+
+        async def work() -> str:
+            await asyncio.sleep(0)
+            return "ok"
+
+        await asyncio.gather(flights.do("a", work), flights.do("b", work))
+        assert flights.metrics.executions == 2
+
+    async def test_sequential_calls_do_not_share(self):
+        """Finished flights are forgotten; later callers run fresh work"""
+        flights = SingleFlight()
+        values = iter([1, 2])
+
+        async def work() -> int:
+            return next(values)
+
+        assert await flights.do("k", work) == 1
+        assert await flights.do("k", work) == 2
+
+    async def test_errors_reach_every_waiter(self):
+        flights = SingleFlight()
+
+        async def fail() -> None:
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+
+        results = await asyncio.gather(
+            *(flights.do("k", fail) for _ in range(3)), return_exceptions=True
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    async def test_cancelled_leader_hands_over(self):
+        """Followers retry when the caller running the work is cancelled"""
+        flights = SingleFlight()
+        started = asyncio.Event()
+
+        async def blocked() -> str:
+            started.set()
+            await asyncio.sleep(10)
+            return "leader"
+
+        async def quick() -> str:
+            return "follower"
+
+        leader = asyncio.create_task(flights.do("k", blocked))
+        await started.wait()
+        follower = asyncio.create_task(flights.do("k", quick))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        assert await asyncio.wait_for(follower, timeout=1) == "follower"
@@ -0,0 +1,108 @@
+"""
+Quantile Sketch Tests
+
+DDSketch 방식 분위수 스케치가 정확한 값 대비 상대 오차 한도를 지키고,
+병합 결과가 전체를 한 번에 넣은 것과 같은지 검증
+"""
+
+import math
+import random
+from bisect import bisect_left, bisect_right
+
+import pytest
+
+from app.services.sketch import QuantileSketch
+
+ACCURACY = 0.01
+QUANTILES = [0, 0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.95, 0.99, 0.999, 1]
+
+
+def distributions() -> dict[str, list[int]]:
+    rng = random.Random(7)
+    return {
+        "uniform": [rng.randrange(10_000_000) for _ in range(20_000)],
+        "skewed": [min(9_999_999, int(rng.lognormvariate(9, 1.5))) for _ in range(20_000)],
+        "many_zeros": [0] * 5_000 + [rng.randrange(1, 500) for _ in range(5_000)],
+        "constant": [12_345] * 1_000,
+    }
+
+
+def exact_quantile(ordered: list[int], q: float) -> int:
+    return ordered[math.floor(q * (len(ordered) - 1))]
+
+
+def sketch_of(values: list[int]) -> QuantileSketch:
+    sketch = QuantileSketch(ACCURACY)
+    for value in values:
+        sketch.add(value)
+    return sketch
+
+
+class TestQuantileAccuracy:
+    """Relative error bounds against exact answers"""
+
+    @pytest.mark.parametrize("name", list(distributions()))
+    def test_quantiles_within_relative_accuracy(self, name):
+        values = distributions()[name]
+        ordered = sorted(values)
+        sketch = sketch_of(values)
+
+        assert sketch.count == len(values)
+        for q in QUANTILES:
+            exact = exact_quantile(ordered, q)
+            estimate = sketch.quantile(q)
+            assert abs(estimate - exact) <= ACCURACY * exact + 1e-9, (q, exact, estimate)
+
+    @pytest.mark.parametrize("name", list(distributions()))
+    def test_rank_within_neighbouring_values(self, name):
+        """rank(x) lies between the exact ranks of x / gamma and x * gamma"""
+        values = distributions()[name]
+        ordered = sorted(values)
+        sketch = sketch_of(values)
+        gamma = sketch.gamma
+
+        for x in [0, 1, 50, 499, 5_000, 12_345, 100_000, 5_000_000, 9_999_999]:
+            estimate = sketch.rank(x)
+            assert bisect_left(ordered, x / gamma) <= estimate
+            assert estimate <= bisect_right(ordered, x * gamma)
+
+    def test_bucket_count_stays_small(self):
+        sketch = sketch_of([1, 9_999_999])
+        assert max(bucket for bucket, _ in sketch.buckets()) < 850
+
+
+class TestQuantileSketch:
+    """Merge and edge cases"""
+
+    def test_merge_equals_single_sketch(self):
+        values = distributions()["skewed"]
+        left, right = sketch_of(values[:7_000]), sketch_of(values[7_000:])
+
+        left.merge(right)
+
+        assert list(left.buckets()) == list(sketch_of(values).buckets())
+        assert left.count == len(values)
+
+    def test_round_trips_through_buckets(self):
+        sketch = sketch_of(distributions()["uniform"])
+        restored = QuantileSketch.from_buckets(ACCURACY, sketch.buckets())
+
+        assert [restored.quantile(q) for q in QUANTILES] == [
+            sketch.quantile(q) for q in QUANTILES
+        ]
+
+    def test_empty_sketch(self):
+        sketch = QuantileSketch(ACCURACY)
+        assert sketch.quantile(0.5) is None
+        assert sketch.rank(100) == 0
+
+    def test_zero_beats_nothing(self):
+        sketch = sketch_of([0, 0, 10, 20])
+        assert sketch.rank(0) == 0
+        assert sketch.quantile(0) == 0
+
+    def test_rejects_mismatched_merge_and_negative_values(self):
+        with pytest.raises(ValueError):
+            QuantileSketch(ACCURACY).merge(QuantileSketch(0.02))
+        with pytest.raises(ValueError):
+            QuantileSketch(ACCURACY).add(-1)
@@ -10,7 +10,13 @@ import type {
   PlayerResponse,
   ScoreCreate,
   ScoreResponse,
+  ScoreBatchCreate,
+  ScoreBatchResponse,
   RankingResponse,
+  PlayerRankResponse,
+  LiveLeaderboardEvents,
+  PlayerStatsResponse,
+  ScoreDistributionResponse,
   ApiError,
 } from './types';
 
@@ -27,11 +33,26 @@ export const API_ENDPOINTS = {
   /** POST /api/v1/scores - Save game score */
   SCORES: `${API_BASE_URL}/scores`,
 
+  /** POST /api/v1/scores/batch - Save several game scores at once */
+  SCORES_BATCH: `${API_BASE_URL}/scores/batch`,
+
   /** GET /api/v1/scores - Get ranking list */
   RANKINGS: `${API_BASE_URL}/scores`,
 
+  /** GET /api/v1/scores/stream - Live top-N ranking (Server-Sent Events) */
+  SCORES_STREAM: `${API_BASE_URL}/scores/stream`,
+
   /** GET /api/v1/scores/:playerId - Get player's score history */
   PLAYER_SCORES: (playerId: string) => `${API_BASE_URL}/scores/${playerId}`,
+
+  /** GET /api/v1/players/:playerId/rank - Get player's global rank */
+  PLAYER_RANK: (playerId: string) => `${API_BASE_URL}/players/${playerId}/rank`,
+
+  /** GET /api/v1/players/:playerId/stats - Get player's lifetime stats */
+  PLAYER_STATS: (playerId: string) => `${API_BASE_URL}/players/${playerId}/stats`,
+
+  /** GET /api/v1/stats/distribution - Score percentiles */
+  SCORE_DISTRIBUTION: `${API_BASE_URL}/stats/distribution`,
 } as const;
 
 // ============================================================
@@ -64,30 +85,112 @@ export interface CreateScoreContract {
 }
 
 /**
- * GET /api/v1/scores?limit=10
- * Get top scores ranking
+ * POST /api/v1/scores/batch
+ * Save several game scores in one transaction
+ * Items with an unknown player are reported per item, not as an error
+ */
+export interface CreateScoreBatchContract {
+  request: ScoreBatchCreate;
+  response: ScoreBatchResponse;
+  errors: {
+    400: ApiError; // Invalid request
+  };
+}
+
+/**
+ * GET /api/v1/scores?limit=10&cursor=...
+ * Get top scores ranking (keyset paginated)
+ * Responses carry ETag + Cache-Control; If-None-Match with a current ETag
+ * returns 304 Not Modified with an empty body.
  */
 export interface GetRankingsContract {
   queryParams: {
-    limit?: number; // Default: 10
+    limit?: number; // Default: 10, max: 100
+    cursor?: string; // next_cursor from the previous page of the same ranking
+    unique_players?: boolean; // Best score per player only (default: false)
+    window?: 'day' | 'week' | 'all'; // Current UTC day / ISO week (default: 'all')
   };
   response: RankingResponse;
+  errors: {
+    400: ApiError; // Invalid cursor, cursor from another window/mode, or unique_players with a day/week window
+  };
+}
+
+/**
+ * GET /api/v1/scores/stream
+ * Live top-N ranking as Server-Sent Events (text/event-stream)
+ * The stream opens with a `snapshot` event, then sends a `diff` event each
+ * time a new score changes the top N. Event ids increase by one per diff;
+ * on a gap, or when the server closes the stream, reconnect (EventSource
+ * does so on its own) and start over from the new snapshot.
+ */
+export interface StreamRankingsContract {
+  /** `data` of each event, JSON-decoded, by event name */
+  events: LiveLeaderboardEvents;
+  errors: {
+    503: ApiError; // Too many live subscribers (see Retry-After)
+  };
 }
 
 /**
  * GET /api/v1/scores/:playerId?limit=10
- * Get player's score history
+ * Get player's score history (ETag / 304 like GET /scores)
  */
 export interface GetPlayerScoresContract {
   pathParams: {
     playerId: string;
   };
   queryParams: {
-    limit?: number; // Default: 10
+    limit?: number; // Default: 10, max: 100
   };
   response: ScoreResponse[];
 }
 
+/**
+ * GET /api/v1/players/:playerId/rank?neighbors=5
+ * Get player's best score, global rank and surrounding entries
+ */
+export interface GetPlayerRankContract {
+  pathParams: {
+    playerId: string;
+  };
+  queryParams: {
+    neighbors?: number; // Default: 5, max: 25
+  };
+  response: PlayerRankResponse;
+  errors: {
+    404: ApiError; // No scores for player
+  };
+}
+
+/**
+ * GET /api/v1/players/:playerId/stats
+ * Get player's games played, best and average score and lifetime totals
+ */
+export interface GetPlayerStatsContract {
+  pathParams: {
+    playerId: string;
+  };
+  response: PlayerStatsResponse;
+  errors: {
+    404: ApiError; // Player not found
+  };
+}
+
+/**
+ * GET /api/v1/stats/distribution?level=3&score=12500
+ * Score percentiles of all games (or one level), and the share of games a
+ * score beats. Values are within 1% of exact; games from other workers
+ * appear after their next checkpoint (seconds).
+ */
+export interface GetScoreDistributionContract {
+  queryParams: {
+    level?: number; // 1-10, default: every level
+    score?: number; // Score to place in the distribution (0-9999999)
+  };
+  response: ScoreDistributionResponse;
+}
+
 // ============================================================
 // Type Guards
 // ============================================================
@@ -157,6 +260,7 @@ export const MOCK_DATA = {
         },
       ],
       total: 2,
+      next_cursor: null,
     } satisfies RankingResponse,
   },
 } as const;
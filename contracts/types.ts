@@ -54,6 +54,26 @@ export interface ScoreResponse {
   created_at: string; // ISO 8601
 }
 
+/** Batch score creation request (offline pending-score replay) */
+export interface ScoreBatchCreate {
+  /** Scores to save (1-100 items) */
+  scores: ScoreCreate[];
+}
+
+/** Result for a single batch item */
+export interface ScoreBatchItemResult {
+  /** Position of the item in the request */
+  index: number;
+  status: 'created' | 'player_not_found';
+  score: ScoreResponse | null;
+}
+
+/** Batch score creation response */
+export interface ScoreBatchResponse {
+  results: ScoreBatchItemResult[];
+  created: number;
+}
+
 // ============================================================
 // Ranking Types
 // ============================================================
@@ -72,6 +92,90 @@ export interface RankingEntry {
 export interface RankingResponse {
   data: RankingEntry[];
   total: number;
+  /** Opaque cursor for the next page (null on the last page) */
+  next_cursor: string | null;
+}
+
+/** A player's best score with its global rank and neighbours */
+export interface PlayerRankResponse {
+  player_id: string;
+  rank: number;
+  total: number;
+  best: RankingEntry;
+  /** Entries ranked directly above the player's best, in ranking order */
+  above: RankingEntry[];
+  /** Entries ranked directly below the player's best, in ranking order */
+  below: RankingEntry[];
+}
+
+// ============================================================
+// Stats Types
+// ============================================================
+
+/** A player's lifetime totals */
+export interface PlayerStatsResponse {
+  player_id: string;
+  nickname: string;
+  games_played: number;
+  /** Null until a game is recorded */
+  best_score: number | null;
+  /** Mean score, rounded to one decimal (0 without games) */
+  average_score: number;
+  total_score: number;
+  total_lines: number;
+  total_play_time_seconds: number;
+}
+
+/** Score at selected percentiles (within 1% of the exact value) */
+export interface ScorePercentiles {
+  p25: number;
+  p50: number;
+  p75: number;
+  p90: number;
+  p99: number;
+}
+
+/** Score distribution of all games or one level */
+export interface ScoreDistributionResponse {
+  /** Level filter, null for every level */
+  level: number | null;
+  games: number;
+  /** Null until a game is recorded */
+  percentiles: ScorePercentiles | null;
+  /** The `score` query parameter, echoed */
+  score: number | null;
+  /** Share of games scoring below `score`, in percent (null without `score`) */
+  beats_percent: number | null;
+}
+
+// ============================================================
+// Live Leaderboard Types (Server-Sent Events)
+// ============================================================
+
+/** Top-N entry pushed by the live stream (`id` identifies the score) */
+export interface LiveRankingEntry extends RankingEntry {
+  id: string;
+}
+
+/** `snapshot` event: the whole top N, sent first on every connection */
+export interface LiveSnapshotEvent {
+  rankings: LiveRankingEntry[];
+}
+
+/** `diff` event: changes to apply on top of the previous top N */
+export interface LiveDiffEvent {
+  /** Scores new to the top N, with their rank */
+  entered: LiveRankingEntry[];
+  /** Scores still in the top N at a new rank */
+  moved: { id: string; rank: number }[];
+  /** Ids of scores that left the top N */
+  dropped: string[];
+}
+
+/** Event name to `data` payload of GET /scores/stream */
+export interface LiveLeaderboardEvents {
+  snapshot: LiveSnapshotEvent;
+  diff: LiveDiffEvent;
 }
 
 // ============================================================
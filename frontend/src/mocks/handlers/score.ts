@@ -10,6 +10,8 @@ import type {
   PlayerResponse,
   ScoreCreate,
   ScoreResponse,
+  ScoreBatchCreate,
+  ScoreBatchItemResult,
   RankingResponse,
 } from '@contracts/types';
 import { API_ENDPOINTS } from '@contracts/score.contract';
@@ -109,6 +111,46 @@ export const scoreHandlers = [
     return HttpResponse.json(newScore);
   }),
 
+  /**
+   * POST /api/v1/scores/batch
+   * Save several game scores at once
+   */
+  http.post(API_ENDPOINTS.SCORES_BATCH, async ({ request }) => {
+    await delay(NETWORK_DELAY);
+
+    const body = (await request.json()) as ScoreBatchCreate;
+
+    if (!Array.isArray(body.scores) || body.scores.length === 0) {
+      return HttpResponse.json({ detail: 'scores must not be empty' }, { status: 400 });
+    }
+
+    const now = new Date().toISOString();
+    const results: ScoreBatchItemResult[] = body.scores.map((item, index) => {
+      const player = players.get(item.player_id);
+      if (!player) {
+        return { index, status: 'player_not_found', score: null };
+      }
+
+      const newScore: ScoreResponse = {
+        id: crypto.randomUUID(),
+        player_id: item.player_id,
+        score: item.score,
+        level: item.level,
+        lines: item.lines,
+        play_time_seconds: item.play_time_seconds,
+        created_at: now,
+      };
+      scores.push(newScore);
+      players.set(item.player_id, { ...player, last_played_at: now });
+      return { index, status: 'created', score: newScore };
+    });
+
+    return HttpResponse.json({
+      results,
+      created: results.filter((r) => r.status === 'created').length,
+    });
+  }),
+
   /**
    * GET /api/v1/scores
    * Get top scores ranking
@@ -135,6 +177,7 @@ export const scoreHandlers = [
     const response: RankingResponse = {
       data,
       total: scores.length,
+      next_cursor: null,
     };
 
     return HttpResponse.json(response);
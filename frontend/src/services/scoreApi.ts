@@ -11,6 +11,7 @@ import type {
   PlayerResponse,
   ScoreCreate,
   ScoreResponse,
+  ScoreBatchResponse,
   RankingResponse,
 } from '@contracts/types';
 import { logger } from '../utils/logger';
@@ -23,6 +24,7 @@ const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
 const STORAGE_KEY_PLAYER_ID = 'tetris_player_id';
 const STORAGE_KEY_NICKNAME = 'tetris_nickname';
 const STORAGE_KEY_PENDING_SCORES = 'tetris_pending_scores';
+const PENDING_BATCH_SIZE = 100;
 
 // ============================================================
 // Player Management
@@ -204,6 +206,7 @@ function getPendingScores(): (ScoreCreate & { timestamp: number })[] {
 
 /**
  * Try to submit pending scores
+ * Replays the queue through the batch endpoint, one request per chunk
  */
 async function submitPendingScores(): Promise<void> {
   const pending = getPendingScores();
@@ -211,19 +214,30 @@ async function submitPendingScores(): Promise<void> {
 
   const stillPending: (ScoreCreate & { timestamp: number })[] = [];
 
-  for (const scoreData of pending) {
+  for (let start = 0; start < pending.length; start += PENDING_BATCH_SIZE) {
+    const chunk = pending.slice(start, start + PENDING_BATCH_SIZE);
+
     try {
-      const response = await fetch(`${API_BASE_URL}${API_ENDPOINTS.SCORES}`, {
+      const response = await fetch(`${API_BASE_URL}${API_ENDPOINTS.SCORES_BATCH}`, {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify(scoreData),
+        body: JSON.stringify({ scores: chunk }),
       });
 
       if (!response.ok) {
-        stillPending.push(scoreData);
+        stillPending.push(...chunk);
+        continue;
+      }
+
+      // Keep items the server could not save (e.g. player not registered yet)
+      const result: ScoreBatchResponse = await response.json();
+      for (const item of result.results) {
+        if (item.status !== 'created') {
+          stillPending.push(chunk[item.index]);
+        }
       }
     } catch {
-      stillPending.push(scoreData);
+      stillPending.push(...chunk);
     }
   }
 